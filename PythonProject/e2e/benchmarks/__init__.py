@@ -0,0 +1,3 @@
+"""
+Framework overhead benchmarks (run with: python benchmarks/run_benchmarks.py)
+"""
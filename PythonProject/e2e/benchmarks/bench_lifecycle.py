@@ -0,0 +1,39 @@
+"""
+Lifecycle benchmark tests, run by run_benchmarks.py against the local stand-in app.
+Named bench_*.py so the regular suite never collects them.
+"""
+import pytest
+from e2e.constants import INVENTORY_PATH
+from e2e.pages.login_page import LoginPage
+from e2e.utils.local_app import DEFAULT_USERS
+
+USERNAME, PASSWORD = next(iter(DEFAULT_USERS.items()))
+
+# Repeated so steady-state setup/teardown is measured after the session fixtures are warm
+BLANK_PAGE_ROUNDS = 5
+
+
+@pytest.mark.parametrize("round_index", range(BLANK_PAGE_ROUNDS))
+def test_blank_page(page, round_index):
+    """Per-test fixture setup/teardown only: a page is handed out and released."""
+    assert page is not None
+
+
+def test_login_flow(page, base_url):
+    """UI login through the page objects."""
+    login_page = LoginPage(page)
+    login_page.navigate_to(base_url)
+    login_page.login(USERNAME, PASSWORD)
+    login_page.wait_for_url(f"{base_url}{INVENTORY_PATH}")
+
+
+@pytest.mark.record(trace="on")
+def test_trace_recording(page, base_url):
+    """Recording context plus trace capture and archiving at teardown."""
+    LoginPage(page).navigate_to(base_url)
+
+
+def test_failure_capture(page, base_url):
+    """Deliberate failure, so the screenshot/artifact failure hook is timed."""
+    LoginPage(page).navigate_to(base_url)
+    pytest.fail("deliberate benchmark failure")
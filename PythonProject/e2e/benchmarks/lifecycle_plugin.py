@@ -0,0 +1,52 @@
+"""
+pytest plugin recording lifecycle timestamps and phase durations for run_benchmarks.py
+"""
+import json
+import os
+import time
+
+import pytest
+
+# Set by run_benchmarks.py for the pytest subprocess
+OUTPUT_ENV = "E2E_BENCH_OUTPUT"
+
+_timings = {"phases": [], "failure_hook": {}}
+
+
+def pytest_sessionstart(session):
+    _timings["session_start"] = time.time()
+
+
+def pytest_collection_finish(session):
+    _timings["collection_finish"] = time.time()
+
+
+@pytest.hookimpl(hookwrapper=True, tryfirst=True)
+def pytest_runtest_makereport(item, call):
+    # Outermost wrapper, so the conftest failure hook (screenshot + artifact submit) is included
+    began = time.perf_counter()
+    outcome = yield
+    report = outcome.get_result()
+    if report.when == "call" and report.failed:
+        _timings["failure_hook"][item.name] = time.perf_counter() - began
+
+
+def pytest_runtest_logreport(report):
+    _timings["phases"].append({
+        "name": report.nodeid.split("::")[-1],
+        "when": report.when,
+        "duration": report.duration,
+        "outcome": report.outcome,
+    })
+
+
+def pytest_sessionfinish(session):
+    _timings["session_finish"] = time.time()
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_unconfigure(config):
+    # After conftest's pytest_unconfigure has drained the artifact pipeline
+    _timings["unconfigure_done"] = time.time()
+    with open(os.environ[OUTPUT_ENV], "w", encoding="utf-8") as f:
+        json.dump(_timings, f)
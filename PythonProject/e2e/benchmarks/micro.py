@@ -0,0 +1,84 @@
+"""
+In-process micro-benchmarks of framework building blocks (no browser)
+"""
+import tempfile
+import timeit
+from pathlib import Path
+
+from e2e.constants import ENV_FILE_NAME
+from e2e.pages.login_page import LoginPage
+from e2e.utils.action_timing import ActionTimer
+from e2e.utils.data_store import CsvDataStore
+from e2e.utils.locator_registry import LOCATORS_DIR, LocatorRegistry
+from e2e.utils.settings import Settings
+from e2e.utils.web_vitals import load_budgets
+
+E2E_ROOT = Path(__file__).resolve().parent.parent
+
+
+class _NullLocator:
+    """Stands in for a Playwright Locator so only framework code is timed."""
+
+    @property
+    def first(self):
+        return self
+
+    def wait_for(self, state=None):
+        pass
+
+    def fill(self, value):
+        pass
+
+    def click(self):
+        pass
+
+
+class _NullPage:
+    def locator(self, selector):
+        return _NullLocator()
+
+    def evaluate(self, script, steps):
+        return {"done": len(steps), "reason": None}
+
+
+def _per_call_us(func, number: int) -> float:
+    """Best-of-5 time per call in microseconds."""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def _load_config():
+    Settings.resolve()
+    load_budgets(E2E_ROOT / ENV_FILE_NAME)
+
+
+def run_micro_benchmarks() -> dict:
+    """{metric name: microseconds per call}"""
+    page = _NullPage()
+    csv_path = E2E_ROOT / "resources" / "testdata.csv"
+    CsvDataStore(csv_path)  # make sure the on-disk cache exists before timing warm opens
+    results = {
+        "page_object_construction_us": _per_call_us(lambda: LoginPage(page), 20000),
+        "page_object_first_locator_us": _per_call_us(lambda: LoginPage(page).username_field, 20000),
+        "config_load_us": _per_call_us(_load_config, 200),
+        "locator_registry_load_us": _per_call_us(
+            lambda: LocatorRegistry(sorted(LOCATORS_DIR.glob("*.yaml"))), 200
+        ),
+        "data_store_open_cached_us": _per_call_us(lambda: CsvDataStore(csv_path), 200),
+    }
+
+    saved = (ActionTimer.enabled, ActionTimer.allure_steps, ActionTimer.metrics_dir)
+    login_page = LoginPage(page)
+    try:
+        ActionTimer.enabled = False
+        results["login_action_untimed_us"] = _per_call_us(
+            lambda: login_page.login("user", "secret"), 20000
+        )
+        with tempfile.TemporaryDirectory() as metrics_dir:
+            ActionTimer.configure(Path(metrics_dir), allure_steps=False)
+            results["login_action_timed_us"] = _per_call_us(
+                lambda: login_page.login("user", "secret"), 20000
+            )
+            ActionTimer.reset()
+    finally:
+        ActionTimer.enabled, ActionTimer.allure_steps, ActionTimer.metrics_dir = saved
+    return results
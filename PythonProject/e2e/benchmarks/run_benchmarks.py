@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Measure the framework's own overhead against a local stand-in app and compare it to a baseline.
+Run from e2e/: python benchmarks/run_benchmarks.py [--rounds 3] [--save-baseline]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+E2E_ROOT = Path(__file__).resolve().parent.parent
+# Page objects and utils import e2e.*, so make the project root importable
+sys.path.insert(0, str(E2E_ROOT.parent))
+
+from e2e.benchmarks.lifecycle_plugin import OUTPUT_ENV
+from e2e.benchmarks.micro import run_micro_benchmarks
+from e2e.constants import CACHE_DIR_NAME
+from e2e.utils.local_app import LocalApp
+
+DEFAULT_BASELINE = E2E_ROOT / CACHE_DIR_NAME / "benchmark_baseline.json"
+DEFAULT_OUTPUT = E2E_ROOT / "reports" / "metrics" / "benchmarks.json"
+EXPECTED_FAILURES = {"test_failure_capture"}
+
+
+def _phase(timings: dict, name: str, when: str) -> list:
+    return [
+        p["duration"] for p in timings["phases"]
+        if p["name"].startswith(name) and p["when"] == when
+    ]
+
+
+def run_lifecycle_round(base_url: str, extra_args: list) -> dict:
+    """One pytest subprocess over bench_lifecycle.py; returns lifecycle metrics in ms."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output = Path(tmp_dir) / "timings.json"
+        env = {**os.environ, OUTPUT_ENV: str(output), "BASE_URL": base_url}
+        # Everything the session writes stays in tmp_dir: the deliberate failure never
+        # reaches rerun-failed, quarantine or regression baselines, and the user's
+        # reports/artifacts and reports/metrics are neither cleared nor rewritten
+        cmd = [
+            sys.executable, "-m", "pytest", "benchmarks/bench_lifecycle.py",
+            "-p", "benchmarks.lifecycle_plugin", "-q", "--no-header", "-p", "no:cacheprovider",
+            "--alluredir", str(Path(tmp_dir) / "allure"),
+            "--history-db", str(Path(tmp_dir) / "history.sqlite"),
+            "--durations-file", str(Path(tmp_dir) / "durations.json"),
+            "--impact-map", str(Path(tmp_dir) / "impact_map.json"),
+            "--artifacts-dir", str(Path(tmp_dir) / "artifacts"),
+            "--metrics-dir", str(Path(tmp_dir) / "metrics"),
+            *extra_args,
+        ]
+        started = time.time()
+        result = subprocess.run(cmd, cwd=E2E_ROOT, env=env, capture_output=True, text=True)
+        finished = time.time()
+        if not output.exists():
+            raise RuntimeError(
+                f"Benchmark session did not complete:\n{result.stdout}\n{result.stderr}"
+            )
+        timings = json.loads(output.read_text(encoding="utf-8"))
+
+    unexpected = sorted({
+        p["name"] for p in timings["phases"]
+        if p["outcome"] == "failed" and p["name"] not in EXPECTED_FAILURES
+    })
+    if unexpected:
+        raise RuntimeError(
+            f"Benchmark tests failed unexpectedly: {unexpected}\n{result.stdout[-4000:]}"
+        )
+
+    blank_setup = _phase(timings, "test_blank_page", "setup")
+    trace_setup = _phase(timings, "test_trace_recording", "setup")
+    trace_teardown = _phase(timings, "test_trace_recording", "teardown")
+    return {
+        "session_start_ms": (timings["session_start"] - started) * 1000,
+        "collection_ms": (timings["collection_finish"] - timings["session_start"]) * 1000,
+        "first_test_setup_ms": blank_setup[0] * 1000,
+        "test_setup_ms": statistics.median(blank_setup[1:]) * 1000,
+        "test_teardown_ms":
+            statistics.median(_phase(timings, "test_blank_page", "teardown")) * 1000,
+        "login_flow_ms": _phase(timings, "test_login_flow", "call")[0] * 1000,
+        "trace_recording_setup_ms": trace_setup[0] * 1000,
+        "trace_recording_teardown_ms": trace_teardown[0] * 1000,
+        "failure_hook_ms": timings["failure_hook"]["test_failure_capture"] * 1000,
+        "session_finish_ms": (timings["unconfigure_done"] - timings["session_finish"]) * 1000,
+        "process_exit_ms": (finished - timings["unconfigure_done"]) * 1000,
+        "total_ms": (finished - started) * 1000,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """(metric, baseline, current, relative change, regressed) for metrics present in both."""
+    rows = []
+    for name, value in current.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        change = (value - base) / base if base else 0.0
+        rows.append((name, base, value, change, change > threshold))
+    return rows
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Framework overhead benchmarks")
+    parser.add_argument("--rounds", type=int, default=3,
+                        help="pytest sessions to run; medians are reported")
+    parser.add_argument("--skip-micro", action="store_true",
+                        help="Skip the in-process micro-benchmarks")
+    parser.add_argument("--skip-lifecycle", action="store_true",
+                        help="Skip the browser lifecycle benchmarks")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE),
+                        help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store these results as the new baseline")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT),
+                        help="Where to write the results JSON")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Relative slowdown reported as a regression (default: 0.2 = 20%%)")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="Exit 1 if any metric regressed")
+    parser.add_argument("pytest_args", nargs="*",
+                        help="Extra pytest arguments, e.g. -- --context-pool")
+    args = parser.parse_args()
+
+    metrics = {}
+    samples = {}
+    if not args.skip_micro:
+        print("Running micro-benchmarks...")
+        metrics.update(run_micro_benchmarks())
+
+    if not args.skip_lifecycle:
+        with LocalApp() as app:
+            rounds = []
+            for index in range(args.rounds):
+                print(f"Lifecycle round {index + 1}/{args.rounds} against {app.url} ...")
+                rounds.append(run_lifecycle_round(app.url, args.pytest_args))
+        for name in rounds[0]:
+            samples[name] = [round_metrics[name] for round_metrics in rounds]
+            metrics[name] = statistics.median(samples[name])
+
+    results = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "rounds": args.rounds,
+        "pytest_args": args.pytest_args,
+        "metrics": metrics,
+        "samples": samples,
+    }
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    baseline_path = Path(args.baseline)
+    baseline = {}
+    if baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))["metrics"]
+    rows = compare(metrics, baseline, args.threshold)
+    compared = {row[0]: row for row in rows}
+    print(f"\n{'metric':<32} {'baseline':>11} {'current':>11} {'change':>8}")
+    for name, value in metrics.items():
+        if name in compared:
+            _, base, _, change, regressed = compared[name]
+            flag = "  REGRESSED" if regressed else ""
+            print(f"{name:<32} {base:>11.1f} {value:>11.1f} {change * 100:>+7.1f}%{flag}")
+        else:
+            print(f"{name:<32} {'-':>11} {value:>11.1f}")
+    print(f"\nResults saved to {output}")
+
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Baseline saved to {baseline_path}")
+    elif not baseline:
+        print(f"No baseline at {baseline_path}; run with --save-baseline to create one")
+
+    regressed = [row[0] for row in rows if row[4]]
+    if regressed:
+        print(f"Regressed beyond {args.threshold:.0%}: {', '.join(regressed)}")
+    sys.exit(1 if regressed and args.fail_on_regression else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,100 +1,760 @@
 import pytest
-import os
+import pytest_asyncio
+import asyncio
+import json
+import logging
 from pathlib import Path
-from dotenv import dotenv_values
-from e2e.utils.file_utils import FileUtils
-import allure
-from e2e.constants import  ENV_FILE_NAME
-from utils.config import get_env_variable
+from e2e.utils.auth_state import AuthStateCache
+from e2e.utils.context_pool import ContextPool
+from e2e.utils.data_store import CsvDataStore
+from e2e.utils.network_profile import PROFILES, resolve_profile_name
+from e2e.utils.durations import DurationHistory, DurationSchedulerPlugin, parse_shard
+from e2e.utils.artifacts import ArtifactPipeline
+from e2e.utils.action_timing import ActionTimingPlugin
+from e2e.utils.impact import IMPACT_MAP, ImpactMap, ImpactPlugin, ImpactRecorder, select_impacted
+from e2e.utils.history import HISTORY_DB, LANES, HistoryPlugin, RunHistory
+from e2e.utils.regressions import RegressionPlugin
+from e2e.utils.web_vitals import PerfBudgets, WebPerfPlugin, load_budgets
+from e2e.utils.recording import RECORD_MODES, Recorder, RecordingPolicy
+from e2e.utils.workers import is_worker, shared_value, ship_shared_values, worker_count
+from e2e.utils.har_mode import (
+    HAR_DIR, HAR_MODES, MISSING_POLICIES, HarSession, har_path_for, merge_har_parts,
+)
+from e2e.utils.local_app import DEFAULT_USERS, MOCK_APP_SPEC, LocalApp
+from e2e.utils.settings import Settings, format_settings
+from e2e.utils.browser_server import BrowserServer, server_options
+from e2e.utils.watch import WarmSession
+from e2e.pages.login_page import LoginPage
+from e2e.constants import (
+    ENV_FILE_NAME, CACHE_DIR_NAME, INVENTORY_PATH, NETWORK_PROFILE_BY_MARKER,
+    MARKER_DURATION_ESTIMATES, DEFAULT_DURATION_ESTIMATE, DEFAULT_ARTIFACT_BUDGET_MB,
+    QUARANTINE_PASS_RATE, REGRESSION_THRESHOLD,
+)
 
 # Resolve project root dynamically (conftest.py lives inside e2e/)
 PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+METRICS_DIR = PROJECT_ROOT / "e2e" / "reports" / "metrics"
+ARTIFACTS_DIR = PROJECT_ROOT / "e2e" / "reports" / "artifacts"
+
+logger = logging.getLogger(__name__)
+
+artifact_pipeline_key = pytest.StashKey[ArtifactPipeline]()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("e2e", "e2e framework options")
+    group.addoption(
+        "--context-pool", action="store_true", default=False,
+        help="Reuse pre-warmed browser contexts between tests instead of creating one per test",
+    )
+    group.addoption(
+        "--context-pool-max-uses", type=int, default=50,
+        help="Recycle a pooled context after this many tests (default: 50)",
+    )
+    group.addoption(
+        "--network-profile", choices=sorted(PROFILES), default=None,
+        help="Network profile for tests without their own network_profile/ui marker",
+    )
+    group.addoption(
+        "--har-mode", choices=HAR_MODES, default="off",
+        help="record: save backend traffic to HAR files; replay: serve responses from them",
+    )
+    group.addoption(
+        "--har-missing", choices=MISSING_POLICIES, default="fail",
+        help="Replay handling of requests missing from the HAR (default: fail)",
+    )
+    group.addoption(
+        "--har-dir", default=str(HAR_DIR),
+        help="Directory holding HAR files (default: e2e/resources/har)",
+    )
+    group.addoption(
+        "--har-url", default=None,
+        help="Glob of URLs to record/replay, e.g. '**/api/**' (default: all requests)",
+    )
+    group.addoption(
+        "--duration-order", action="store_true", default=False,
+        help="Run tests longest-first using recorded durations (LPT scheduling under xdist)",
+    )
+    group.addoption(
+        "--durations-file", default=str(PROJECT_ROOT / "e2e" / CACHE_DIR_NAME / "durations.json"),
+        help="JSON file holding per-test duration history",
+    )
+    group.addoption(
+        "--shard", default=None, metavar="K/N",
+        help="Run only shard K of N; shards are balanced by recorded durations",
+    )
+    group.addoption(
+        "--artifacts-dir", default=str(ARTIFACTS_DIR),
+        help="Failure artifact archive, cleared at the start of every run "
+             "(default: e2e/reports/artifacts)",
+    )
+    group.addoption(
+        "--metrics-dir", default=str(METRICS_DIR),
+        help="Action timing and web performance metrics, rewritten by every run "
+             "(default: e2e/reports/metrics)",
+    )
+    group.addoption(
+        "--artifact-budget-mb", type=int, default=None,
+        help=f"Disk budget for failure artifacts per run; oldest are evicted beyond it "
+             f"(default: ARTIFACT_BUDGET_MB or {DEFAULT_ARTIFACT_BUDGET_MB})",
+    )
+    group.addoption(
+        "--record-video", choices=RECORD_MODES, default="off",
+        help="Video recording for tests without a record marker (default: off)",
+    )
+    group.addoption(
+        "--record-trace", choices=RECORD_MODES, default="off",
+        help="Playwright tracing for tests without a record marker (default: off)",
+    )
+    group.addoption(
+        "--no-action-timing", action="store_true", default=False,
+        help="Do not time page-object actions (reports/metrics/actions-*.jsonl)",
+    )
+    group.addoption(
+        "--no-action-steps", action="store_true", default=False,
+        help="Time page-object actions without emitting an allure step for each",
+    )
+    group.addoption(
+        "--web-perf", action="store_true", default=False,
+        help="Capture web performance metrics and check budgets for every test, "
+             "not just web_perf-marked ones",
+    )
+    group.addoption(
+        "--mock-app", action="store_true", default=False,
+        help="Point base_url at an in-process stand-in of the application (no network needed)",
+    )
+    group.addoption(
+        "--browser-server", action="store_true", default=False,
+        help="Connect to a warm browser server kept running between runs (started on first use)",
+    )
+    group.addoption(
+        "--changed-since", default=None, metavar="REF",
+        help="Run only tests affected by changes since a git ref, per .cache/impact_map.json "
+             "(tests missing from the map always run)",
+    )
+    group.addoption(
+        "--impact-map", default=str(IMPACT_MAP),
+        help="JSON map of what each test touched, updated at the end of every run "
+             "(read by --changed-since)",
+    )
+    group.addoption(
+        "--history-db", default=str(HISTORY_DB),
+        help="SQLite database of per-test outcomes and durations across runs",
+    )
+    group.addoption(
+        "--rerun-failed", action="store_true", default=False,
+        help="Run only tests whose last recorded result (in --history-db) failed",
+    )
+    group.addoption(
+        "--lane", choices=LANES, default="all",
+        help="main: skip quarantined (flaky) tests; quarantine: run only them; "
+             "all: everything (default)",
+    )
+    group.addoption(
+        "--quarantine-threshold", type=float, default=QUARANTINE_PASS_RATE,
+        help="Quarantine tests whose recent pass rate is below this "
+             f"(default: {QUARANTINE_PASS_RATE})",
+    )
+    group.addoption(
+        "--regression-threshold", type=float, default=REGRESSION_THRESHOLD,
+        help=f"Relative slowdown over the rolling baseline reported as a duration regression "
+             f"(default: {REGRESSION_THRESHOLD})",
+    )
+    group.addoption(
+        "--fail-on-regression", action="store_true", default=False,
+        help="Fail the run when a test or page-object action regressed significantly",
+    )
+    group.addoption(
+        "--show-config", action="store_true", default=False,
+        help="Print every resolved setting and where it came from in the session header",
+    )
+
+
+def _settings(config) -> Settings:
+    """
+    Settings resolved once per run (see utils/settings.py for the precedence):
+    the xdist controller resolves them and workers receive the result.
+    """
+    def resolve():
+        cli = {
+            # --base-url is defined by pytest-base-url when it is installed
+            "base_url": config.getoption("base_url", None),
+            "artifact_budget_mb": config.getoption("artifact_budget_mb"),
+        }
+        return Settings.resolve(cli).to_dict()
+
+    return Settings.from_dict(shared_value(config, "settings", resolve))
+
+
+def _impact_selection(config):
+    """
+    Tests affected by --changed-since (utils/impact.py); the git diff is analysed once,
+    by the controller.
+    """
+    ref = config.getoption("changed_since")
+    if not ref:
+        return None
+    try:
+        return shared_value(
+            config, "impact_selection",
+            lambda: select_impacted(ImpactMap(Path(config.getoption("impact_map"))), ref),
+        )
+    except ValueError as e:
+        raise pytest.UsageError(str(e))
+
+
+def _history_selection(config) -> dict:
+    """
+    Previously failed and quarantined node ids from the run history, read once by the
+    controller.
+    """
+    def load():
+        if not (config.getoption("rerun_failed") or config.getoption("lane") != "all"):
+            return {"failed": [], "quarantined": []}
+        history = RunHistory(config.getoption("history_db"))
+        try:
+            return {
+                "failed": history.failed_last(),
+                "quarantined": history.quarantined(config.getoption("quarantine_threshold")),
+            }
+        finally:
+            history.close()
+
+    return shared_value(config, "history_selection", load)
+
+
+def _load_perf_budgets() -> dict:
+    return load_budgets(Path(__file__).resolve().parent / ENV_FILE_NAME).as_dict()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """
+    xdist controller: parse configuration files once here and hand the results
+    to every worker through workerinput, instead of each worker re-reading them.
+    """
+    _settings(node.config)
+    _impact_selection(node.config)
+    _history_selection(node.config)
+    shared_value(node.config, "perf_budgets", _load_perf_budgets)
+    ship_shared_values(node.config, node.workerinput)
+
+
+def pytest_configure(config):
+    shard = config.getoption("shard")
+    if shard:
+        try:
+            parse_shard(shard)
+        except ValueError as e:
+            raise pytest.UsageError(str(e))
+    history = DurationHistory(
+        config.getoption("durations_file"), MARKER_DURATION_ESTIMATES, DEFAULT_DURATION_ESTIMATE
+    )
+    config.pluginmanager.register(
+        DurationSchedulerPlugin(config, history), "e2e_duration_scheduler"
+    )
+    config.pluginmanager.register(
+        ImpactPlugin(
+            config, Path(config.getoption("impact_map")), selection=_impact_selection(config),
+            ref=config.getoption("changed_since"),
+        ),
+        "e2e_impact",
+    )
+    config.pluginmanager.register(
+        HistoryPlugin(
+            config, Path(config.getoption("history_db")), config.getoption("lane"),
+            config.getoption("rerun_failed"), _history_selection(config),
+        ),
+        "e2e_history",
+    )
+    if config.option.collectonly:
+        # Nothing runs, so skip the timing/perf plugins and their config parsing
+        return
+    if not is_worker(config):
+        # Workers only ever write to their own subdirectory
+        ArtifactPipeline.clean(Path(config.getoption("artifacts_dir")))
+    metrics_dir = Path(config.getoption("metrics_dir"))
+    if not config.getoption("no_action_timing"):
+        config.pluginmanager.register(
+            ActionTimingPlugin(
+                config, metrics_dir, allure_steps=not config.getoption("no_action_steps")
+            ),
+            "e2e_action_timing",
+        )
+    # Budgets come from resources/perf_budgets.yaml, .env.test and PERF_BUDGET_* env vars
+    budgets = PerfBudgets(**shared_value(config, "perf_budgets", _load_perf_budgets))
+    config.pluginmanager.register(
+        WebPerfPlugin(config, metrics_dir, budgets, enable_all=config.getoption("web_perf")),
+        "e2e_web_perf",
+    )
+    # Durations are compared with the run history after HistoryPlugin has stored this run
+    config.pluginmanager.register(
+        RegressionPlugin(
+            config, Path(config.getoption("history_db")),
+            None if config.getoption("no_action_timing") else metrics_dir,
+            threshold=config.getoption("regression_threshold"),
+            fail_on_regression=config.getoption("fail_on_regression"),
+        ),
+        "e2e_regressions",
+    )
+
+
+def pytest_report_header(config):
+    if config.getoption("show_config"):
+        lines = format_settings(_settings(config)).splitlines()
+        return ["settings:"] + ["  " + line for line in lines]
+
+
+def pytest_sessionfinish(session):
+    # Workers have closed their contexts by now; combine per-test parts of shared HAR files
+    config = session.config
+    if not is_worker(config) and config.getoption("har_mode") == "record":
+        merged = merge_har_parts(Path(config.getoption("har_dir")))
+        if merged:
+            logger.info(f"merged shared HAR recordings: {', '.join(merged)}")
+
+
+def pytest_unconfigure(config):
+    # Tests never wait for the archive; everything they queued is written here
+    pipeline = config.stash.get(artifact_pipeline_key, None)
+    if pipeline is not None:
+        pipeline.close()
+        logger.info(f"failure artifacts in {pipeline.dir}: {pipeline.stats}")
+        if pipeline.stats["failed"]:
+            logger.warning(f"{pipeline.stats['failed']} artifact(s) could not be archived")
+
+
+def _artifact_pipeline(config):
+    """Per-worker ArtifactPipeline, created on the first failure that needs one."""
+    pipeline = config.stash.get(artifact_pipeline_key, None)
+    if pipeline is None:
+        budget_bytes = _settings(config).artifact_budget_mb * 1024 * 1024 // worker_count()
+        pipeline = ArtifactPipeline(Path(config.getoption("artifacts_dir")), budget_bytes)
+        config.stash[artifact_pipeline_key] = pipeline
+    return pipeline
+
+
+def _failure_page(item):
+    """Page to screenshot when a test fails: `page`, or the logged-in page of authenticated_*."""
+    page = item.funcargs.get("page") or item.funcargs.get("authenticated_page")
+    context = item.funcargs.get("authenticated_context")
+    if page is None and context is not None and context.pages:
+        page = context.pages[0]
+    return page
+
+
+def _install_network_profile(request, context):
+    """Install the test's network profile on a context (see utils/network_profile.py)."""
+    name = resolve_profile_name(
+        request.node, request.config.getoption("network_profile"), NETWORK_PROFILE_BY_MARKER
+    )
+    measure_all = request.config.getoption("web_perf")
+    if measure_all and not request.node.get_closest_marker("network_profile"):
+        # --web-perf measures every test, so none of them may load a stripped page
+        name = "full"
+    return PROFILES[name].install(context)
+
+
+def _install_har(request, context):
+    """Route a context through the test's HAR file when --har-mode is record/replay."""
+    config = request.config
+    mode = config.getoption("har_mode")
+    if mode == "off":
+        return None
+    har_path = har_path_for(request.node, config.getoption("har_dir"), mode)
+    return HarSession(
+        context, har_path, mode, config.getoption("har_missing"), config.getoption("har_url")
+    )
+
+
+def _finish_recording(request, recorder, failed):
+    """
+    Stop recording; kept videos/traces are attached to allure (so CI publishes them)
+    and archived by the artifact pipeline (size-capped, traces re-compressed), which
+    removes the recording's temporary directory once it has read them. Everything
+    else is dropped without ever reaching the archive.
+    """
+    kept = recorder.finish(failed)
+    if not kept:
+        recorder.cleanup()
+        return
+    import allure
+
+    files = []
+    for kind, path_obj in kept:
+        ext = "webm" if kind == "video" else "zip"
+        allure.attach.file(str(path_obj), name=kind, extension=ext)
+        files.append((path_obj, kind, ext))
+    _artifact_pipeline(request.config).submit_files(
+        files, request.node.nodeid, remove_dir=recorder.tmp_dir
+    )
+
+
+def _finish_network_profile(request, installed):
+    """Remove the profile and log what it blocked for this test."""
+    installed.uninstall()
+    stats = installed.stats
+    request.node.user_properties.append(("network_profile", stats.as_dict()))
+    if stats.blocked:
+        logger.info(
+            f"network profile '{stats.profile_name}' blocked {stats.blocked} requests "
+            f"({dict(stats.aborted + stats.stubbed)}) in {request.node.nodeid}"
+        )
 
 @pytest.fixture(scope="session")
-def app_config():
-    """
-    Loads test configuration:
-    - First from .env file (for local/dev use)
-    - Falls back to environment variables (for CI/CD)
-    """
-    e2e_root = Path(__file__).resolve().parent
-    env_test_path = e2e_root / ENV_FILE_NAME
-    config = {}
-    if env_test_path.exists():
-        # Load from .env
-        config = dotenv_values(env_test_path)
-    
-    # Fallback to system environment (CI/CD case)
-    config = {
-        **config,
-        "username": config.get("username") or os.getenv("TEST_USERNAME"),
-        "password": config.get("password") or os.getenv("TEST_PASSWORD"),
-    }
+def settings(request) -> Settings:
+    """
+    Typed settings for this run (utils/settings.py):
+    - CLI option > environment variable > .env.test > .env > default
+    - Resolved once by the xdist controller and shipped to workers
+    - pytest --show-config prints each value with its source
+    """
+    return _settings(request.config)
+
+@pytest.fixture(scope="session")
+def app_config(request, settings):
+    """
+    Test configuration as a plain dict (raw .env.test entries plus resolved
+    base_url/username/password from settings).
+    - With --mock-app, missing credentials default to the mock app's user
+    """
+    config = settings.app_config()
+    if request.config.getoption("mock_app") and not (config["username"] and config["password"]):
+        config["username"], config["password"] = next(iter(DEFAULT_USERS.items()))
     return config
 
 @pytest.fixture(scope="session")
-def base_url(app_config):
-    url = os.getenv("BASE_URL") or app_config.get("base_url")
-    if not url:
-        url = "https://example.com"
-    return url
+def mock_app(app_config):
+    """
+    In-process stand-in of the application on a random local port (utils/local_app.py).
+    - Login/inventory pages use the selectors in locators/login_page_locators.yaml
+    - Extra pages/JSON endpoints come from resources/mock_app.yaml
+    - Accepts the configured credentials (standard_user/secret_sauce when none are set)
+    One server per worker; base_url points at it with --mock-app.
+    """
+    username, password = app_config.get("username"), app_config.get("password")
+    app = LocalApp(users={username: password} if username and password else None)
+    if MOCK_APP_SPEC.exists():
+        app.load_spec(MOCK_APP_SPEC)
+    app.start()
+    yield app
+    app.stop()
+
+@pytest.fixture
+def mock_routes(mock_app):
+    """mock_app for adding pages/JSON endpoints in one test; additions are removed afterwards."""
+    snapshot = mock_app.snapshot_routes()
+    yield mock_app
+    mock_app.restore_routes(snapshot)
 
 @pytest.fixture(scope="session")
-def playwright_action_timeout(app_config):
+def base_url(request, settings):
+    if request.config.getoption("mock_app"):
+        return request.getfixturevalue("mock_app").url
+    return settings.base_url
+
+@pytest.fixture(scope="session")
+def playwright_action_timeout(settings):
     """
     Global Playwright action timeout (in ms).
-    - Reads from env var PLAYWRIGHT_ACTION_TIMEOUT
-    - Falls back to .env.test key playwright_action_timeout
+    - PLAYWRIGHT_ACTION_TIMEOUT, or playwright_action_timeout in .env.test/.env
     - Defaults to 5000 ms
     """
-    return int(
-        os.getenv("PLAYWRIGHT_ACTION_TIMEOUT")
-        or app_config.get("playwright_action_timeout", 5000)
-    )
+    return settings.action_timeout_ms
 
 @pytest.fixture(scope="session")
-def playwright_navigation_timeout(app_config):
+def playwright_navigation_timeout(settings):
     """Global Playwright navigation timeout (ms)."""
-    return int(
-        os.getenv("PLAYWRIGHT_NAVIGATION_TIMEOUT")
-        or app_config.get("playwright_navigation_timeout", 60000)
-    )
+    return settings.navigation_timeout_ms
 
 @pytest.fixture(scope="session")
-def playwright_test_timeout(app_config):
+def playwright_test_timeout(settings):
     """Global Pytest test timeout (ms)."""
-    return int(
-        os.getenv("PLAYWRIGHT_TEST_TIMEOUT")
-        or app_config.get("playwright_test_timeout", 60000)
-    )
+    return settings.test_timeout_ms
 
 @pytest.fixture(scope="session")
-def all_test_data():
-    csv_path = PROJECT_ROOT / "e2e" / "resources" / "testdata.csv"
-    return FileUtils.read_csv(csv_path)
+def auth_state_ttl(settings):
+    """Seconds a cached login (storage_state) is reused before logging in again."""
+    return settings.auth_state_ttl
+
+@pytest.fixture(scope="session")
+def auth_state_cache(auth_state_ttl):
+    """
+    Worker-wide cache of storage_state files, one per credential set.
+    Files are shared on disk, so parallel workers reuse each other's logins.
+    """
+    return AuthStateCache(PROJECT_ROOT / "e2e" / CACHE_DIR_NAME / "auth", auth_state_ttl)
+
+@pytest.fixture
+def auth_credentials(app_config):
+    """
+    (username, password) used by authenticated_context.
+    Override in a module or class to log in as a different user.
+    """
+    return app_config.get("username"), app_config.get("password")
+
+def _login_and_capture_state(browser, browser_context_args, base_url, username, password):
+    """Log in through the UI once and return the resulting storage_state."""
+    context = browser.new_context(**browser_context_args)
+    try:
+        login_page = LoginPage(context.new_page())
+        login_page.navigate_to(base_url)
+        login_page.login(username, password)
+        login_page.wait_for_url(f"{base_url}{INVENTORY_PATH}")
+        return context.storage_state()
+    finally:
+        context.close()
+
+@pytest.fixture
+def authenticated_context(request, browser, browser_context_args, auth_state_cache,
+                          auth_credentials, base_url, playwright_action_timeout,
+                          playwright_navigation_timeout):
+    """
+    Browser context preloaded with a cached logged-in storage_state.
+    - Logs in through the UI only when no fresh state exists for the credentials
+    - Verifies the session by opening the landing page; if the server bounced
+      us back to the login form, the cache entry is rebuilt once
+    - For test impact analysis every test using it depends on the UI login, which
+      is recorded as the shared "ui_login" footprint whenever it actually runs
+    """
+    username, password = auth_credentials
+    landing_url = f"{base_url}{INVENTORY_PATH}"
+    ImpactRecorder.use("ui_login")
+
+    def login():
+        with ImpactRecorder.footprint("ui_login"):
+            return _login_and_capture_state(
+                browser, browser_context_args, base_url, username, password
+            )
+
+    for _ in range(2):
+        state_path = auth_state_cache.get_or_create(base_url, username, login)
+        context = browser.new_context(**browser_context_args, storage_state=str(state_path))
+        context.set_default_timeout(playwright_action_timeout)
+        context.set_default_navigation_timeout(playwright_navigation_timeout)
+        network = _install_network_profile(request, context)
+        page = context.new_page()
+        page.goto(landing_url)
+        if page.url == landing_url:
+            break
+        context.close()
+        auth_state_cache.invalidate(base_url, username)
+    else:
+        pytest.fail(f"Could not establish a logged-in session for '{username}' at {base_url}")
+
+    yield context
+    _finish_network_profile(request, network)
+    context.close()
+
+@pytest.fixture
+def authenticated_page(authenticated_context):
+    """Logged-in page, already on the landing page (no UI login in the test)."""
+    return authenticated_context.pages[0]
+
+@pytest.fixture(scope="session")
+def test_data_store():
+    """Indexed test data, parsed once and cached on disk across runs and workers."""
+    return CsvDataStore.open(PROJECT_ROOT / "e2e" / "resources" / "testdata.csv")
+
+@pytest.fixture
+def all_test_data(test_data_store):
+    return test_data_store.all_rows()
 
 @pytest.fixture
-def test_data(request, all_test_data):
+def test_data(request, test_data_store):
     """
     Return only the row that matches the current test function name.
     If not found, show all available test_case_name values from the CSV.
     """
     test_name = request.function.__name__
-    for row in all_test_data:
-        if row.get("test_case_name") == test_name:
-            return row
+    try:
+        return test_data_store.get(test_name)
+    except ValueError:
+        pass
 
-    available = [row.get("test_case_name") for row in all_test_data]
+    available = test_data_store.values("test_case_name")
     raise ValueError(
         f"No test data found for '{test_name}'. "
         f"Available test_case_name values in CSV: {available}"
     )
 
+@pytest.fixture(scope="session")
+def context_pool(request, browser_name, browser_context_args, playwright_action_timeout,
+                 playwright_navigation_timeout):
+    """
+    Per-worker, per-browser ContextPool, enabled with --context-pool (None otherwise).
+    Timeouts are applied once when a context is created, not per test.
+    Depending on browser_name keeps pytest-playwright's --browser parametrization
+    (test[chromium], skip_browser/only_browser) for every test using the page fixture.
+    """
+    if not request.config.getoption("context_pool"):
+        yield None
+        return
+
+    # Requested lazily so tests without a sync page (e.g. async tests) never launch it
+    browser = request.getfixturevalue("browser")
+
+    def create_context():
+        context = browser.new_context(**browser_context_args)
+        context.set_default_timeout(playwright_action_timeout)
+        context.set_default_navigation_timeout(playwright_navigation_timeout)
+        return context
+
+    pool = ContextPool(create_context, max_uses=request.config.getoption("context_pool_max_uses"))
+    pool.warm()
+    yield pool
+    pool.close()
+    logger.info("%s: %s", browser_name, pool.summary())
+
+@pytest.fixture
+def page(request, context_pool):
+    """
+    Overrides pytest-playwright's page fixture.
+    - Without --context-pool: a new page in pytest-playwright's per-test context
+    - With --context-pool: a leased page, reset and returned to the pool after the test
+    - With --har-mode record/replay: always a fresh context routed through the HAR file
+    - With video/trace recording (record marker or --record-video/--record-trace):
+      a dedicated recording context; artifacts are kept only as the mode says
+    The test's network profile is installed on the page's context in every case.
+    Tests are parametrized per --browser through context_pool's browser_name dependency.
+    """
+    config = request.config
+    lease = har = recorder = None
+    recording = RecordingPolicy.for_item(
+        request.node, config.getoption("record_video"), config.getoption("record_trace")
+    )
+    if recording.active:
+        # Recording needs its own context: video/tracing are fixed when it is created
+        recorder = Recorder(
+            request.getfixturevalue("browser"), request.getfixturevalue("browser_context_args"),
+            recording, tmp_root=_artifact_pipeline(config).dir / "recordings",
+        )
+        context = recorder.context
+        har = _install_har(request, context)
+        page = context.new_page()
+    elif context_pool is None or config.getoption("har_mode") != "off":
+        # HAR recordings are written when the context closes, so never pool them
+        context = request.getfixturevalue("context")
+        har = _install_har(request, context)
+        page = context.new_page()
+    else:
+        lease = context_pool.acquire()
+        page = lease.page
+    network = _install_network_profile(request, page.context)
+
+    yield page
+
+    _finish_network_profile(request, network)
+    failed = any(
+        getattr(getattr(request.node, f"rep_{when}", None), "failed", False)
+        for when in ("setup", "call")
+    )
+    if recorder is not None:
+        _finish_recording(request, recorder, failed)
+    if lease is not None:
+        context_pool.release(lease, discard=failed)
+    if har is not None and har.failed:
+        pytest.fail(har.failure_message())
+
+@pytest.fixture(scope="session")
+def browser_server(request, browser_name, browser_type_launch_args):
+    """
+    Warm browser server for this browser and launch options with --browser-server, else None.
+    The server is left running after the session so the next run skips browser launch;
+    stop it with `python run_tests.py --stop-browser-servers`.
+    """
+    if not request.config.getoption("browser_server"):
+        return None
+    return BrowserServer(browser_name, server_options(browser_type_launch_args))
+
+@pytest.fixture(scope="session")
+def playwright():
+    """
+    Overrides pytest-playwright's playwright fixture.
+    Under run_tests.py --watch the driver outlives the session (see utils/watch.py).
+    """
+    if WarmSession.active:
+        yield WarmSession.playwright()
+        return
+    from playwright.sync_api import sync_playwright
+
+    pw = sync_playwright().start()
+    yield pw
+    pw.stop()
+
+@pytest.fixture(scope="session")
+def browser(browser_server, browser_type, browser_type_launch_args, launch_browser):
+    """
+    Overrides pytest-playwright's browser fixture.
+    - Default: launch a browser for this session
+    - --browser-server: connect to the warm server instead; close() only disconnects
+    - run_tests.py --watch: reuse the browser kept open between reruns
+    """
+    if WarmSession.active:
+        yield WarmSession.browser(browser_type, browser_type_launch_args)
+        return
+    if browser_server is None:
+        browser = launch_browser()
+    else:
+        slow_mo = browser_type_launch_args.get("slow_mo")
+        browser = browser_server.connect(browser_type, **({"slow_mo": slow_mo} if slow_mo else {}))
+    yield browser
+    browser.close()
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def async_browser(browser_name, browser_type_launch_args, browser_server):
+    """
+    Browser driven through playwright.async_api, shared by all async tests of a worker.
+    Async tests must run on the session loop: @pytest.mark.asyncio(loop_scope="session").
+    """
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as playwright:
+        browser_type = getattr(playwright, browser_name)
+        if browser_server is None:
+            browser = await browser_type.launch(**browser_type_launch_args)
+        else:
+            browser = await browser_type.connect(browser_server.ensure())
+        yield browser
+        await browser.close()
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def async_page_factory(async_browser, browser_context_args, playwright_action_timeout,
+                             playwright_navigation_timeout):
+    """
+    Coroutine that opens a page in its own isolated context, e.g. one per virtual user:
+        pages = await asyncio.gather(*(async_page_factory() for _ in range(20)))
+    All contexts are closed concurrently after the test.
+    """
+    contexts = []
+
+    async def new_page():
+        context = await async_browser.new_context(**browser_context_args)
+        context.set_default_timeout(playwright_action_timeout)
+        context.set_default_navigation_timeout(playwright_navigation_timeout)
+        contexts.append(context)
+        return await context.new_page()
+
+    yield new_page
+    await asyncio.gather(*(context.close() for context in contexts), return_exceptions=True)
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def async_page(async_page_factory):
+    """Single async page in a fresh context."""
+    return await async_page_factory()
+
 @pytest.fixture(autouse=True)
-def apply_playwright_timeouts(page, playwright_action_timeout, playwright_navigation_timeout, playwright_test_timeout, request):
-    page.set_default_timeout(playwright_action_timeout)
-    page.set_default_navigation_timeout(playwright_navigation_timeout)
+def apply_playwright_timeouts(request, playwright_action_timeout, playwright_navigation_timeout,
+                              playwright_test_timeout):
     request.node.add_marker(pytest.mark.timeout(playwright_test_timeout / 1000))
+    # Only touch the page when the test uses one; pooled pages are configured at creation.
+    # The pool is looked up here too, so tests without a page are not parametrized per browser.
+    if "page" in request.fixturenames:
+        page = request.getfixturevalue("page")
+        context_pool = request.getfixturevalue("context_pool")
+        if context_pool is None or not context_pool.owns(page):
+            page.set_default_timeout(playwright_action_timeout)
+            page.set_default_navigation_timeout(playwright_navigation_timeout)
 
     yield
     # No cleanup needed
@@ -103,31 +763,28 @@ def apply_playwright_timeouts(page, playwright_action_timeout, playwright_naviga
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     """
-    Hook to attach screenshot and video on failure.
+    Hook to attach a screenshot on failure (page, authenticated_page/_context).
+    Videos and traces are attached by the page fixture once the context closes
+    (see _finish_recording), since Playwright only finalizes them then.
     """
     outcome = yield
     result = outcome.get_result()
+    # Expose per-phase reports (rep_setup/rep_call/rep_teardown) to fixtures
+    setattr(item, f"rep_{result.when}", result)
 
     if result.when == "call" and result.failed:
-        page = item.funcargs.get("page", None)
-        if page:
-            # Screenshot
-            screenshot_path = PROJECT_ROOT / f"screenshot_{item.name}.png"
-            page.screenshot(path=str(screenshot_path), full_page=True)
-            allure.attach.file(
-                str(screenshot_path),
-                name="screenshot",
-                attachment_type=allure.attachment_type.PNG
+        page = _failure_page(item)
+        if page is not None:
+            import allure
+
+            # Screenshot: attached from memory, so it is published with allure-results;
+            # hashing and archiving under reports/artifacts/<worker>/ (within the budget)
+            # happen in the background and are only waited for at the end of the run.
+            screenshot = page.screenshot(full_page=True)
+            allure.attach(
+                screenshot, name="screenshot", attachment_type=allure.attachment_type.PNG
+            )
+            _artifact_pipeline(item.config).submit_bytes(
+                screenshot, "screenshot", "png", item.nodeid
             )
 
-            # Video (only if Playwright was configured for recording)
-            try:
-                if page.video:
-                    video_path = page.video.path()
-                    allure.attach.file(
-                        str(video_path),
-                        name="video",
-                        attachment_type=allure.attachment_type.MP4
-                    )
-            except Exception:
-                pass
@@ -1 +1,34 @@
-ENV_FILE_NAME = ".env.test"
\ No newline at end of file
+ENV_FILE_NAME = ".env.test"
+
+# Local, git-ignored cache for auth state, compiled data and run history
+CACHE_DIR_NAME = ".cache"
+
+# Landing page reached after a successful login
+INVENTORY_PATH = "/inventory.html"
+
+# Seconds a cached storage_state stays valid before logging in again
+DEFAULT_AUTH_STATE_TTL = 1800
+
+# Network profile implied by suite markers (see utils/network_profile.py);
+# web_perf budgets are only meaningful on the full page, so it overrides smoke
+NETWORK_PROFILE_BY_MARKER = {"ui": "full", "web_perf": "full", "smoke": "aggressive"}
+
+# Duration guesses (seconds) for tests with no recorded history, by marker
+MARKER_DURATION_ESTIMATES = {"slow": 30.0, "regression": 8.0, "smoke": 4.0, "ui": 3.0, "api": 1.0}
+DEFAULT_DURATION_ESTIMATE = 5.0
+
+# Disk budget (MB) for failure artifacts per run, shared by all xdist workers
+DEFAULT_ARTIFACT_BUDGET_MB = 500
+
+# Tests passing less often than this over their recent history are quarantined
+QUARANTINE_PASS_RATE = 0.9
+
+# Recent results per test considered for pass rates and trends, and the minimum needed to judge
+HISTORY_WINDOW = 20
+HISTORY_MIN_RUNS = 5
+
+# A duration is a regression when it is this much slower than its rolling baseline median,
+# at least this many robust (MAD) standard deviations out, and slower by at least the minimum
+REGRESSION_THRESHOLD = 0.3
+REGRESSION_Z_SCORE = 3.5
+REGRESSION_MIN_DELTA_MS = 50.0
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Synthetic browser load using the async page objects as virtual users
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Page objects import e2e.*, so make the project root importable when run from e2e/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from e2e.constants import INVENTORY_PATH
+from e2e.pages.async_login_page import AsyncLoginPage
+from e2e.utils.load_runner import SCENARIO_STEP, run_load, summarize_load
+from e2e.utils.settings import Settings
+
+
+# --- Scenarios: coroutines built from page-object calls, one step per user-visible action ---
+
+async def login_scenario(user):
+    """Open the login page and log in until the inventory page is shown."""
+    login_page = AsyncLoginPage(user.page)
+    async with user.step("open_login"):
+        await login_page.navigate_to(user.base_url)
+    async with user.step("login"):
+        await login_page.login(*user.credentials)
+        await login_page.wait_for_url(f"{user.base_url}{INVENTORY_PATH}")
+
+
+async def login_logout_scenario(user):
+    """login_scenario followed by a logout back to the login form."""
+    await login_scenario(user)
+    login_page = AsyncLoginPage(user.page)
+    async with user.step("logout"):
+        await login_page.logout()
+        await login_page.wait_for_login_page_load()
+
+
+SCENARIOS = {
+    "login": login_scenario,
+    "login_logout": login_logout_scenario,
+}
+
+
+def load_target_config():
+    """
+    base_url and credentials resolved the same way as the pytest settings fixture;
+    base_url is None unless configured somewhere (load is never sent to the placeholder default).
+    """
+    settings = Settings.resolve()
+    base_url = None if settings.sources["base_url"] == "default" else settings.base_url
+    return {"base_url": base_url, "username": settings.username, "password": settings.password}
+
+
+def print_report(report: dict):
+    print(f"\nwindow {report['window_seconds']:.1f}s, target {report['target_rate']}/s, "
+          f"achieved {report['achieved_rate']:.2f} arrivals/s, "
+          f"queueing p95 {report['queued_ms']['p95']:.0f} ms")
+    print(f"{'step':<16} {'count':>6} {'err %':>7} {'ok/s':>7} "
+          f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, step in sorted(report["steps"].items(), key=lambda kv: kv[0] == SCENARIO_STEP):
+        latency = step["latency_ms"]
+        print(f"{name:<16} {step['count']:>6} {step['error_rate'] * 100:>7.1f} "
+              f"{step['throughput_per_s']:>7.2f} "
+              f"{latency['p50']:>9.0f} {latency['p95']:>9.0f} {latency['p99']:>9.0f}")
+    for error, count in report["errors"].items():
+        print(f"  {count}x {error}")
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="E2E synthetic load runner")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="login",
+                        help="Scenario each virtual user runs")
+    parser.add_argument("-u", "--users", type=int, default=10,
+                        help="Maximum concurrent virtual users (contexts)")
+    parser.add_argument("-p", "--processes", type=int, default=2,
+                        help="Worker processes, each with its own browser")
+    parser.add_argument("-r", "--rate", type=float, default=2.0,
+                        help="Target arrival rate (virtual users per second)")
+    parser.add_argument("-d", "--duration", type=float, default=30.0,
+                        help="Seconds to keep generating arrivals")
+    parser.add_argument("--poisson", action="store_true",
+                        help="Exponential inter-arrival times instead of evenly spaced")
+    parser.add_argument("--base-url", help="Target (default: BASE_URL or base_url in .env.test)")
+    parser.add_argument("--username", help="Login user (default: TEST_USERNAME or .env.test)")
+    parser.add_argument("--password", help="Login password (default: TEST_PASSWORD or .env.test)")
+    parser.add_argument("--local", action="store_true",
+                        help="Run against a local stand-in server instead of a real target")
+    parser.add_argument("--local-latency-ms", type=float, default=0,
+                        help="Artificial server latency for --local")
+    parser.add_argument("-b", "--browser", choices=["chromium", "firefox", "webkit"],
+                        default="chromium")
+    parser.add_argument("--headed", action="store_true", help="Show the browsers")
+    parser.add_argument("--timeout-ms", type=int, default=10000,
+                        help="Playwright action timeout per step")
+    parser.add_argument("--seed", type=int, help="Random seed for --poisson arrivals")
+    parser.add_argument("--output", default="reports/metrics/load_test.json",
+                        help="JSON report path")
+    parser.add_argument("--max-error-rate", type=float,
+                        help="Exit non-zero when the scenario error rate exceeds this fraction "
+                             "(e.g. 0.01)")
+    args = parser.parse_args()
+
+    target = load_target_config()
+    username = args.username or target["username"]
+    password = args.password or target["password"]
+    local_app = None
+    if args.local:
+        from e2e.utils.local_app import DEFAULT_USERS, LocalApp
+
+        if not (username and password):
+            username, password = next(iter(DEFAULT_USERS.items()))
+        local_app = LocalApp(users={username: password}, latency_ms=args.local_latency_ms).start()
+        base_url = local_app.url
+    else:
+        base_url = args.base_url or target["base_url"]
+        if not base_url:
+            parser.error("No target: pass --base-url, set BASE_URL, or use --local")
+
+    print(f"Load: scenario={args.scenario} target={base_url} rate={args.rate}/s "
+          f"duration={args.duration}s users={args.users} processes={args.processes}")
+    try:
+        rows = run_load(
+            SCENARIOS[args.scenario], base_url, (username, password),
+            args.rate, args.duration, args.users,
+            processes=args.processes, browser=args.browser, headless=not args.headed,
+            timeout_ms=args.timeout_ms, poisson=args.poisson, seed=args.seed,
+        )
+    finally:
+        if local_app is not None:
+            local_app.stop()
+
+    report = summarize_load(rows, args.rate)
+    report["config"] = {key: value for key, value in vars(args).items() if key != "password"}
+    report["config"]["base_url"] = base_url
+    print_report(report)
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Report saved to {output}")
+
+    scenario = report["steps"].get(SCENARIO_STEP)
+    if args.max_error_rate is not None:
+        if scenario is None or scenario["error_rate"] > args.max_error_rate:
+            sys.exit(1)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,30 @@
 """
 Page objects package for e2e tests
 """
-from .base_page import BasePage
-from .login_page import LoginPage
+import importlib
+from typing import TYPE_CHECKING
 
-__all__ = ['BasePage', 'LoginPage']
+if TYPE_CHECKING:
+    # For type checkers and linters only; at runtime __getattr__ imports on first use
+    from .base_page import BasePage
+    from .login_page import LoginPage
+    from .page_locator import PageLocator
+    from .async_base_page import AsyncBasePage
+    from .async_login_page import AsyncLoginPage
+
+# Resolved lazily, so importing a sync page object never pulls in playwright.async_api
+_EXPORTS = {
+    'BasePage': '.base_page',
+    'LoginPage': '.login_page',
+    'PageLocator': '.page_locator',
+    'AsyncBasePage': '.async_base_page',
+    'AsyncLoginPage': '.async_login_page',
+}
+
+__all__ = ['BasePage', 'LoginPage', 'PageLocator', 'AsyncBasePage', 'AsyncLoginPage']
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,201 @@
+"""
+Async base page class for Playwright page object model using Locators
+"""
+import time
+
+from playwright.async_api import Page, Locator
+from e2e.utils.action_timing import instrument_class
+from e2e.utils.web_vitals import WebPerf
+from .page_scripts import (
+    BATCH_ACTIONS_JS, FIELD_VALUE_JS, QUERY_STATES_JS, BatchResult, batch_result, fallback_call,
+    fallback_state, plan_batch, plan_queries,
+)
+
+
+class AsyncBasePage:
+    """
+    playwright.async_api counterpart of BasePage with the same method names.
+    Every action is a coroutine, so many pages can be driven concurrently
+    on one event loop (e.g. with asyncio.gather).
+    """
+
+    def __init__(self, page: Page):
+        self.page = page
+
+    def __init_subclass__(cls, **kwargs):
+        # Every public action of every page object is timed (see utils/action_timing.py)
+        super().__init_subclass__(**kwargs)
+        instrument_class(cls)
+
+    # --- Navigation ---
+
+    async def navigate_to(self, url: str):
+        """Navigate to the specified URL (web perf metrics are captured for web_perf tests)"""
+        await self.page.goto(url)
+        await WebPerf.capture_async(self.page, "navigate_to")
+
+    # --- Element interactions using Locators ---
+
+    async def click(self, element: Locator):
+        """Click on element (auto-waits)"""
+        await element.click()
+
+    async def fill_text(self, element: Locator, text: str):
+        """Fill text in input field (auto-waits)"""
+        await element.fill(text)
+
+    async def type_text(self, element: Locator, text: str):
+        """Type text character by character (auto-waits)"""
+        await element.type(text)
+
+    async def get_text(self, element: Locator) -> str:
+        """Get inner text of element (auto-waits)"""
+        return await element.inner_text()
+
+    async def is_visible(self, element: Locator) -> bool:
+        """Check if element is visible (without auto-waiting)"""
+        return await element.is_visible(timeout=0)
+
+    async def is_enabled(self, element: Locator) -> bool:
+        """Check if element is enabled (without auto-waiting)"""
+        return await element.is_enabled(timeout=0)
+
+    async def wait_for_element(self, element: Locator, timeout: int = 10000):
+        """Wait for element to be visible"""
+        await element.wait_for(state="visible", timeout=timeout)
+
+    # --- Batched actions ---
+
+    async def run_batch(self, actions) -> BatchResult:
+        """
+        Run several form actions with as few driver round trips as possible.
+        actions: (action, target[, value]) tuples, where action is fill, check,
+        uncheck, select or click and target is a PageLocator attribute name
+        (e.g. "username_field") or a CSS selector:
+            await self.run_batch([("fill", "username_field", "bob"), ("click", "login_button")])
+        - Runs every action in one page.evaluate (one round trip instead of one per
+          action); if the first element is not ready yet, auto-waits for it to be
+          visible like a regular action and evaluates once more
+        - If an element is missing, hidden, disabled or not CSS-addressable, the rest
+          of the batch falls back to regular auto-waiting Playwright calls
+        - Clicks are DOM clicks (no hover/mouse movement); use click() where that matters
+        - A trailing click is deferred, so run_batch returns before it happens and does
+          not wait for a navigation; submit with a regular click() when the test checks
+          the result right away
+        Returns a BatchResult with the round trips used and saved.
+        """
+        steps = plan_batch(self, actions)
+        if not steps:
+            return BatchResult(0, 0, 0, None)
+        outcome = await self.page.evaluate(BATCH_ACTIONS_JS, steps)
+        round_trips = 1
+        if outcome["done"] == 0:
+            await self.page.locator(steps[0][1]).first.wait_for(state="visible")
+            outcome = await self.page.evaluate(BATCH_ACTIONS_JS, steps)
+            round_trips += 2
+        for action, selector, value in steps[outcome["done"]:]:
+            await fallback_call(self.page.locator(selector), action, value)
+            round_trips += 1
+        return batch_result(steps, round_trips, outcome)
+
+    # --- Bulk state queries ---
+
+    async def query_states(self, targets, attributes=(), all_matches: bool = False) -> dict:
+        """
+        Read the state of many elements in one page.evaluate (no auto-waiting).
+        targets: list of PageLocator attribute names, or {name: attribute name or selector}
+        Returns {name: state} where state has count, visible, enabled, text (innerText),
+        value (form controls) and attributes ({attribute: value} for `attributes`),
+        all taken from the first match. With all_matches=True, state is
+        {"count": n, "elements": [...]} with one entry per match, e.g. for table rows.
+        Selectors that are not plain CSS are read through regular Playwright calls.
+        """
+        selectors = plan_queries(self, targets)
+        attributes = list(attributes)
+        states = await self.page.evaluate(QUERY_STATES_JS, [selectors, attributes, all_matches])
+        for name, state in states.items():
+            if state is None:
+                states[name] = await self._query_state_fallback(
+                    selectors[name], attributes, all_matches
+                )
+        return states
+
+    async def _query_state_fallback(self, selector: str, attributes: list,
+                                    all_matches: bool) -> dict:
+        """query_states() entry through the Playwright API (selectors the page cannot run)."""
+        locator = self.page.locator(selector)
+        count = await locator.count()
+        elements = []
+        for index in range(count if all_matches else min(count, 1)):
+            element = locator.nth(index)
+            elements.append({
+                "visible": await element.is_visible(),
+                "enabled": await element.is_enabled(),
+                "text": await element.inner_text(),
+                "value": await element.evaluate(FIELD_VALUE_JS),
+                "attributes": {name: await element.get_attribute(name) for name in attributes},
+            })
+        return fallback_state(count, elements, attributes, all_matches)
+
+    # --- Page-level methods ---
+
+    async def wait_for_url(self, url: str, timeout: int = 10000):
+        """Wait for URL to match (web perf metrics are captured for web_perf tests)"""
+        started = time.perf_counter()
+        await self.page.wait_for_url(url, timeout=timeout)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        await WebPerf.capture_async(self.page, "wait_for_url", elapsed_ms=elapsed_ms)
+
+    def get_current_url(self) -> str:
+        """Get current page URL (no driver round trip, so not a coroutine)"""
+        return self.page.url
+
+    async def get_title(self) -> str:
+        """Get page title"""
+        return await self.page.title()
+
+    async def scroll_to_element(self, element: Locator):
+        """Scroll to element"""
+        await element.scroll_into_view_if_needed()
+
+    async def select_option(self, element: Locator, value: str):
+        """Select option from dropdown"""
+        await element.select_option(value)
+
+    async def upload_file(self, element: Locator, file_path: str):
+        """Upload file"""
+        await element.set_input_files(file_path)
+
+    async def take_screenshot(self, path: str = None):
+        """Take screenshot"""
+        if path:
+            await self.page.screenshot(path=path)
+        else:
+            return await self.page.screenshot()
+
+    async def press_key(self, element: Locator, key: str):
+        """Press key on element"""
+        await element.press(key)
+
+    async def hover(self, element: Locator):
+        """Hover over element"""
+        await element.hover()
+
+    async def double_click(self, element: Locator):
+        """Double click on element"""
+        await element.dblclick()
+
+    async def right_click(self, element: Locator):
+        """Right click on element"""
+        await element.click(button="right")
+
+    async def get_attribute(self, element: Locator, attribute: str) -> str:
+        """Get attribute value of element"""
+        return await element.get_attribute(attribute)
+
+    async def set_viewport_size(self, width: int, height: int):
+        """Set viewport size"""
+        await self.page.set_viewport_size({"width": width, "height": height})
+
+
+instrument_class(AsyncBasePage)
@@ -0,0 +1,48 @@
+"""
+Async login page object model, mirroring LoginPage on playwright.async_api
+"""
+from playwright.async_api import expect
+from .async_base_page import AsyncBasePage
+from .login_page import LoginLocators
+from .page_scripts import BatchResult
+
+class AsyncLoginPage(AsyncBasePage, LoginLocators):
+
+    # Page actions
+    async def enter_username(self, username: str):
+        await self.username_field.fill(username)
+
+    async def enter_password(self, password: str):
+        await self.password_field.fill(password)
+
+    async def click_login(self):
+        await self.login_button.click()
+
+    async def login(self, username: str, password: str) -> BatchResult:
+        # Both fields in one batched evaluation; the submit stays a regular click so it
+        # gets actionability checks and waits for the navigation it starts
+        result = await self.run_batch([
+            ("fill", "username_field", username),
+            ("fill", "password_field", password),
+        ])
+        await self.click_login()
+        return result
+
+    async def get_error_message(self) -> str:
+        return await self.error_message.inner_text()
+
+    async def is_error_displayed(self) -> bool:
+        return await self.error_message.is_visible()
+
+    async def logout(self):
+        await self.logout_button.click()
+
+    async def wait_for_login_page_load(self):
+        await expect(self.username_field).to_be_visible()
+        await expect(self.password_field).to_be_visible()
+        await expect(self.login_button).to_be_visible()
+
+    async def is_login_form_visible(self) -> bool:
+        # One evaluation for the whole form instead of an is_visible call per field
+        states = await self.query_states(["username_field", "password_field", "login_button"])
+        return all(state["visible"] for state in states.values())
@@ -1,18 +1,32 @@
 """
 Base page class for Playwright page object model using Locators
 """
+import time
+
 from playwright.sync_api import Page, expect, Locator
+from e2e.utils.action_timing import instrument_class
+from e2e.utils.web_vitals import WebPerf
+from .page_scripts import (
+    BATCH_ACTIONS_JS, FIELD_VALUE_JS, QUERY_STATES_JS, BatchResult, batch_result, fallback_call,
+    fallback_state, plan_batch, plan_queries,
+)
 
 
 class BasePage:
     def __init__(self, page: Page):
         self.page = page
 
+    def __init_subclass__(cls, **kwargs):
+        # Every public action of every page object is timed (see utils/action_timing.py)
+        super().__init_subclass__(**kwargs)
+        instrument_class(cls)
+
     # --- Navigation ---
 
     def navigate_to(self, url: str):
-        """Navigate to the specified URL"""
+        """Navigate to the specified URL (web perf metrics are captured for web_perf tests)"""
         self.page.goto(url)
+        WebPerf.capture(self.page, "navigate_to")
 
     # --- Element interactions using Locators ---
 
@@ -44,11 +58,84 @@ class BasePage:
         """Wait for element to be visible"""
         element.wait_for(state="visible", timeout=timeout)
 
+    # --- Batched actions ---
+
+    def run_batch(self, actions) -> BatchResult:
+        """
+        Run several form actions with as few driver round trips as possible.
+        actions: (action, target[, value]) tuples, where action is fill, check,
+        uncheck, select or click and target is a PageLocator attribute name
+        (e.g. "username_field") or a CSS selector:
+            self.run_batch([("fill", "username_field", "bob"), ("click", "login_button")])
+        - Runs every action in one page.evaluate (one round trip instead of one per
+          action); if the first element is not ready yet, auto-waits for it to be
+          visible like a regular action and evaluates once more
+        - If an element is missing, hidden, disabled or not CSS-addressable, the rest
+          of the batch falls back to regular auto-waiting Playwright calls
+        - Clicks are DOM clicks (no hover/mouse movement); use click() where that matters
+        - A trailing click is deferred, so run_batch returns before it happens and does
+          not wait for a navigation; submit with a regular click() when the test checks
+          the result right away
+        Returns a BatchResult with the round trips used and saved.
+        """
+        steps = plan_batch(self, actions)
+        if not steps:
+            return BatchResult(0, 0, 0, None)
+        outcome = self.page.evaluate(BATCH_ACTIONS_JS, steps)
+        round_trips = 1
+        if outcome["done"] == 0:
+            self.page.locator(steps[0][1]).first.wait_for(state="visible")
+            outcome = self.page.evaluate(BATCH_ACTIONS_JS, steps)
+            round_trips += 2
+        for action, selector, value in steps[outcome["done"]:]:
+            fallback_call(self.page.locator(selector), action, value)
+            round_trips += 1
+        return batch_result(steps, round_trips, outcome)
+
+    # --- Bulk state queries ---
+
+    def query_states(self, targets, attributes=(), all_matches: bool = False) -> dict:
+        """
+        Read the state of many elements in one page.evaluate (no auto-waiting).
+        targets: list of PageLocator attribute names, or {name: attribute name or selector}
+        Returns {name: state} where state has count, visible, enabled, text (innerText),
+        value (form controls) and attributes ({attribute: value} for `attributes`),
+        all taken from the first match. With all_matches=True, state is
+        {"count": n, "elements": [...]} with one entry per match, e.g. for table rows.
+        Selectors that are not plain CSS are read through regular Playwright calls.
+        """
+        selectors = plan_queries(self, targets)
+        attributes = list(attributes)
+        states = self.page.evaluate(QUERY_STATES_JS, [selectors, attributes, all_matches])
+        for name, state in states.items():
+            if state is None:
+                states[name] = self._query_state_fallback(selectors[name], attributes, all_matches)
+        return states
+
+    def _query_state_fallback(self, selector: str, attributes: list, all_matches: bool) -> dict:
+        """query_states() entry through the Playwright API (selectors the page cannot run)."""
+        locator = self.page.locator(selector)
+        count = locator.count()
+        elements = []
+        for index in range(count if all_matches else min(count, 1)):
+            element = locator.nth(index)
+            elements.append({
+                "visible": element.is_visible(),
+                "enabled": element.is_enabled(),
+                "text": element.inner_text(),
+                "value": element.evaluate(FIELD_VALUE_JS),
+                "attributes": {name: element.get_attribute(name) for name in attributes},
+            })
+        return fallback_state(count, elements, attributes, all_matches)
+
     # --- Page-level methods ---
 
     def wait_for_url(self, url: str, timeout: int = 10000):
-        """Wait for URL to match"""
+        """Wait for URL to match (web perf metrics are captured for web_perf tests)"""
+        started = time.perf_counter()
         self.page.wait_for_url(url, timeout=timeout)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        WebPerf.capture(self.page, "wait_for_url", elapsed_ms=elapsed_ms)
 
     def get_current_url(self) -> str:
         """Get current page URL"""
@@ -100,3 +187,6 @@ class BasePage:
     def set_viewport_size(self, width: int, height: int):
         """Set viewport size"""
         self.page.set_viewport_size({"width": width, "height": height})
+
+
+instrument_class(BasePage)
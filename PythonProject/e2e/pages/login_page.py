@@ -1,29 +1,25 @@
 """
 Login page object model for Playwright using clean Page Object Model
 """
-from playwright.sync_api import Page, expect
+from playwright.sync_api import expect
 from .base_page import BasePage
+from .page_locator import PageLocator
+from .page_scripts import BatchResult
 
-class LoginPage(BasePage):
+class LoginLocators:
+    """Login page elements, shared by LoginPage and AsyncLoginPage."""
 
-    
-    # Selectors stored as class-level constants
-    USERNAME_SELECTOR = "#user-name"
-    PASSWORD_SELECTOR = "#password"
-    LOGIN_BUTTON_SELECTOR = "#login-button"
-    ERROR_MESSAGE_SELECTOR = "[data-test='error']"
-    LOGOUT_BUTTON_SELECTOR = "#logout_sidebar_link"
+    # Section of locators/*.yaml holding this page's selectors
+    LOCATOR_PAGE = "login_page"
 
-    def __init__(self, page: Page):
-        super().__init__(page)
-        self.page = page
+    # Locators resolve lazily on first access
+    username_field = PageLocator()
+    password_field = PageLocator()
+    login_button = PageLocator()
+    error_message = PageLocator()
+    logout_button = PageLocator()
 
-        # Initialize Locator objects once
-        self.username_field = page.locator(self.USERNAME_SELECTOR)
-        self.password_field = page.locator(self.PASSWORD_SELECTOR)
-        self.login_button = page.locator(self.LOGIN_BUTTON_SELECTOR)
-        self.error_message = page.locator(self.ERROR_MESSAGE_SELECTOR)
-        self.logout_button = page.locator(self.LOGOUT_BUTTON_SELECTOR)
+class LoginPage(BasePage, LoginLocators):
 
     # Page actions
     def enter_username(self, username: str):
@@ -35,10 +31,15 @@ class LoginPage(BasePage):
     def click_login(self):
         self.login_button.click()
 
-    def login(self, username: str, password: str):
-        self.enter_username(username)
-        self.enter_password(password)
+    def login(self, username: str, password: str) -> BatchResult:
+        # Both fields in one batched evaluation; the submit stays a regular click so it
+        # gets actionability checks and waits for the navigation it starts
+        result = self.run_batch([
+            ("fill", "username_field", username),
+            ("fill", "password_field", password),
+        ])
         self.click_login()
+        return result
 
     def get_error_message(self) -> str:
         return self.error_message.inner_text()
@@ -55,8 +56,6 @@ class LoginPage(BasePage):
         expect(self.login_button).to_be_visible()
 
     def is_login_form_visible(self) -> bool:
-        return (
-            self.username_field.is_visible() and
-            self.password_field.is_visible() and
-            self.login_button.is_visible()
-        )
+        # One evaluation for the whole form instead of an is_visible call per field
+        states = self.query_states(["username_field", "password_field", "login_button"])
+        return all(state["visible"] for state in states.values())
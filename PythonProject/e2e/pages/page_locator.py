@@ -0,0 +1,53 @@
+"""
+Lazy Locator descriptor for page objects
+"""
+from e2e.utils.impact import ImpactRecorder
+from e2e.utils.locator_registry import LocatorRegistry
+
+
+class PageLocator:
+    """
+    Declares an element on a page object class.
+    - The selector is looked up in LocatorRegistry under the owner's LOCATOR_PAGE
+      section, using the attribute name unless an explicit name is given
+    - The Locator is built on first access and cached on the instance, so
+      constructing a page object creates no Locators at all
+    - Selectors are cached per owner class until LocatorRegistry.reset()
+    """
+
+    def __init__(self, name: str = None, page: str = None):
+        self.name = name
+        self.page = page
+        self.attr = None
+        self._selectors = {}
+        self._generation = LocatorRegistry.generation
+
+    def __set_name__(self, owner, attr):
+        self.attr = attr
+        if self.name is None:
+            self.name = attr
+
+    def selector_for(self, owner) -> str:
+        """Selector string for this locator as declared on owner (cached per class)."""
+        page = self.page or getattr(owner, "LOCATOR_PAGE", None)
+        if ImpactRecorder.active:
+            ImpactRecorder.locators.add(f"{page}.{self.name}")
+        if self._generation != LocatorRegistry.generation:
+            self._selectors.clear()
+            self._generation = LocatorRegistry.generation
+        selector = self._selectors.get(owner)
+        if selector is None:
+            if page is None:
+                raise ValueError(
+                    f"{owner.__name__}.{self.attr} needs a page section (set LOCATOR_PAGE)"
+                )
+            selector = self._selectors[owner] = LocatorRegistry.default().get(page, self.name)
+        return selector
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        locator = instance.page.locator(self.selector_for(owner))
+        # Non-data descriptor: the instance attribute now shadows us
+        instance.__dict__[self.attr] = locator
+        return locator
@@ -0,0 +1,206 @@
+"""
+In-page scripts shared by BasePage and AsyncBasePage
+"""
+import inspect
+from collections import namedtuple
+
+from .page_locator import PageLocator
+
+BATCH_ACTIONS = ("fill", "check", "uncheck", "select", "click")
+
+# Playwright's definitions: visible = non-empty box and not visibility:hidden;
+# enabled = not a disabled form control (or inside a disabled fieldset) and not aria-disabled
+_ELEMENT_HELPERS_JS = """
+    const isVisible = (el) => {
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0 && getComputedStyle(el).visibility !== "hidden";
+    };
+    const isEnabled = (el) => !el.disabled && !el.closest("fieldset:disabled")
+        && el.getAttribute("aria-disabled") !== "true";
+"""
+
+# Runs a list of [action, css_selector, value] in one evaluation. Stops at the first
+# element that is missing, hidden, disabled or not a plain CSS match and reports how
+# far it got, so the caller can finish with regular (auto-waiting) Playwright calls.
+# Values are set through the prototype's native setter so React-style controlled
+# inputs see the change, followed by bubbling input/change events. A trailing click
+# is deferred to a task so a navigation it starts cannot destroy the evaluation.
+BATCH_ACTIONS_JS = """
+(steps) => {""" + _ELEMENT_HELPERS_JS + """
+    const notify = (el) => {
+        el.dispatchEvent(new Event("input", { bubbles: true }));
+        el.dispatchEvent(new Event("change", { bubbles: true }));
+    };
+    const setValue = (el, value) => {
+        const descriptor = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), "value");
+        if (descriptor && descriptor.set) descriptor.set.call(el, value);
+        else el.value = value;
+    };
+    for (let i = 0; i < steps.length; i++) {
+        const [action, selector, value] = steps[i];
+        let el;
+        try {
+            el = document.querySelector(selector);
+        } catch (e) {
+            return { done: i, reason: `not a CSS selector: ${selector}` };
+        }
+        if (!el) return { done: i, reason: `no element matches ${selector}` };
+        if (!isVisible(el)) return { done: i, reason: `${selector} is not visible` };
+        if (!isEnabled(el)) return { done: i, reason: `${selector} is disabled` };
+
+        if (action === "fill") {
+            if (el.readOnly) return { done: i, reason: `${selector} is read-only` };
+            el.focus();
+            if (el.isContentEditable) el.textContent = value;
+            else setValue(el, value);
+            notify(el);
+        } else if (action === "check" || action === "uncheck") {
+            const wanted = action === "check";
+            if (el.checked !== wanted) el.click();
+            if (el.checked !== wanted) {
+                return { done: i, reason: `${selector} did not become ${action}ed` };
+            }
+        } else if (action === "select") {
+            const wanted = Array.isArray(value) ? value : [value];
+            let matched = 0;
+            for (const option of el.options || []) {
+                option.selected = wanted.includes(option.value) || wanted.includes(option.label);
+                if (option.selected) matched++;
+            }
+            if (!matched) {
+                return { done: i, reason: `no option ${JSON.stringify(value)} in ${selector}` };
+            }
+            notify(el);
+        } else if (action === "click") {
+            if (i === steps.length - 1) setTimeout(() => el.click(), 0);
+            else el.click();
+        }
+    }
+    return { done: steps.length, reason: null };
+}
+"""
+
+# Reads the state of many elements in one evaluation: {name: selector} -> {name: state}.
+# A name whose selector is not plain CSS maps to null so the caller can query it
+# through Playwright instead.
+QUERY_STATES_JS = """
+([selectors, attributes, allMatches]) => {""" + _ELEMENT_HELPERS_JS + """
+    const stateOf = (el) => {
+        const attrs = {};
+        for (const name of attributes) attrs[name] = el.getAttribute(name);
+        return {
+            visible: isVisible(el),
+            enabled: isEnabled(el),
+            text: el.innerText,
+            value: "value" in el ? el.value : null,
+            attributes: attrs,
+        };
+    };
+    const MISSING = { visible: false, enabled: false, text: null, value: null,
+        attributes: Object.fromEntries(attributes.map((name) => [name, null])) };
+    const result = {};
+    for (const [name, selector] of Object.entries(selectors)) {
+        let elements;
+        try {
+            elements = Array.from(document.querySelectorAll(selector));
+        } catch (e) {
+            result[name] = null;
+            continue;
+        }
+        result[name] = allMatches
+            ? { count: elements.length, elements: elements.map(stateOf) }
+            : { count: elements.length, ...(elements.length ? stateOf(elements[0]) : MISSING) };
+    }
+    return result;
+}
+"""
+
+
+class BatchResult(namedtuple("BatchResult", "actions round_trips saved fallback_reason")):
+    """
+    Outcome of run_batch():
+    - round_trips: driver calls made (evaluations, the first-element wait, fallbacks)
+    - saved: round trips avoided compared to one Playwright call per action (never below 0)
+    - fallback_reason: why the batch stopped early, None when it ran in full
+    """
+
+
+# Playwright Locator method behind each batch action (run_batch fallback)
+_FALLBACK_METHODS = {
+    "fill": "fill", "check": "check", "uncheck": "uncheck", "select": "select_option",
+    "click": "click",
+}
+
+# Form control value (None for other elements), read per element by the fallbacks
+FIELD_VALUE_JS = "el => 'value' in el ? el.value : null"
+
+
+def fallback_call(locator, action: str, value=None):
+    """
+    One batch step through the regular Playwright API. Returns whatever the
+    Locator method returns, i.e. a coroutine to await for async_api locators.
+    """
+    method = getattr(locator, _FALLBACK_METHODS[action])
+    return method(value) if action in ("fill", "select") else method()
+
+
+def batch_result(steps: list, round_trips: int, outcome: dict) -> BatchResult:
+    """BatchResult for steps run with round_trips driver calls."""
+    # The fallback path can cost more round trips than it saves; never report a negative saving
+    saved = max(len(steps) - round_trips, 0)
+    return BatchResult(len(steps), round_trips, saved, outcome["reason"])
+
+
+def fallback_state(count: int, elements: list, attributes: list, all_matches: bool) -> dict:
+    """query_states() entry built from per-element states read through the Playwright API."""
+    if all_matches:
+        return {"count": count, "elements": elements}
+    if not elements:
+        elements.append({
+            "visible": False, "enabled": False, "text": None, "value": None,
+            "attributes": dict.fromkeys(attributes),
+        })
+    return {"count": count, **elements[0]}
+
+
+def selector_of(page_object, target: str) -> str:
+    """Selector for a PageLocator attribute name on the page object, else target itself."""
+    if not isinstance(target, str):
+        raise ValueError(
+            "Batch targets must be PageLocator attribute names or selector strings, "
+            f"got {type(target).__name__}"
+        )
+    descriptor = inspect.getattr_static(type(page_object), target, None)
+    if isinstance(descriptor, PageLocator):
+        return descriptor.selector_for(type(page_object))
+    return target
+
+
+def plan_batch(page_object, actions) -> list:
+    """
+    Validate (action, target[, value]) tuples into [action, selector, value] steps.
+    fill and select take a value; check, uncheck and click do not.
+    """
+    steps = []
+    for action in actions:
+        kind, target, *rest = action
+        if kind not in BATCH_ACTIONS:
+            raise ValueError(f"Unknown batch action '{kind}'; expected one of {BATCH_ACTIONS}")
+        takes_value = kind in ("fill", "select")
+        if len(rest) != int(takes_value):
+            raise ValueError(
+                f"Batch action '{kind}' on '{target}' "
+                f"{'needs' if takes_value else 'takes no'} value"
+            )
+        steps.append([kind, selector_of(page_object, target), rest[0] if rest else None])
+    return steps
+
+
+def plan_queries(page_object, targets) -> dict:
+    """
+    {name: selector} for query_states(). targets is either a list of PageLocator
+    attribute names (used as the result keys) or a {name: attribute name or selector} map.
+    """
+    if not isinstance(targets, dict):
+        targets = {name: name for name in targets}
+    return {name: selector_of(page_object, target) for name, target in targets.items()}
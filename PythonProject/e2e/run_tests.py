@@ -7,10 +7,17 @@ import sys
 import subprocess
 import argparse
 from datetime import datetime
+from pathlib import Path
 
+# Modules that import e2e.* need the project root importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-def run_tests(args):
-    """Run pytest with specified arguments"""
+from e2e.utils.import_time import format_report, measure_startup
+from e2e.utils.result_merge import merge_shard_outputs
+
+
+def build_command(args):
+    """pytest command line for the parsed arguments"""
     
     # Base pytest command
     cmd = [sys.executable, "-m", "pytest", "tests/"]
@@ -27,9 +34,52 @@ def run_tests(args):
     if args.headless:
         cmd.append("--headless")
     
-    # Add parallel execution
+    # Add parallel execution, longest tests first so no worker is left with a straggler
     if args.parallel:
-        cmd.extend(["-n", str(args.parallel)])
+        cmd.extend(["-n", str(args.parallel), "--dist", "load", "--duration-order"])
+    
+    # Reuse pre-warmed browser contexts between tests
+    if args.context_pool:
+        cmd.append("--context-pool")
+    
+    # Block or stub resources tests do not need
+    if args.network_profile:
+        cmd.extend(["--network-profile", args.network_profile])
+    
+    # Record backend traffic to HAR files, or replay it without the backend
+    if args.har:
+        cmd.extend(["--har-mode", args.har, "--har-missing", args.har_missing])
+    
+    # Run one duration-balanced slice of the suite (e.g. one CI host out of N)
+    if args.shard:
+        shard_name = args.shard.replace("/", "-of-")
+        cmd.extend(["--shard", args.shard, "--junitxml", f"reports/junit/shard-{shard_name}.xml"])
+    
+    # Run against the in-process stand-in app instead of a live target
+    if args.mock_app:
+        cmd.append("--mock-app")
+    
+    # Only tests affected by changes since a git ref (per .cache/impact_map.json)
+    if args.changed_since:
+        cmd.extend(["--changed-since", args.changed_since])
+    
+    # Previously failed tests only, or one lane of the quarantine split (per .cache/history.sqlite)
+    if args.rerun_failed:
+        cmd.append("--rerun-failed")
+    if args.lane:
+        cmd.extend(["--lane", args.lane])
+    
+    # Fail the run when tests/actions got significantly slower than their rolling baseline
+    if args.fail_on_regression:
+        cmd.append("--fail-on-regression")
+    
+    # Reuse a browser server kept warm between runs instead of launching a browser
+    if args.browser_server:
+        cmd.append("--browser-server")
+    
+    # Video/trace recording; retain-on-failure discards artifacts of passing tests
+    if args.record:
+        cmd.extend(["--record-video", args.record, "--record-trace", args.record])
     
     # Add markers
     if args.markers:
@@ -53,6 +103,12 @@ def run_tests(args):
     if args.allure:
         cmd.extend(["--alluredir", "allure-results"])
     
+    return cmd
+
+
+def run_tests(args):
+    """Run pytest with specified arguments"""
+    cmd = build_command(args)
     print(f"Running command: {' '.join(cmd)}")
     
     try:
@@ -72,6 +128,57 @@ def main():
                        default="chromium", help="Browser to use")
     parser.add_argument("--headless", action="store_true", help="Run in headless mode")
     parser.add_argument("-n", "--parallel", type=int, help="Number of parallel workers")
+    parser.add_argument("--context-pool", action="store_true",
+                       help="Reuse pre-warmed browser contexts between tests")
+    parser.add_argument("--network-profile", choices=["full", "lean", "aggressive"],
+                       help="Network profile for tests without their own marker "
+                            "(smoke defaults to aggressive, ui to full)")
+    parser.add_argument("--har", choices=["record", "replay"],
+                       help="Record HAR files or replay tests from them")
+    parser.add_argument("--har-missing", choices=["fail", "passthrough", "stub"], default="fail",
+                       help="Replay handling of requests missing from the HAR")
+    parser.add_argument("--shard", metavar="K/N",
+                       help="Run only shard K of N (balanced by recorded durations)")
+    parser.add_argument("--merge-results", nargs="+", metavar="SHARD_DIR",
+                       help="Merge allure-results, JUnit XML and durations from shard output dirs, "
+                            "then exit")
+    parser.add_argument("--merge-output", default="reports/merged",
+                       help="Output directory for --merge-results (default: reports/merged)")
+    parser.add_argument("--record", choices=["on", "retain-on-failure"],
+                       help="Record video and Playwright traces "
+                            "(retain-on-failure keeps only failing tests)")
+    parser.add_argument("--mock-app", action="store_true",
+                       help="Point base_url at an in-process mock of the application "
+                            "(no network)")
+    parser.add_argument("--import-time", action="store_true",
+                       help="Collect only under python -X importtime and print where "
+                            "session startup time goes")
+    parser.add_argument("--browser-server", action="store_true",
+                       help="Connect to a warm browser server kept running between runs "
+                            "(started on first use)")
+    parser.add_argument("--stop-browser-servers", action="store_true",
+                       help="Stop warm browser servers started by --browser-server, then exit")
+    parser.add_argument("--changed-since", metavar="REF",
+                       help="Run only tests affected by changes since a git ref "
+                            "(page methods, locators, data rows)")
+    parser.add_argument("--rerun-failed", action="store_true",
+                       help="Rerun only tests whose last recorded run failed "
+                            "(add --browser-server to skip browser launch)")
+    parser.add_argument("--lane", choices=["main", "quarantine"],
+                       help="main: skip quarantined flaky tests; quarantine: run only them")
+    parser.add_argument("--flaky-report", action="store_true",
+                       help="Print pass rates and pass/fail flips from the run history, then exit")
+    parser.add_argument("--trend-report", action="store_true",
+                       help="Print per-test duration trends from the run history, then exit")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                       help="Fail when a test or page-object action is significantly slower "
+                            "than its rolling baseline")
+    parser.add_argument("--watch", action="store_true",
+                       help="Keep one interpreter and browser alive; rerun affected tests "
+                            "when tests/pages/locators/resources change")
+    parser.add_argument("--show-config", action="store_true",
+                       help="Print every resolved setting and where it came from "
+                            "(CLI, env, .env.test, .env, default)")
     parser.add_argument("-m", "--markers", help="Test markers to run (e.g., smoke, regression)")
     parser.add_argument("--html-report", action="store_true", help="Generate HTML report")
     parser.add_argument("--allure", action="store_true", help="Generate Allure report")
@@ -84,12 +191,66 @@ def main():
     
     args = parser.parse_args()
     
+    # Merge shard outputs instead of running tests
+    if args.merge_results:
+        summary = merge_shard_outputs(
+            args.merge_results, args.merge_output, ".cache/durations.json"
+        )
+        print(f"Merged shard outputs into {args.merge_output}: {summary}")
+        sys.exit(0)
+    
+    # Measure session startup instead of running tests
+    if args.import_time:
+        pytest_args = ["tests/"] + (["-m", args.markers] if args.markers else [])
+        report = measure_startup(pytest_args)
+        print(format_report(report))
+        sys.exit(report["returncode"])
+    
+    # Stop warm browser servers instead of running tests
+    if args.stop_browser_servers:
+        from e2e.utils.browser_server import list_servers, stop_all
+
+        for name, state, healthy in list_servers():
+            health = "healthy" if healthy else "unhealthy"
+            print(f"{name}: pid {state['pid']} {state['ws_endpoint']} ({health})")
+        stopped = stop_all()
+        print(f"Stopped {len(stopped)} browser server(s)")
+        sys.exit(0)
+    
+    # Reports from the run history instead of running tests
+    if args.flaky_report or args.trend_report:
+        from e2e.utils.history import RunHistory, format_flaky_report, format_trend_report
+
+        history = RunHistory()
+        if args.flaky_report:
+            print(format_flaky_report(history))
+        if args.trend_report:
+            print(format_trend_report(history))
+        history.close()
+        sys.exit(0)
+    
+    # Print resolved settings instead of running tests
+    if args.show_config:
+        from e2e.utils.settings import Settings, format_settings
+
+        print(format_settings(Settings.resolve()))
+        sys.exit(0)
+    
     # Handle pre-defined suites
     if args.smoke:
         args.markers = "smoke"
     elif args.regression:
         args.markers = "regression"
     
+    # Rerun affected tests in-process on every change (one warm session, no xdist)
+    if args.watch:
+        from e2e.utils.watch import watch
+
+        args.parallel = None
+        cmd = build_command(args)
+        watch(cmd[3], cmd[4:])
+        sys.exit(0)
+    
     # Create reports directory
     os.makedirs("reports", exist_ok=True)
     os.makedirs("allure-results", exist_ok=True)
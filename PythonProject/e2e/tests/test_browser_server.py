@@ -0,0 +1,31 @@
+import os
+import signal
+import time
+import pytest
+from e2e.utils.browser_server import BrowserServer
+
+@pytest.mark.slow
+@pytest.mark.skipif(os.name == "nt", reason="kills the server process group directly")
+def test_browser_server_reused_and_restarted_after_crash(browser_type, browser_name, tmp_path):
+    """
+    Self-test: a warm browser server is reused while healthy and replaced once it dies.
+    """
+    server = BrowserServer(browser_name, {"headless": True}, tmp_path)
+    try:
+        endpoint = server.ensure()
+        assert server.ensure() == endpoint
+
+        browser = server.connect(browser_type)
+        page = browser.new_page()
+        page.set_content("<p>warm</p>")
+        assert page.inner_text("p") == "warm"
+        browser.close()
+
+        state = server.read_state()
+        os.killpg(state["pid"], signal.SIGKILL)
+        deadline = time.monotonic() + 5
+        while BrowserServer.is_healthy(state) and time.monotonic() < deadline:
+            time.sleep(0.1)
+        assert server.ensure() != endpoint
+    finally:
+        server.stop()
@@ -0,0 +1,67 @@
+import os
+
+import pytest
+from e2e.utils import data_store
+from e2e.utils.data_store import CsvDataStore
+
+CSV = "test_case_name,username\nvalid_login,standard_user\nlocked_out,locked_out_user\n"
+
+def _no_parse(_path):
+    raise AssertionError("CSV parsed although the disk cache was valid")
+
+@pytest.mark.sanity
+def test_data_store_disk_cache_and_invalidation(tmp_path, monkeypatch):
+    """
+    Self-test: a second process-level load is served from the pickle cache, and
+    the cache is rebuilt when the CSV's size or mtime changes.
+    """
+    csv_path = tmp_path / "testdata.csv"
+    csv_path.write_text(CSV, encoding="utf-8")
+    cache_dir = tmp_path / "cache"
+
+    first = CsvDataStore(csv_path, cache_dir=cache_dir)
+    assert first.get("valid_login")["username"] == "standard_user"
+    assert len(list(cache_dir.iterdir())) == 1
+
+    monkeypatch.setattr(data_store.FileUtils, "read_csv", _no_parse)
+    cached = CsvDataStore(csv_path, cache_dir=cache_dir)
+    assert cached.get("locked_out")["username"] == "locked_out_user"
+    assert not cached.is_stale()
+    monkeypatch.undo()
+
+    csv_path.write_text(CSV + "problem_user,problem_user\n", encoding="utf-8")
+    assert cached.is_stale()
+    resized = CsvDataStore(csv_path, cache_dir=cache_dir)
+    assert resized.values() == ["valid_login", "locked_out", "problem_user"]
+
+    csv_path.write_text(CSV.replace("standard_user", "standard_usr2"), encoding="utf-8")
+    stat = csv_path.stat()
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    touched = CsvDataStore(csv_path, cache_dir=cache_dir)
+    assert touched.get("valid_login")["username"] == "standard_usr2"
+
+@pytest.mark.sanity
+def test_data_store_lookup_and_isolation(tmp_path):
+    """
+    Self-test: test_data-style lookups by test name, per-option stores from open(),
+    and rows handed out as copies so one test cannot corrupt later lookups.
+    """
+    csv_path = tmp_path / "testdata.csv"
+    csv_path.write_text(CSV, encoding="utf-8")
+
+    store = CsvDataStore.open(csv_path, cache_dir=tmp_path / "a")
+    assert CsvDataStore.open(csv_path, cache_dir=tmp_path / "a") is store
+    assert CsvDataStore.open(csv_path, cache_dir=tmp_path / "b") is not store
+    assert CsvDataStore.open(csv_path, ("username",), cache_dir=tmp_path / "a") is not store
+
+    with pytest.raises(ValueError, match="No test data found"):
+        store.get("missing_test")
+    with pytest.raises(ValueError, match="not indexed"):
+        store.get("standard_user", key="username")
+
+    store.get("valid_login")["username"] = "mutated"
+    rows = store.all_rows()
+    rows[0]["username"] = "mutated"
+    rows.clear()
+    assert store.get("valid_login")["username"] == "standard_user"
+    assert len(store.all_rows()) == 2
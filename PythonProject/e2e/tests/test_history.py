@@ -0,0 +1,26 @@
+import pytest
+from e2e.utils.history import RunHistory
+
+@pytest.mark.sanity
+def test_history_tracks_failures_quarantine_and_trends(tmp_path):
+    """
+    Self-test: the run history finds last failures, quarantines low pass rates
+    and reports duration trends from passing runs.
+    """
+    history = RunHistory(tmp_path / "history.sqlite")
+    try:
+        for run in range(10):
+            history.record_run(run, "all", [], {
+                "tests/test_a.py::test_stable": ("passed", 1.0 if run < 5 else 2.0, "gw0"),
+                "tests/test_a.py::test_flaky": ("failed" if run % 2 else "passed", 1.0, "gw1"),
+                "tests/test_a.py::test_skipped": ("skipped", 0.0, "gw0"),
+            }, 0)
+
+        assert history.failed_last() == ["tests/test_a.py::test_flaky"]
+        assert history.quarantined(threshold=0.9) == ["tests/test_a.py::test_flaky"]
+        assert history.flakiness()["tests/test_a.py::test_flaky"]["flips"] == 9
+        recent, baseline, change = history.duration_trends()["tests/test_a.py::test_stable"]
+        assert (recent, baseline, change) == (2.0, 1.0, 1.0)
+        assert "tests/test_a.py::test_skipped" not in history.recent()
+    finally:
+        history.close()
@@ -0,0 +1,64 @@
+import pytest
+from e2e.utils.impact import (
+    ImpactMap, changed_functions, changed_locator_keys, data_changed, parse_diff,
+)
+
+PAGE_SOURCE = """class LoginPage:
+    LOCATOR_PAGE = "login_page"
+
+    def login(self, username, password):
+        self.fill(username)
+
+    def logout(self):
+        self.click()
+"""
+
+DIFF = """diff --git a/pages/login_page.py b/pages/login_page.py
+--- a/pages/login_page.py
++++ b/pages/login_page.py
+@@ -8 +8 @@ class LoginPage:
+-        self.tap()
++        self.click()
+@@ -2,0 +3 @@ class LoginPage:
++    TITLE = "Login"
+"""
+
+@pytest.mark.sanity
+def test_impact_maps_diffs_to_methods_locators_and_rows():
+    """
+    Self-test: diff hunks map to the page methods, locator keys and CSV rows they change.
+    """
+    hunks = parse_diff(DIFF)["pages/login_page.py"]
+    assert hunks == {"old": [(8, 1)], "new": [(8, 1), (3, 1)]}
+    assert changed_functions(PAGE_SOURCE, [(8, 1)]) == {"LoginPage.logout"}
+    assert changed_functions(PAGE_SOURCE, [(2, 1)]) == {None}
+
+    old_yaml = "login_page:\n  username_field: '#user'\n  login_button: '#login'\n"
+    new_yaml = "login_page:\n  username_field: '#user'\n  login_button: '#sign-in'\n"
+    assert changed_locator_keys(old_yaml, new_yaml) == {"login_page.login_button"}
+
+    old_csv = "test_case_name,username\nvalid,standard_user\nlocked,locked_out_user\n"
+    new_csv = "test_case_name,username\nvalid,standard_user\nlocked,locked_user\n"
+    assert not data_changed("test_case_name=valid", old_csv, new_csv)
+    assert data_changed("test_case_name=locked", old_csv, new_csv)
+    assert data_changed("*", old_csv, new_csv)
+
+@pytest.mark.sanity
+def test_impact_map_merges_shared_footprints(tmp_path):
+    """
+    Self-test: tests on the cached login depend on it, even when another test did the login.
+    """
+    impact_map = ImpactMap(tmp_path / "impact_map.json")
+    touched = {"methods": [], "locators": [], "data": [], "uses": ["ui_login"]}
+    impact_map.update("tests/test_a.py::test_cached", touched)
+    assert impact_map.expanded()["tests/test_a.py::test_cached"] is None
+
+    impact_map.footprints["ui_login"] = {
+        "methods": ["pages/login_page.py::LoginPage.login"],
+        "locators": ["login_page.login_button"],
+        "data": [],
+    }
+    impact_map.save()
+    touched = ImpactMap(tmp_path / "impact_map.json").expanded()["tests/test_a.py::test_cached"]
+    assert touched["methods"] == ["pages/login_page.py::LoginPage.login"]
+    assert touched["locators"] == ["login_page.login_button"]
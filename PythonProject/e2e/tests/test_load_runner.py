@@ -0,0 +1,19 @@
+import pytest
+from e2e.load_test import login_scenario
+from e2e.utils.local_app import LocalApp
+from e2e.utils.load_runner import SCENARIO_STEP, run_load, summarize_load
+
+@pytest.mark.slow
+def test_load_run_against_local_app():
+    """
+    Self-test: the load runner drives the login scenario against the local stand-in without errors.
+    """
+    with LocalApp(users={"standard_user": "secret_sauce"}) as app:
+        rows = run_load(
+            login_scenario, app.url, ("standard_user", "secret_sauce"), rate=2, duration=2, users=2
+        )
+    report = summarize_load(rows, target_rate=2)
+    scenario = report["steps"][SCENARIO_STEP]
+    assert scenario["count"] == 4
+    assert scenario["errors"] == 0, report["errors"]
+    assert set(report["steps"]) == {"open_login", "login", SCENARIO_STEP}
@@ -23,3 +23,23 @@ def test_login_invalid_password(page, base_url, app_config):
     login_page.navigate_to(f"{base_url}/login")
     login_page.login(app_config.get("username"), "<PASSWORD>")
     assert page.url == test_data["expected_url"]
+
+@pytest.mark.smoke
+def test_inventory_with_cached_session(authenticated_page, base_url):
+    """
+    Smoke test: a cached login lands on the inventory page without the UI login.
+    """
+    login_page = LoginPage(authenticated_page)
+    assert authenticated_page.url == f"{base_url}/inventory.html"
+    assert not login_page.is_login_form_visible()
+
+@pytest.mark.smoke
+@pytest.mark.web_perf
+def test_inventory_load_within_budget(page, base_url, app_config):
+    """
+    Smoke test: the inventory page loads after login within the configured performance budget.
+    """
+    login_page = LoginPage(page)
+    login_page.navigate_to(f"{base_url}")
+    login_page.login(app_config.get("username"), app_config.get("password"))
+    login_page.wait_for_url(f"{base_url}/inventory.html")
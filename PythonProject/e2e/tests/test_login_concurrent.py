@@ -0,0 +1,44 @@
+import asyncio
+import pytest
+from e2e.pages.async_login_page import AsyncLoginPage
+from e2e.utils.local_app import SESSION_COOKIE
+
+CONCURRENT_USERS = 20
+
+async def session_token(page) -> str:
+    cookies = await page.context.cookies()
+    return next((c["value"] for c in cookies if c["name"] == SESSION_COOKIE), None)
+
+@pytest.mark.regression
+@pytest.mark.asyncio(loop_scope="session")
+async def test_concurrent_logins_do_not_interfere(async_page_factory, mock_app):
+    """
+    Regression test: log in many isolated users at once on one event loop;
+    each must get its own session, and logging one out must not end the others.
+    Runs against the mock app, which issues a distinct server-side session per login.
+    """
+    username, password = next(iter(mock_app.users.items()))
+    inventory_url = f"{mock_app.url}/inventory.html"
+    pages = await asyncio.gather(*(async_page_factory() for _ in range(CONCURRENT_USERS)))
+
+    async def login(page):
+        login_page = AsyncLoginPage(page)
+        await login_page.navigate_to(mock_app.url)
+        await login_page.login(username, password)
+        await login_page.wait_for_url(inventory_url)
+
+    await asyncio.gather(*(login(page) for page in pages))
+
+    tokens = [await session_token(page) for page in pages]
+    assert all(tokens), "Each context should hold a session cookie."
+    assert len(set(tokens)) == CONCURRENT_USERS, "Contexts share a session cookie."
+
+    logged_out, *others = pages
+    login_page = AsyncLoginPage(logged_out)
+    await login_page.logout()
+    await login_page.wait_for_login_page_load()
+    assert await session_token(logged_out) is None
+
+    await asyncio.gather(*(page.goto(inventory_url) for page in others))
+    for page in others:
+        assert page.url == inventory_url, "Logging out one user ended another user's session."
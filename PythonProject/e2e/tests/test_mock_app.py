@@ -0,0 +1,81 @@
+import pytest
+from e2e.pages.login_page import LoginPage
+
+@pytest.fixture
+def mock_login_page(page, mock_app):
+    login_page = LoginPage(page)
+    login_page.navigate_to(mock_app.url)
+    return login_page
+
+@pytest.mark.sanity
+def test_mock_login_form_matches_locators(mock_login_page):
+    """
+    Self-test: the mock login page renders every element LoginPage locates.
+    """
+    mock_login_page.wait_for_login_page_load()
+    assert mock_login_page.is_login_form_visible()
+    assert not mock_login_page.is_error_displayed()
+
+@pytest.mark.sanity
+def test_mock_login_and_logout(mock_login_page, mock_app):
+    """
+    Self-test: valid credentials reach the inventory page; logout returns to the login form.
+    """
+    username, password = next(iter(mock_app.users.items()))
+    mock_login_page.login(username, password)
+    mock_login_page.wait_for_url(f"{mock_app.url}/inventory.html")
+    mock_login_page.logout()
+    mock_login_page.wait_for_login_page_load()
+
+@pytest.mark.sanity
+def test_mock_login_rejects_wrong_password(mock_login_page, mock_app):
+    """
+    Self-test: a wrong password shows the error message and stays on the login page.
+    """
+    username = next(iter(mock_app.users))
+    mock_login_page.login(username, "wrong-password")
+    mock_login_page.wait_for_element(mock_login_page.error_message)
+    assert "do not match" in mock_login_page.get_error_message()
+    assert mock_login_page.get_current_url() == f"{mock_app.url}/"
+
+@pytest.mark.sanity
+def test_mock_json_endpoint(page, mock_routes):
+    """
+    Self-test: JSON endpoints added in a test are served, and removed after it.
+    """
+    mock_routes.add_json("/api/items", [{"id": 1}], status=201)
+    response = page.request.get(f"{mock_routes.url}/api/items")
+    assert response.status == 201
+    assert response.json() == [{"id": 1}]
+    assert ("GET", "/api/items") in mock_routes.request_log
+
+@pytest.mark.sanity
+def test_mock_batched_login(mock_login_page, mock_app):
+    """
+    Self-test: login() fills both fields in one evaluation and the app sees the values.
+    """
+    username, password = next(iter(mock_app.users.items()))
+    result = mock_login_page.login(username, password)
+    assert result.fallback_reason is None
+    assert (result.actions, result.round_trips, result.saved) == (2, 1, 1)
+    mock_login_page.wait_for_url(f"{mock_app.url}/inventory.html")
+
+@pytest.mark.sanity
+def test_mock_bulk_state_query(mock_login_page, mock_app):
+    """
+    Self-test: query_states reads a whole form and a repeated grid in single evaluations.
+    """
+    form = mock_login_page.query_states(
+        ["username_field", "password_field", "error_message"], attributes=["type"]
+    )
+    assert form["password_field"]["visible"]
+    assert form["password_field"]["attributes"]["type"] == "password"
+    assert form["error_message"]["count"] == 1 and not form["error_message"]["visible"]
+
+    username, password = next(iter(mock_app.users.items()))
+    mock_login_page.login(username, password)
+    mock_login_page.wait_for_url(f"{mock_app.url}/inventory.html")
+    states = mock_login_page.query_states({"names": ".inventory_item_name"}, all_matches=True)
+    grid = states["names"]
+    assert grid["count"] == len(grid["elements"]) > 0
+    assert all(element["visible"] and element["text"] for element in grid["elements"])
@@ -0,0 +1,37 @@
+import pytest
+from e2e.utils.history import RunHistory
+from e2e.utils.regressions import check_regression, find_regressions
+
+@pytest.mark.sanity
+def test_regression_needs_significant_and_large_slowdown():
+    """
+    Self-test: only slowdowns beyond the threshold, the noise (MAD) and the minimum delta count.
+    """
+    steady = [1000, 1010, 990, 1005, 995]
+    noisy = [600, 1400, 800, 1200, 1000]
+    assert check_regression(1400, steady)["change"] == pytest.approx(0.4)
+    assert check_regression(1200, steady) is None  # 20%: below the 30% threshold
+    assert check_regression(1400, noisy) is None  # within the test's usual spread
+    assert check_regression(14, [10, 10, 10, 10, 10]) is None  # 40% but only 4 ms
+    assert check_regression(1400, steady[:3]) is None  # too little history
+
+@pytest.mark.sanity
+def test_regressions_found_per_test_and_per_action(tmp_path):
+    """
+    Self-test: a slower login action is flagged while the whole test stays within its baseline.
+    """
+    nodeid = "tests/test_login.py::test_login"
+    history = RunHistory(tmp_path / "history.sqlite")
+    try:
+        for run, ms in enumerate([400, 405, 395, 402, 398]):
+            run_id = history.record_run(run, "all", [], {nodeid: ("passed", 2.0, "gw0")}, 0)
+            history.record_action_timings(run_id, {(nodeid, "LoginPage.login"): (ms, 1)})
+        run_id = history.record_run(9, "all", [], {nodeid: ("passed", 2.05, "gw0")}, 0)
+        history.record_action_timings(run_id, {(nodeid, "LoginPage.login"): (560, 1)})
+
+        regressions = find_regressions(history, run_id)
+        assert [(r["kind"], r["name"]) for r in regressions] == [
+            ("action", "tests/test_login.py::test_login LoginPage.login")
+        ]
+    finally:
+        history.close()
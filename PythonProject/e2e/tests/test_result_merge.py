@@ -0,0 +1,30 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+E2E_ROOT = Path(__file__).resolve().parent.parent
+
+@pytest.mark.sanity
+def test_merge_results_needs_only_the_standard_library(tmp_path):
+    """
+    Self-test: run_tests.py --merge-results works without site-packages (python -S),
+    as in the CI merge job, which does not install requirements.txt.
+    """
+    shard = tmp_path / "shard-1"
+    (shard / "allure-results").mkdir(parents=True)
+    (shard / "allure-results" / "1-result.json").write_text("{}", encoding="utf-8")
+    (shard / "durations.json").write_text(json.dumps({"tests/test_a.py::test_a": 1.5}))
+    output = tmp_path / "merged"
+
+    result = subprocess.run(
+        [sys.executable, "-S", "run_tests.py", "--merge-results", str(shard),
+         "--merge-output", str(output)],
+        cwd=E2E_ROOT, capture_output=True, text=True, check=False,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert (output / "allure-results" / "1-result.json").exists()
+    assert json.loads((output / "durations.json").read_text())["tests/test_a.py::test_a"] == 1.5
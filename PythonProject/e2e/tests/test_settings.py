@@ -0,0 +1,30 @@
+import pytest
+from e2e.utils.settings import Settings
+
+@pytest.mark.sanity
+def test_settings_precedence_and_sources(tmp_path):
+    """
+    CLI beats environment, environment beats .env.test, .env.test beats .env,
+    and every value records where it came from.
+    """
+    env_test = tmp_path / ".env.test"
+    env_test.write_text("username=file_user\nplaywright_action_timeout=7000\nauth_state_ttl=30\n")
+    dotenv = tmp_path / ".env"
+    dotenv.write_text("BASE_URL=http://from-dotenv\nTEST_USERNAME=dotenv_user\n")
+
+    settings = Settings.resolve(
+        cli={"artifact_budget_mb": 3, "base_url": None},
+        environ={"AUTH_STATE_TTL": "60", "ARTIFACT_BUDGET_MB": "9"},
+        env_test_path=env_test,
+        dotenv_path=dotenv,
+    )
+
+    assert settings.artifact_budget_mb == 3
+    assert settings.sources["artifact_budget_mb"] == "command line (--artifact-budget-mb)"
+    assert settings.auth_state_ttl == 60
+    assert settings.username == "file_user"
+    assert settings.action_timeout_ms == 7000
+    assert settings.base_url == "http://from-dotenv"
+    assert settings.sources["base_url"] == ".env (BASE_URL)"
+    assert settings.sources["navigation_timeout_ms"] == "default"
+    assert Settings.from_dict(settings.to_dict()).app_config() == settings.app_config()
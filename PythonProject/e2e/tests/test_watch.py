@@ -0,0 +1,42 @@
+import pytest
+from e2e.utils.watch import DependencyGraph, snapshot
+
+@pytest.mark.sanity
+def test_watch_selects_tests_affected_by_change(tmp_path):
+    """
+    Self-test: page, locator and test-file changes map to the tests that use them;
+    unmapped changes (resources nobody mentions, utils/, conftest.py) rerun everything.
+    """
+    root = tmp_path / "e2e"
+    for name in ("tests", "pages", "locators", "resources", "utils"):
+        (root / name).mkdir(parents=True)
+    (root / "conftest.py").write_text("")
+    (root / "utils" / "helpers.py").write_text("")
+    (root / "pages" / "__init__.py").write_text("")
+    (root / "pages" / "base_page.py").write_text("class BasePage:\n    pass\n")
+    (root / "pages" / "cart_page.py").write_text(
+        "from .base_page import BasePage\n\n"
+        "class CartPage(BasePage):\n    LOCATOR_PAGE = 'cart_page'\n"
+    )
+    (root / "pages" / "other_page.py").write_text(
+        "class OtherPage:\n    LOCATOR_PAGE = 'other_page'\n"
+    )
+    (root / "locators" / "cart_page_locators.yaml").write_text(
+        "cart_page:\n  checkout: '#checkout'\n"
+    )
+    (root / "resources" / "unused.csv").write_text("a,b\n")
+    (root / "tests" / "test_cart.py").write_text("from e2e.pages.cart_page import CartPage\n")
+    (root / "tests" / "test_other.py").write_text("from e2e.pages import other_page\n")
+
+    graph = DependencyGraph(root)
+
+    def names(*changed):
+        return [p.name for p in graph.affected_tests({root.joinpath(*path) for path in changed})]
+
+    assert names(("pages", "base_page.py")) == ["test_cart.py"]
+    assert names(("locators", "cart_page_locators.yaml")) == ["test_cart.py"]
+    assert names(("tests", "test_other.py")) == ["test_other.py"]
+    assert graph.affected_tests({root / "resources" / "unused.csv"}) is None
+    assert graph.affected_tests({root / "utils" / "helpers.py"}) is None
+    assert graph.affected_tests({root / "conftest.py"}) is None
+    assert {root / "conftest.py", root / "utils" / "helpers.py"} <= set(snapshot(root))
@@ -1,6 +1,18 @@
 """
 Utility functions package for e2e tests
 """
-from .file_utils import FileUtils
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # For type checkers and linters only; at runtime __getattr__ imports on first use
+    from .file_utils import FileUtils
 
 __all__ = ['FileUtils']
+
+
+def __getattr__(name):
+    # Lazy, so importing one utils module does not import the others
+    if name == 'FileUtils':
+        return importlib.import_module('.file_utils', __name__).FileUtils
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
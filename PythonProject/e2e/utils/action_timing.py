@@ -0,0 +1,216 @@
+"""
+Automatic timing of page-object actions
+"""
+import contextvars
+import functools
+import inspect
+import json
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import pytest
+
+from .impact import ImpactRecorder
+from .stats import summarize
+from .workers import is_worker, worker_id
+
+# Stack of (page, action) currently running; a ContextVar so async pages nest correctly too
+_current_actions = contextvars.ContextVar("e2e_current_actions", default=())
+
+
+class ActionTimer:
+    """
+    Process-wide sink for action timings.
+    - record() is called by timed methods; rows are buffered in memory and
+      appended to <metrics_dir>/actions-<worker>.jsonl in batches
+    - allure_steps wraps every timed call in a (nested) allure step
+    """
+
+    enabled = False
+    allure_steps = True
+    nodeid = None
+    metrics_dir = None
+    _buffer = []
+    _flush_every = 500
+
+    @classmethod
+    def configure(cls, metrics_dir: Path, allure_steps: bool = True):
+        cls.metrics_dir = Path(metrics_dir)
+        cls.metrics_dir.mkdir(parents=True, exist_ok=True)
+        cls.allure_steps = allure_steps
+        cls.enabled = True
+
+    @classmethod
+    def record(cls, page: str, action: str, seconds: float, parent: str, depth: int, ok: bool):
+        cls._buffer.append({
+            "nodeid": cls.nodeid,
+            "page": page,
+            "action": action,
+            "ms": round(seconds * 1000, 3),
+            "parent": parent,
+            "depth": depth,
+            "ok": ok,
+        })
+        if len(cls._buffer) >= cls._flush_every:
+            cls.flush()
+
+    @classmethod
+    def reset(cls):
+        """Drop buffered rows without writing them (e.g. after timing a benchmark)."""
+        cls._buffer = []
+
+    @classmethod
+    def flush(cls):
+        if not cls._buffer or cls.metrics_dir is None:
+            return
+        rows, cls._buffer = cls._buffer, []
+        with open(cls.metrics_dir / f"actions-{worker_id()}.jsonl", "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(row) + "\n" for row in rows))
+
+
+def _step(title: str):
+    import allure
+
+    return allure.step(title)
+
+
+def timed(func):
+    """
+    Time a page-object method (sync or async) when ActionTimer is enabled,
+    and note the call for test impact analysis while ImpactRecorder is active.
+    """
+    action = func.__name__
+    method_key = ImpactRecorder.method_key(func)
+
+    def start(self):
+        page = type(self).__name__
+        stack = _current_actions.get()
+        parent = f"{stack[-1][0]}.{stack[-1][1]}" if stack else None
+        token = _current_actions.set(stack + ((page, action),))
+        return page, parent, len(stack), token
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(self, *args, **kwargs):
+            if ImpactRecorder.active:
+                ImpactRecorder.methods.add(method_key)
+            if not ActionTimer.enabled:
+                return await func(self, *args, **kwargs)
+            page, parent, depth, token = start(self)
+            ok = False
+            began = time.perf_counter()
+            try:
+                # Allure's step stack is not task-aware, so async actions are timed without steps
+                result = await func(self, *args, **kwargs)
+                ok = True
+                return result
+            finally:
+                ActionTimer.record(page, action, time.perf_counter() - began, parent, depth, ok)
+                _current_actions.reset(token)
+        async_wrapper.__timed__ = True
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if ImpactRecorder.active:
+            ImpactRecorder.methods.add(method_key)
+        if not ActionTimer.enabled:
+            return func(self, *args, **kwargs)
+        page, parent, depth, token = start(self)
+        ok = False
+        began = time.perf_counter()
+        try:
+            if ActionTimer.allure_steps:
+                with _step(f"{page}.{action}"):
+                    result = func(self, *args, **kwargs)
+            else:
+                result = func(self, *args, **kwargs)
+            ok = True
+            return result
+        finally:
+            ActionTimer.record(page, action, time.perf_counter() - began, parent, depth, ok)
+            _current_actions.reset(token)
+    wrapper.__timed__ = True
+    return wrapper
+
+
+def instrument_class(cls):
+    """Wrap every public method defined directly on cls with timed()."""
+    for name, attr in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.isfunction(attr):
+            continue
+        if getattr(attr, "__timed__", False):
+            continue
+        setattr(cls, name, timed(attr))
+    return cls
+
+
+def summarize_actions(metrics_dir: Path) -> dict:
+    """p50/p95/p99 per page.action and per page object from every worker's JSONL."""
+    by_action = defaultdict(list)
+    by_page = defaultdict(list)
+    for path_obj in Path(metrics_dir).glob("actions-*.jsonl"):
+        with open(path_obj, encoding="utf-8") as f:
+            for line in f:
+                row = json.loads(line)
+                by_action[f"{row['page']}.{row['action']}"].append(row["ms"])
+                if row["depth"] == 0:
+                    # Top-level calls only, so nested actions are not counted twice
+                    by_page[row["page"]].append(row["ms"])
+    return {
+        "actions": {name: summarize(values) for name, values in by_action.items()},
+        "pages": {name: summarize(values) for name, values in by_page.items()},
+    }
+
+
+class ActionTimingPlugin:
+    """
+    Wires ActionTimer into the pytest run.
+    - The controller clears the previous run's JSONL files before workers start
+    - Each process tags rows with the running test and flushes at session end
+    - The controller prints the slowest actions and writes action_summary.json
+    """
+
+    def __init__(self, config, metrics_dir: Path, allure_steps: bool = True):
+        self.config = config
+        self.metrics_dir = Path(metrics_dir)
+        self.is_worker = is_worker(config)
+        self.summary = None
+        if not self.is_worker:
+            for old in self.metrics_dir.glob("actions-*.jsonl"):
+                old.unlink(missing_ok=True)
+        ActionTimer.configure(self.metrics_dir, allure_steps)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item):
+        ActionTimer.nodeid = item.nodeid
+        yield
+        ActionTimer.nodeid = None
+
+    def pytest_sessionfinish(self):
+        ActionTimer.flush()
+        if self.is_worker:
+            return
+        self.summary = summarize_actions(self.metrics_dir)
+        with open(self.metrics_dir / "action_summary.json", "w", encoding="utf-8") as f:
+            json.dump(self.summary, f, indent=2)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        summary = self.summary
+        if self.is_worker or not summary or not summary["actions"]:
+            return
+        terminalreporter.write_sep("-", "page-object action timings (ms)")
+        terminalreporter.write_line(f"{'action':<45} {'count':>6} {'p50':>9} {'p95':>9} {'p99':>9}")
+        slowest = sorted(summary["actions"].items(), key=lambda kv: -kv[1]["p95"])[:15]
+        for name, stats in slowest:
+            terminalreporter.write_line(
+                f"{name:<45} {stats['count']:>6} {stats['p50']:>9.1f} "
+                f"{stats['p95']:>9.1f} {stats['p99']:>9.1f}"
+            )
+        for name, stats in sorted(summary["pages"].items()):
+            terminalreporter.write_line(
+                f"{name + ' (all actions)':<45} {stats['count']:>6} {stats['p50']:>9.1f} "
+                f"{stats['p95']:>9.1f} {stats['p99']:>9.1f}"
+            )
+        terminalreporter.write_line(f"full summary: {self.metrics_dir / 'action_summary.json'}")
@@ -0,0 +1,163 @@
+"""
+Background pipeline for failure artifacts (screenshots, videos, traces)
+"""
+import gzip
+import hashlib
+import json
+import shutil
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .workers import worker_id
+
+
+def _deflate_zip(data: bytes) -> bytes:
+    """Re-pack a zip (e.g. a Playwright trace) with every entry deflated; it stays a valid zip."""
+    with zipfile.ZipFile(BytesIO(data)) as source:
+        entries = source.infolist()
+        if all(entry.compress_type == zipfile.ZIP_DEFLATED for entry in entries):
+            return data
+        out = BytesIO()
+        with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=9) as target:
+            for entry in entries:
+                target.writestr(entry.filename, source.read(entry))
+    return out.getvalue()
+
+
+class ArtifactPipeline:
+    """
+    Stores artifacts off the test's critical path.
+    - submit_*() only queues work; hashing, compression and writing happen on a
+      small thread pool
+    - Text-like files are gzipped and zips (traces) re-packed with deflate
+    - Files are content-addressed (<kind>-<sha256 prefix>.<ext>) in a per-worker
+      directory, so parametrized tests and xdist workers never overwrite each
+      other and identical captures are stored once
+    - When the directory grows past budget_bytes, the oldest artifacts are evicted
+    - manifest.jsonl records which test produced which artifact
+    The previous run's artifacts are removed once per run by clean(), not here,
+    so a worker starting late never wipes files another one is writing.
+    """
+
+    def __init__(self, root: Path, budget_bytes: int,
+                 compress_exts=("json", "txt", "html", "har", "log"), max_workers: int = 2):
+        self.dir = Path(root) / worker_id()
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.budget_bytes = budget_bytes
+        self.compress_exts = set(compress_exts)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="artifacts")
+        self._lock = threading.Lock()
+        self._stored = OrderedDict()  # file name -> size, oldest first
+        self._total_bytes = 0
+        self.stats = {"stored": 0, "duplicates": 0, "evicted": 0, "failed": 0}
+
+    @staticmethod
+    def clean(root: Path):
+        """Remove the previous run's artifacts; call once per run, on the controller."""
+        shutil.rmtree(root, ignore_errors=True)
+
+    def submit_bytes(self, data: bytes, kind: str, ext: str, nodeid: str):
+        """Queue in-memory bytes (e.g. page.screenshot() output)."""
+        return self._executor.submit(self._store, lambda: data, kind, ext, nodeid)
+
+    def submit_file(self, path_obj: Path, kind: str, ext: str, nodeid: str,
+                    delete_source: bool = True):
+        """Queue a file written by Playwright (video, trace); the source is removed once stored."""
+        path_obj = Path(path_obj)
+
+        def read():
+            data = path_obj.read_bytes()
+            if delete_source:
+                path_obj.unlink(missing_ok=True)
+            return data
+
+        return self._executor.submit(self._store, read, kind, ext, nodeid)
+
+    def submit_files(self, files, nodeid: str, remove_dir: Path = None):
+        """
+        Queue several files written by Playwright as one task: [(path, kind, ext)].
+        Each source is removed once stored, then remove_dir (e.g. a recording's
+        temporary directory) is deleted, whether or not every file could be stored.
+        """
+        files = [(Path(path_obj), kind, ext) for path_obj, kind, ext in files]
+
+        def store_all() -> list:
+            stored = []
+            try:
+                for path_obj, kind, ext in files:
+                    try:
+                        stored.append(self._store(path_obj.read_bytes, kind, ext, nodeid))
+                    except (OSError, zipfile.BadZipFile):
+                        # Counted in stats["failed"]; keep storing the rest
+                        continue
+                    path_obj.unlink(missing_ok=True)
+            finally:
+                if remove_dir is not None:
+                    shutil.rmtree(remove_dir, ignore_errors=True)
+            return stored
+
+        return self._executor.submit(store_all)
+
+    def close(self):
+        """Wait for queued artifacts to be written."""
+        self._executor.shutdown(wait=True)
+
+    def _store(self, read, kind: str, ext: str, nodeid: str) -> Path:
+        try:
+            data = read()
+            digest = hashlib.sha256(data).hexdigest()[:20]
+            if ext == "zip":
+                data = _deflate_zip(data)
+            elif ext in self.compress_exts:
+                data = gzip.compress(data, compresslevel=6)
+                ext = f"{ext}.gz"
+            name = f"{kind}-{digest}.{ext}"
+            target = self.dir / name
+
+            evict = []
+            with self._lock:
+                duplicate = name in self._stored
+                if duplicate:
+                    self.stats["duplicates"] += 1
+                    self._stored.move_to_end(name)
+                else:
+                    self._stored[name] = len(data)
+                    self._total_bytes += len(data)
+                    self.stats["stored"] += 1
+                    evict = self._over_budget(keep=name)
+
+            if not duplicate:
+                target.write_bytes(data)
+                for old in evict:
+                    (self.dir / old).unlink(missing_ok=True)
+            self._append_manifest(nodeid, kind, name, duplicate)
+            return target
+        except Exception:
+            with self._lock:
+                self.stats["failed"] += 1
+            raise
+
+    def _over_budget(self, keep: str) -> list:
+        """Pick the oldest artifacts to drop so the total fits the budget (lock held)."""
+        evict = []
+        while self._total_bytes > self.budget_bytes and len(self._stored) > 1:
+            name, size = next(iter(self._stored.items()))
+            if name == keep:
+                break
+            del self._stored[name]
+            self._total_bytes -= size
+            self.stats["evicted"] += 1
+            evict.append(name)
+        return evict
+
+    def _append_manifest(self, nodeid: str, kind: str, name: str, duplicate: bool):
+        line = json.dumps({"time": time.time(), "nodeid": nodeid, "kind": kind, "file": name,
+                           "duplicate": duplicate})
+        with self._lock:
+            with open(self.dir / "manifest.jsonl", "a", encoding="utf-8") as f:
+                f.write(line + "\n")
@@ -0,0 +1,54 @@
+"""
+Disk cache of Playwright storage_state for logged-in sessions
+"""
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Callable
+
+from .file_utils import FileUtils
+
+
+class AuthStateCache:
+    """
+    Keeps one storage_state JSON file per credential set.
+    - Files are keyed by base_url + username, so several users can be cached
+    - A file older than ttl_seconds is treated as missing and rebuilt
+    - Building a file is guarded by a lock, so xdist workers log in only once
+    """
+
+    def __init__(self, cache_dir: Path, ttl_seconds: int):
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds
+
+    def state_path(self, base_url: str, username: str) -> Path:
+        key = hashlib.sha256(f"{base_url}|{username}".encode("utf-8")).hexdigest()[:16]
+        return self.cache_dir / f"storage_state_{key}.json"
+
+    def is_fresh(self, path_obj: Path) -> bool:
+        try:
+            age = time.time() - path_obj.stat().st_mtime
+        except FileNotFoundError:
+            return False
+        return age < self.ttl_seconds
+
+    def get_or_create(self, base_url: str, username: str, create_state: Callable[[], dict]) -> Path:
+        """
+        Return the path of a fresh storage_state file, calling create_state()
+        (which performs the UI login) only when no fresh file exists.
+        """
+        path_obj = self.state_path(base_url, username)
+        if self.is_fresh(path_obj):
+            return path_obj
+
+        with FileUtils.file_lock(path_obj):
+            # Another worker may have logged in while we waited for the lock
+            if not self.is_fresh(path_obj):
+                state = create_state()
+                FileUtils.write_atomic(path_obj, json.dumps(state).encode("utf-8"))
+        return path_obj
+
+    def invalidate(self, base_url: str, username: str):
+        """Drop the cached state, e.g. after the server rejected the session."""
+        self.state_path(base_url, username).unlink(missing_ok=True)
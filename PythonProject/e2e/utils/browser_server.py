@@ -0,0 +1,231 @@
+"""
+Warm Playwright browser servers kept running between pytest invocations
+"""
+import json
+import os
+import re
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+from e2e.constants import CACHE_DIR_NAME
+from .file_utils import FileUtils
+
+SERVER_DIR = Path(__file__).resolve().parent.parent / CACHE_DIR_NAME / "browser_server"
+
+# browser_type.launch() keyword -> launchServer() option
+_SERVER_OPTIONS = {
+    "headless": "headless",
+    "channel": "channel",
+    "args": "args",
+    "executable_path": "executablePath",
+    "chromium_sandbox": "chromiumSandbox",
+    "ignore_default_args": "ignoreDefaultArgs",
+}
+
+_WS_ENDPOINT = re.compile(r"wss?://\S+")
+
+
+def server_options(launch_args: dict) -> dict:
+    """launchServer() options for the parts of browser_type_launch_args a server can take."""
+    return {
+        _SERVER_OPTIONS[key]: str(value) if key == "executable_path" else value
+        for key, value in launch_args.items()
+        if key in _SERVER_OPTIONS and value is not None
+    }
+
+
+def _playwright_version() -> str:
+    from importlib.metadata import version
+
+    return version("playwright")
+
+
+def _pid_alive(pid: int) -> bool:
+    if os.name == "nt":
+        # os.kill(pid, 0) terminates the process on Windows; rely on the port check there
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _port_open(ws_endpoint: str, timeout: float = 1.0) -> bool:
+    parsed = urlparse(ws_endpoint)
+    try:
+        with socket.create_connection((parsed.hostname, parsed.port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+class BrowserServer:
+    """
+    One detached `playwright launch-server` per browser name, tracked in a state file
+    under .cache/browser_server/ so later pytest runs and every xdist worker reuse it.
+    - ensure() returns the websocket endpoint of a healthy server launched with the same
+      options and Playwright version, (re)starting it otherwise
+    - connect() connects a sync BrowserType to it, restarting it once if the connection fails
+    - stop() terminates it
+    """
+
+    def __init__(self, browser_name: str, options: dict = None, state_dir: Path = SERVER_DIR):
+        self.browser_name = browser_name
+        self.options = dict(options or {})
+        self.state_dir = Path(state_dir)
+        self.state_path = self.state_dir / f"{browser_name}.json"
+        self.log_path = self.state_dir / f"{browser_name}.log"
+
+    def read_state(self) -> dict | None:
+        try:
+            return json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return None
+
+    @staticmethod
+    def is_healthy(state: dict) -> bool:
+        """Server process still running and its websocket port accepting connections."""
+        return _pid_alive(state["pid"]) and _port_open(state["ws_endpoint"])
+
+    def _reusable(self, state: dict) -> bool:
+        return (
+            state["options"] == self.options
+            and state["playwright_version"] == _playwright_version()
+            and self.is_healthy(state)
+        )
+
+    def ensure(self, timeout: float = 30.0) -> str:
+        """Websocket endpoint of a reusable server, starting (or replacing) one if needed."""
+        with FileUtils.file_lock(self.state_path, timeout=timeout * 2):
+            state = self.read_state()
+            if state and self._reusable(state):
+                return state["ws_endpoint"]
+            if state:
+                self._terminate(state)
+            return self._start(timeout)["ws_endpoint"]
+
+    def restart(self, timeout: float = 30.0) -> str:
+        with FileUtils.file_lock(self.state_path, timeout=timeout * 2):
+            state = self.read_state()
+            if state:
+                self._terminate(state)
+            return self._start(timeout)["ws_endpoint"]
+
+    def stop(self) -> bool:
+        """Terminate the server; False when none was recorded."""
+        with FileUtils.file_lock(self.state_path):
+            state = self.read_state()
+            if not state:
+                return False
+            self._terminate(state)
+            return True
+
+    def connect(self, browser_type, timeout: float = 30.0, **connect_args):
+        """
+        Browser connected to the warm server. A server that passes the health check
+        but refuses the connection (e.g. its browser hung) is restarted once.
+        """
+        from playwright.sync_api import Error
+
+        timeout_ms = timeout * 1000
+        try:
+            return browser_type.connect(self.ensure(timeout), timeout=timeout_ms, **connect_args)
+        except Error:
+            return browser_type.connect(self.restart(timeout), timeout=timeout_ms, **connect_args)
+
+    def _start(self, timeout: float) -> dict:
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        config_path = self.state_dir / f"{self.browser_name}.options.json"
+        config_path.write_text(json.dumps(self.options), encoding="utf-8")
+        cmd = [
+            sys.executable, "-m", "playwright", "launch-server",
+            "--browser", self.browser_name, "--config", str(config_path),
+        ]
+        # Detached from this session so the server outlives it
+        detach = (
+            {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.DETACHED_PROCESS}
+            if os.name == "nt" else {"start_new_session": True}
+        )
+        with open(self.log_path, "w", encoding="utf-8") as log:
+            process = subprocess.Popen(
+                cmd, stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT, **detach
+            )
+        state = {
+            "pid": process.pid,
+            "ws_endpoint": self._wait_for_endpoint(process, timeout),
+            "browser": self.browser_name,
+            "options": self.options,
+            "playwright_version": _playwright_version(),
+            "started": time.time(),
+        }
+        self.state_path.write_text(json.dumps(state, indent=2), encoding="utf-8")
+        return state
+
+    def _wait_for_endpoint(self, process, timeout: float) -> str:
+        """launch-server prints its websocket endpoint once the browser is up."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            output = self.log_path.read_text(encoding="utf-8", errors="replace")
+            match = _WS_ENDPOINT.search(output)
+            if match:
+                return match.group(0)
+            if process.poll() is not None:
+                raise RuntimeError(
+                    f"playwright launch-server exited with code {process.returncode}:\n"
+                    f"{output[-2000:]}"
+                )
+            time.sleep(0.1)
+        self._kill(process.pid)
+        raise TimeoutError(
+            f"{self.browser_name} browser server did not start within {timeout}s "
+            f"(log: {self.log_path})"
+        )
+
+    def _terminate(self, state: dict):
+        if _pid_alive(state["pid"]):
+            self._kill(state["pid"])
+        self.state_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _kill(pid: int):
+        """Stop the launcher and the Node driver/browser processes it spawned."""
+        if os.name == "nt":
+            subprocess.run(["taskkill", "/T", "/F", "/PID", str(pid)], capture_output=True)
+            return
+        try:
+            os.killpg(pid, signal.SIGTERM)
+            deadline = time.monotonic() + 5
+            while _pid_alive(pid) and time.monotonic() < deadline:
+                time.sleep(0.1)
+            if _pid_alive(pid):
+                os.killpg(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+
+def list_servers(state_dir: Path = SERVER_DIR) -> list:
+    """[(browser name, state, healthy)] for every recorded server."""
+    servers = []
+    for state_path in sorted(Path(state_dir).glob("*.json")):
+        if state_path.name.endswith(".options.json"):
+            continue
+        state = BrowserServer(state_path.stem, state_dir=state_dir).read_state()
+        if state:
+            servers.append((state_path.stem, state, BrowserServer.is_healthy(state)))
+    return servers
+
+
+def stop_all(state_dir: Path = SERVER_DIR) -> list:
+    """Stop every recorded server; returns the browser names stopped."""
+    return [
+        name for name, _, _ in list_servers(state_dir)
+        if BrowserServer(name, state_dir=state_dir).stop()
+    ]
@@ -1,20 +1,15 @@
-import os
-from pathlib import Path
-from dotenv import load_dotenv
-
-# Load .env file only if present (useful for local dev)
-env_path = Path(__file__).resolve().parent.parent / ".env"
-if env_path.exists():
-    load_dotenv(dotenv_path=env_path)
+from .settings import lookup
 
 def get_env_variable(key: str, default: str | None = None) -> str:
     """
-    Gets an environment variable.
+    Gets a configuration value with the same precedence as utils/settings.py.
     - First checks system environment (CI/CD secrets, etc.)
-    - Falls back to .env file if available.
+    - Falls back to .env.test, then .env (os.environ is not modified)
     - Optionally returns default if not found.
     """
-    value = os.getenv(key, default)
+    value, _ = lookup(key)
+    if value is None:
+        value = default
     if value is None:
         raise ValueError(f"Missing required environment variable: {key}")
     return value
@@ -0,0 +1,136 @@
+"""
+Per-worker pool of pre-warmed Playwright contexts and pages
+"""
+import time
+from typing import Callable
+
+from playwright.sync_api import BrowserContext, Error as PlaywrightError
+
+# Clears storage for the origin the page is currently on
+_CLEAR_STORAGE_JS = "() => { try { localStorage.clear(); sessionStorage.clear(); } catch (e) {} }"
+
+
+class PooledPage:
+    """A context/page pair handed out by ContextPool."""
+
+    def __init__(self, context: BrowserContext):
+        self.context = context
+        self.page = context.new_page()
+        self.uses = 0
+        self.crashed = False
+        self.page.on("crash", self._mark_crashed)
+        self.context.on("close", self._mark_crashed)
+
+    def _mark_crashed(self, *_):
+        self.crashed = True
+
+
+class ContextPool:
+    """
+    Reuses contexts between tests instead of creating a new one each time.
+    - acquire() hands out an idle entry (hit) or creates a new one (miss)
+    - release() resets cookies, permissions, routes and storage, then returns
+      the entry to the pool; crashed or worn-out entries are closed instead
+    - stats counts hits, misses, recycles and the time spent creating/resetting
+
+    Reset only clears web storage for the origin the page is on when released;
+    tests that depend on a pristine IndexedDB or multi-origin storage should use
+    a fresh context instead.
+    """
+
+    def __init__(self, create_context: Callable[[], BrowserContext], max_uses: int = 50):
+        self.create_context = create_context
+        self.max_uses = max_uses
+        self._idle = []
+        self._leased = set()
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "recycled": 0,
+            "created": 0,
+            "create_seconds": 0.0,
+            "reset_seconds": 0.0,
+            "resets": 0,
+        }
+
+    def warm(self, count: int = 1):
+        """Create contexts ahead of the first test."""
+        for _ in range(count):
+            self._idle.append(self._create())
+
+    def acquire(self) -> PooledPage:
+        while self._idle:
+            entry = self._idle.pop()
+            if not entry.crashed:
+                self.stats["hits"] += 1
+                break
+            self._discard(entry)
+        else:
+            self.stats["misses"] += 1
+            entry = self._create()
+        entry.uses += 1
+        self._leased.add(entry)
+        return entry
+
+    def release(self, entry: PooledPage, discard: bool = False):
+        self._leased.discard(entry)
+        if discard or entry.crashed or entry.uses >= self.max_uses:
+            self._discard(entry)
+            return
+        started = time.perf_counter()
+        try:
+            self._reset(entry)
+        except PlaywrightError:
+            self._discard(entry)
+            return
+        finally:
+            self.stats["reset_seconds"] += time.perf_counter() - started
+        self.stats["resets"] += 1
+        self._idle.append(entry)
+
+    def owns(self, page) -> bool:
+        return any(entry.page is page for entry in self._leased)
+
+    def close(self):
+        for entry in self._idle + list(self._leased):
+            self._discard(entry, count=False)
+        self._idle.clear()
+        self._leased.clear()
+
+    def summary(self) -> str:
+        stats = self.stats
+        created = stats["created"] or 1
+        resets = stats["resets"] or 1
+        return (
+            f"context pool: hits={stats['hits']} misses={stats['misses']} "
+            f"recycled={stats['recycled']} "
+            f"avg_create={stats['create_seconds'] / created * 1000:.1f}ms "
+            f"avg_reset={stats['reset_seconds'] / resets * 1000:.1f}ms"
+        )
+
+    def _create(self) -> PooledPage:
+        started = time.perf_counter()
+        entry = PooledPage(self.create_context())
+        self.stats["created"] += 1
+        self.stats["create_seconds"] += time.perf_counter() - started
+        return entry
+
+    def _reset(self, entry: PooledPage):
+        context, page = entry.context, entry.page
+        for extra in context.pages:
+            if extra is not page:
+                extra.close()
+        page.evaluate(_CLEAR_STORAGE_JS)
+        context.clear_cookies()
+        context.clear_permissions()
+        context.unroute_all(behavior="ignoreErrors")
+        page.unroute_all(behavior="ignoreErrors")
+        page.goto("about:blank")
+
+    def _discard(self, entry: PooledPage, count: bool = True):
+        if count:
+            self.stats["recycled"] += 1
+        try:
+            entry.context.close()
+        except PlaywrightError:
+            pass
@@ -0,0 +1,142 @@
+"""
+Indexed, disk-cached access to CSV test data
+"""
+import hashlib
+import pickle
+from pathlib import Path
+
+from e2e.constants import CACHE_DIR_NAME
+from .file_utils import FileUtils
+from .impact import ImpactRecorder, project_key
+
+E2E_ROOT = Path(__file__).resolve().parent.parent
+
+# Bump when the pickled layout changes so old caches are ignored
+_CACHE_FORMAT = 1
+
+
+class CsvDataStore:
+    """
+    Parses a CSV once and indexes its rows for O(1) lookups.
+    - Rows are indexed by each column in index_keys (test_case_name by default)
+    - The parsed rows and indexes are pickled under e2e/.cache/data, so later
+      processes (and every xdist worker) skip CSV parsing entirely
+    - The cache is rebuilt when the CSV's size/mtime change, or its sha256
+      when verify_hash=True
+    """
+
+    # One store per (path, index_keys, cache_dir, verify_hash) per process
+    _instances = {}
+
+    def __init__(self, csv_path: Path, index_keys=("test_case_name",), cache_dir: Path = None,
+                 verify_hash: bool = False):
+        self.csv_path = Path(csv_path).resolve()
+        self.index_keys = tuple(index_keys)
+        self.cache_dir = Path(cache_dir) if cache_dir else E2E_ROOT / CACHE_DIR_NAME / "data"
+        self.verify_hash = verify_hash
+        self.rows = []
+        self._indexes = {}
+        self._load()
+
+    @classmethod
+    def open(cls, csv_path: Path, index_keys=("test_case_name",), cache_dir: Path = None,
+             verify_hash: bool = False) -> "CsvDataStore":
+        """Return the process-wide store for csv_path and these options, loading it on first use."""
+        key = (
+            str(Path(csv_path).resolve()), tuple(index_keys),
+            str(Path(cache_dir).resolve()) if cache_dir else None, verify_hash,
+        )
+        store = cls._instances.get(key)
+        if store is None or store.is_stale():
+            store = cls._instances[key] = cls(csv_path, index_keys, cache_dir, verify_hash)
+        return store
+
+    def get(self, value: str, key: str = "test_case_name") -> dict:
+        """Return the first row whose `key` column equals value."""
+        self._touch(f"{key}={value}")
+        positions = self._index(key).get(value)
+        if not positions:
+            raise ValueError(f"No test data found for {key}='{value}' in {self.csv_path}")
+        return dict(self.rows[positions[0]])
+
+    def find(self, value: str, key: str = "test_case_name") -> list:
+        """Return every row whose `key` column equals value."""
+        self._touch(f"{key}={value}")
+        return [dict(self.rows[i]) for i in self._index(key).get(value, ())]
+
+    def all_rows(self) -> list:
+        """Copies of every row, in file order; callers may mutate them freely."""
+        self._touch("*")
+        return [dict(row) for row in self.rows]
+
+    def values(self, key: str = "test_case_name") -> list:
+        """Distinct values of an indexed column, in file order."""
+        self._touch("*")
+        return list(self._index(key))
+
+    def is_stale(self) -> bool:
+        return self._signature() != self._loaded_signature
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _touch(self, record: str):
+        """Note the rows read by the running test for test impact analysis."""
+        if ImpactRecorder.active:
+            ImpactRecorder.data.add(f"{project_key(self.csv_path)}::{record}")
+
+    def _index(self, key: str) -> dict:
+        try:
+            return self._indexes[key]
+        except KeyError:
+            raise ValueError(
+                f"Column '{key}' is not indexed for {self.csv_path}; "
+                f"indexed columns: {list(self.index_keys)}"
+            ) from None
+
+    def _signature(self) -> tuple:
+        stat = self.csv_path.stat()
+        if self.verify_hash:
+            return stat.st_size, hashlib.sha256(self.csv_path.read_bytes()).hexdigest()
+        return stat.st_size, stat.st_mtime_ns
+
+    def _cache_path(self) -> Path:
+        path_key = hashlib.sha256(str(self.csv_path).encode("utf-8")).hexdigest()[:12]
+        return self.cache_dir / f"{self.csv_path.stem}_{path_key}.pickle"
+
+    def _load(self):
+        signature = self._signature()
+        cache_path = self._cache_path()
+        try:
+            with open(cache_path, "rb") as f:
+                payload = pickle.load(f)
+            if (payload.get("format") == _CACHE_FORMAT
+                    and payload.get("signature") == signature
+                    and payload.get("index_keys") == self.index_keys):
+                self.rows, self._indexes = payload["rows"], payload["indexes"]
+                self._loaded_signature = signature
+                return
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, KeyError):
+            pass
+
+        self.rows = FileUtils.read_csv(self.csv_path)
+        self._indexes = {key: {} for key in self.index_keys}
+        for position, row in enumerate(self.rows):
+            for key in self.index_keys:
+                self._indexes[key].setdefault(row.get(key), []).append(position)
+        self._loaded_signature = signature
+
+        payload = {
+            "format": _CACHE_FORMAT,
+            "signature": signature,
+            "index_keys": self.index_keys,
+            "rows": self.rows,
+            "indexes": self._indexes,
+        }
+        try:
+            FileUtils.write_atomic(
+                cache_path, pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+            )
+        except OSError:
+            # A read-only checkout still gets the in-memory index
+            pass
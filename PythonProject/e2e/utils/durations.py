@@ -0,0 +1,189 @@
+"""
+Test duration history and longest-processing-time-first (LPT) scheduling
+"""
+import heapq
+import json
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import pytest
+
+from .file_utils import FileUtils
+from .workers import is_worker
+
+
+class DurationHistory:
+    """
+    Smoothed per-test durations (seconds) kept in a JSON file between runs.
+    - record() blends a new observation into the stored value (EWMA)
+    - estimate() falls back to marker-based guesses for tests never seen before
+    """
+
+    def __init__(self, path_obj: Path, marker_estimates: dict, default_estimate: float,
+                 alpha: float = 0.5):
+        self.path = Path(path_obj)
+        self.marker_estimates = marker_estimates
+        self.default_estimate = default_estimate
+        self.alpha = alpha
+        try:
+            self.durations = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.durations = {}
+
+    def known(self, nodeid: str) -> bool:
+        return nodeid in self.durations
+
+    def estimate(self, item) -> float:
+        duration = self.durations.get(item.nodeid)
+        if duration is not None:
+            return duration
+        guesses = [
+            seconds for mark, seconds in self.marker_estimates.items()
+            if item.get_closest_marker(mark)
+        ]
+        return max(guesses) if guesses else self.default_estimate
+
+    def record(self, nodeid: str, seconds: float):
+        previous = self.durations.get(nodeid)
+        if previous is not None:
+            seconds = self.alpha * seconds + (1 - self.alpha) * previous
+        self.durations[nodeid] = seconds
+
+    def save(self):
+        payload = json.dumps(self.durations, indent=1, sort_keys=True)
+        FileUtils.write_atomic(self.path, payload.encode("utf-8"))
+
+
+def lpt_schedule(durations: dict, workers: int) -> list:
+    """
+    Assign tests to workers longest-first, each to the least loaded worker.
+    Returns one (load_seconds, [nodeids]) tuple per worker. Ties are broken
+    by node id, so the result is deterministic for the same input.
+    """
+    workers = max(1, workers)
+    bins = [(0.0, index, []) for index in range(workers)]
+    heapq.heapify(bins)
+    for nodeid, seconds in sorted(durations.items(), key=lambda kv: (-kv[1], kv[0])):
+        load, index, assigned = heapq.heappop(bins)
+        assigned.append(nodeid)
+        heapq.heappush(bins, (load + seconds, index, assigned))
+    return [(load, assigned) for load, _, assigned in sorted(bins, key=lambda b: b[1])]
+
+
+def parse_shard(value: str) -> tuple:
+    """Parse 'K/N' into (K, N) with 1 <= K <= N."""
+    try:
+        index, total = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f"Shard must look like K/N (e.g. 2/4), got '{value}'")
+    if not 1 <= index <= total:
+        raise ValueError(f"Shard index must be between 1 and {total}, got {index}")
+    return index, total
+
+
+def greedy_makespan(durations: list, workers: int) -> float:
+    """Makespan when tests are handed out in the given order to whichever worker frees up first."""
+    loads = [0.0] * max(1, workers)
+    heapq.heapify(loads)
+    for seconds in durations:
+        heapq.heappush(loads, heapq.heappop(loads) + seconds)
+    return max(loads)
+
+
+class DurationSchedulerPlugin:
+    """
+    Records test durations and orders collection longest-first.
+    - With --shard K/N, only the K-th of N duration-balanced shards is kept
+    - With --duration-order, items are sorted by estimated duration so xdist's
+      load scheduler approximates LPT
+    - With either option, each item carries its estimate and original position in
+      user_properties, so the controller (which does not collect under xdist) can
+      see them, and the predicted vs actual makespan is printed at the end of the run
+    - Durations are recorded into the history on every run
+    """
+
+    def __init__(self, config, history: DurationHistory):
+        self.config = config
+        self.history = history
+        self.is_worker = is_worker(config)
+        self.scheduling = bool(config.getoption("shard") or config.getoption("duration_order"))
+        self.planned = {}
+        self.test_seconds = defaultdict(float)
+        self.worker_busy = defaultdict(float)
+        self.started = time.time()
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, config, items):
+        if not self.scheduling:
+            return
+        estimates = {item.nodeid: self.history.estimate(item) for item in items}
+        shard = config.getoption("shard")
+        if shard:
+            self._keep_shard(config, items, estimates, *parse_shard(shard))
+        for index, item in enumerate(items):
+            item.user_properties.append(
+                ("duration_plan", (estimates[item.nodeid], index, self.history.known(item.nodeid)))
+            )
+        if config.getoption("duration_order"):
+            items.sort(key=lambda item: (-estimates[item.nodeid], item.nodeid))
+
+    @staticmethod
+    def _keep_shard(config, items, estimates, index, total):
+        """
+        Keep only shard `index` of `total`. Shards are built with LPT over the
+        estimates, so every host gets a similar amount of work, and the split
+        depends only on node ids + history, so all hosts agree on it.
+        """
+        bins = lpt_schedule({item.nodeid: estimates[item.nodeid] for item in items}, total)
+        keep = set(bins[index - 1][1])
+        deselected = [item for item in items if item.nodeid not in keep]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = [item for item in items if item.nodeid in keep]
+
+    def pytest_runtest_logreport(self, report):
+        if self.is_worker:
+            return
+        for name, value in report.user_properties:
+            if name == "duration_plan":
+                self.planned[report.nodeid] = value
+        self.test_seconds[report.nodeid] += report.duration
+        node = getattr(report, "node", None)
+        worker_id = node.gateway.id if node is not None else "main"
+        self.worker_busy[worker_id] += report.duration
+
+    def pytest_sessionfinish(self, session):
+        if self.is_worker or not self.test_seconds:
+            return
+        for nodeid, seconds in self.test_seconds.items():
+            self.history.record(nodeid, seconds)
+        self.history.save()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.is_worker or not self.planned:
+            return
+        workers = len(self.worker_busy)
+        estimates = {nodeid: plan[0] for nodeid, plan in self.planned.items()}
+        in_collection_order = [
+            plan[0] for plan in sorted(self.planned.values(), key=lambda plan: plan[1])
+        ]
+        predicted_lpt = max(load for load, _ in lpt_schedule(estimates, workers))
+        predicted_naive = greedy_makespan(in_collection_order, workers)
+        actual = max(self.worker_busy.values())
+        idle = sum(actual - busy for busy in self.worker_busy.values())
+
+        terminalreporter.write_sep("-", "duration-aware scheduling")
+        terminalreporter.write_line(
+            f"workers={workers} predicted makespan: collection order {predicted_naive:.1f}s, "
+            f"longest-first {predicted_lpt:.1f}s"
+        )
+        terminalreporter.write_line(
+            f"actual makespan {actual:.1f}s (wall {time.time() - self.started:.1f}s), "
+            f"idle worker time {idle:.1f}s"
+        )
+        unknown = sum(1 for plan in self.planned.values() if not plan[2])
+        if unknown:
+            terminalreporter.write_line(
+                f"{unknown} test(s) had no history and used marker-based estimates"
+            )
@@ -1,6 +1,7 @@
 import csv
 import os
-import yaml
+import time
+from contextlib import contextmanager
 from pathlib import Path
 
 class FileUtils:
@@ -20,24 +21,74 @@ class FileUtils:
     def get_data_for_test(test_name: str, path_obj: Path):
         """
         Fetch a single row from CSV that matches the test_case_name column.
+        Served from the indexed CsvDataStore, so the CSV is parsed once per process.
         """
-        rows = FileUtils.read_csv(path_obj)
-        for row in rows:
-            if row.get("test_case_name") == test_name:
-                return row
-        raise ValueError(f"No test data found for {test_name} in {path_obj}")
+        from .data_store import CsvDataStore
+
+        try:
+            return CsvDataStore.open(path_obj).get(test_name)
+        except ValueError:
+            raise ValueError(f"No test data found for {test_name} in {path_obj}")
 
 
     @staticmethod
     def read_yaml(path_obj: Path):
+        # Imported on first use; most sessions only need it once the locators are loaded
+        import yaml
+
         with open(path_obj, "r", encoding="utf-8") as f:
             return yaml.safe_load(f)
 
     @staticmethod
     def get_locator(page: str, locator_name: str, path_obj: Path) -> str:
-        locators = FileUtils.read_yaml(path_obj)
-        try:
-            return locators[page][locator_name]
-        except KeyError:
-            raise ValueError(f"Locator '{locator_name}' not found for page '{page}' in {path_obj}")
+        """Look up a selector; the file is parsed once per process by LocatorRegistry."""
+        from .locator_registry import LocatorRegistry
 
+        return LocatorRegistry.for_file(path_obj).get(page, locator_name)
+
+    @staticmethod
+    def write_atomic(path_obj: Path, data: bytes):
+        """
+        Write bytes to a temp file next to path_obj and rename it into place,
+        so concurrent readers (e.g. other xdist workers) never see a partial file.
+        """
+        path_obj = Path(path_obj)
+        path_obj.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path_obj.with_name(f"{path_obj.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path_obj)
+
+    @staticmethod
+    @contextmanager
+    def file_lock(path_obj: Path, timeout: float = 60.0, stale_after: float = 300.0):
+        """
+        Cross-process lock based on exclusive creation of '<path>.lock'.
+        - Waits up to timeout seconds for the lock
+        - Breaks locks older than stale_after seconds (crashed holder)
+        """
+        lock_path = Path(f"{path_obj}.lock")
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.close(fd)
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - lock_path.stat().st_mtime > stale_after:
+                        lock_path.unlink()
+                        continue
+                except FileNotFoundError:
+                    continue
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Timed out waiting for lock {lock_path}")
+                time.sleep(0.1)
+        try:
+            yield
+        finally:
+            try:
+                lock_path.unlink()
+            except FileNotFoundError:
+                pass
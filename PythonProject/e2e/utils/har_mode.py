@@ -0,0 +1,145 @@
+"""
+HAR record/replay for running tests without the live backend
+"""
+import json
+import re
+import shutil
+from pathlib import Path
+
+from playwright.sync_api import BrowserContext, Route
+
+HAR_MODES = ("off", "record", "replay")
+
+# What to do with a request that is not in the HAR during replay
+MISSING_POLICIES = ("fail", "passthrough", "stub")
+
+HAR_DIR = Path(__file__).resolve().parent.parent / "resources" / "har"
+
+# Per-test recordings of shared HAR files, merged at the end of a record run
+_PARTS_DIR = ".parts"
+
+
+def har_name_for(item) -> str:
+    """
+    HAR file name for a test.
+    - @pytest.mark.har("login_page") shares one recording between tests/page objects
+    - otherwise one file per test, derived from its node id
+    """
+    marker = item.get_closest_marker("har")
+    if marker and marker.args:
+        return marker.args[0]
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", item.nodeid).strip("_")
+
+
+def har_path_for(item, har_dir: Path, mode: str) -> Path:
+    """
+    HAR file a test replays from or records to.
+    A shared recording (@pytest.mark.har(name)) is recorded per test under
+    .parts/<name>/ and merged by merge_har_parts(), since Playwright rewrites the
+    whole file when a context closes and the last test would overwrite the others.
+    """
+    har_dir = Path(har_dir)
+    name = har_name_for(item)
+    marker = item.get_closest_marker("har")
+    if mode == "record" and marker and marker.args:
+        test_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", item.nodeid).strip("_")
+        return har_dir / _PARTS_DIR / name / f"{test_name}.har"
+    return har_dir / f"{name}.har"
+
+
+def _entry_key(entry: dict) -> tuple:
+    request = entry["request"]
+    return request["method"], request["url"], (request.get("postData") or {}).get("text")
+
+
+def merge_har_parts(har_dir: Path) -> list:
+    """
+    Merge the per-test parts of every shared recording into <name>.har and remove them.
+    Freshly recorded entries win; entries of the existing file for requests no test
+    recorded this time are kept, so re-recording a subset of tests does not drop the rest.
+    Returns the merged names.
+    """
+    parts_root = Path(har_dir) / _PARTS_DIR
+    if not parts_root.is_dir():
+        return []
+    merged = []
+    for parts_dir in sorted(path_obj for path_obj in parts_root.iterdir() if path_obj.is_dir()):
+        target = Path(har_dir) / f"{parts_dir.name}.har"
+        parts = sorted(parts_dir.glob("*.har"))
+        logs = [json.loads(part.read_text(encoding="utf-8"))["log"] for part in parts]
+        if not logs:
+            continue
+        if target.exists():
+            logs.append(json.loads(target.read_text(encoding="utf-8"))["log"])
+        entries, pages, seen = [], [], set()
+        for log in logs:
+            pages.extend(page for page in log.get("pages", []) if page not in pages)
+            for entry in log["entries"]:
+                if _entry_key(entry) not in seen:
+                    seen.add(_entry_key(entry))
+                    entries.append(entry)
+        merged_log = {**logs[0], "pages": pages, "entries": entries}
+        target.write_text(json.dumps({"log": merged_log}, indent=2), encoding="utf-8")
+        merged.append(parts_dir.name)
+    shutil.rmtree(parts_root, ignore_errors=True)
+    return merged
+
+
+class HarSession:
+    """
+    Installs HAR routing on a context.
+    - record: every matching request goes to the network and is written to the
+      HAR when the context closes
+    - replay: responses are served from the HAR; unmatched requests are handled
+      by the missing policy and listed in `missing`
+    """
+
+    def __init__(self, context: BrowserContext, har_path: Path, mode: str,
+                 missing_policy: str = "fail", url_filter: str = None):
+        if mode not in HAR_MODES:
+            raise ValueError(f"Unknown HAR mode '{mode}'; expected one of {HAR_MODES}")
+        if missing_policy not in MISSING_POLICIES:
+            raise ValueError(
+                f"Unknown HAR missing policy '{missing_policy}'; expected one of {MISSING_POLICIES}"
+            )
+        self.har_path = Path(har_path)
+        self.mode = mode
+        self.missing_policy = missing_policy
+        self.missing = []
+
+        if mode == "record":
+            self.har_path.parent.mkdir(parents=True, exist_ok=True)
+            context.route_from_har(
+                self.har_path, url=url_filter, update=True, update_content="embed"
+            )
+        elif mode == "replay":
+            # Registered first, so it only sees requests the HAR route falls back on;
+            # requests outside url_filter were never recorded and go to the network
+            context.route(url_filter or "**/*", self._handle_missing)
+            if self.har_path.exists():
+                context.route_from_har(self.har_path, url=url_filter, not_found="fallback")
+
+    @property
+    def failed(self) -> bool:
+        return self.mode == "replay" and self.missing_policy == "fail" and bool(self.missing)
+
+    def failure_message(self) -> str:
+        listed = "\n  ".join(self.missing[:20])
+        more = f"\n  ... and {len(self.missing) - 20} more" if len(self.missing) > 20 else ""
+        return (
+            f"{len(self.missing)} request(s) not found in {self.har_path} "
+            f"(re-record with --har-mode record):\n  {listed}{more}"
+        )
+
+    def _handle_missing(self, route: Route):
+        request = route.request
+        self.missing.append(f"{request.method} {request.url}")
+        if self.missing_policy == "passthrough":
+            route.continue_()
+        elif self.missing_policy == "stub":
+            if request.resource_type in ("xhr", "fetch"):
+                route.fulfill(status=200, content_type="application/json", body="{}")
+            else:
+                route.fulfill(status=200, body="")
+        else:
+            route.abort("blockedbyclient")
@@ -0,0 +1,305 @@
+"""
+SQLite history of test outcomes and durations across runs
+"""
+import json
+import sqlite3
+import statistics
+import time
+from pathlib import Path
+
+import pytest
+
+from e2e.constants import CACHE_DIR_NAME, HISTORY_MIN_RUNS, HISTORY_WINDOW, QUARANTINE_PASS_RATE
+from .workers import is_worker
+
+E2E_ROOT = Path(__file__).resolve().parent.parent
+HISTORY_DB = E2E_ROOT / CACHE_DIR_NAME / "history.sqlite"
+
+# all: every test; main: quarantined tests excluded; quarantine: only quarantined tests
+LANES = ("all", "main", "quarantine")
+
+# Newest results used as "recent" in duration trends; older ones in the window form the baseline
+_TREND_RECENT = 5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started REAL NOT NULL,
+    finished REAL,
+    lane TEXT NOT NULL,
+    args TEXT NOT NULL,
+    exit_status INTEGER
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    nodeid TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    duration REAL NOT NULL,
+    worker TEXT,
+    PRIMARY KEY (run_id, nodeid)
+);
+CREATE INDEX IF NOT EXISTS results_by_test ON results (nodeid, run_id);
+CREATE TABLE IF NOT EXISTS action_timings (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    nodeid TEXT NOT NULL,
+    action TEXT NOT NULL,
+    ms REAL NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (run_id, nodeid, action)
+);
+"""
+
+# Run id of this session's history row, for plugins that add to it at session end
+run_id_key = pytest.StashKey[int]()
+
+
+class RunHistory:
+    """
+    Outcomes (passed/failed/skipped) and durations per test node id, per run.
+    Only the pytest controller writes, once at the end of a run.
+    """
+
+    def __init__(self, path_obj: Path = HISTORY_DB):
+        self.path = Path(path_obj)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path, timeout=30)
+        self.db.executescript(_SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def record_run(self, started: float, lane: str, args: list, results: dict,
+                   exit_status: int) -> int:
+        """Store a finished run; results maps nodeid -> (outcome, duration seconds, worker)."""
+        with self.db:
+            cursor = self.db.execute(
+                "INSERT INTO runs (started, finished, lane, args, exit_status) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (started, time.time(), lane, json.dumps(args), exit_status),
+            )
+            run_id = cursor.lastrowid
+            self.db.executemany(
+                "INSERT INTO results (run_id, nodeid, outcome, duration, worker) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(run_id, nodeid, *result) for nodeid, result in results.items()],
+            )
+        return run_id
+
+    def record_action_timings(self, run_id: int, timings: dict):
+        """
+        Store per-test action timings of a run;
+        timings maps (nodeid, action) -> (median ms, calls).
+        """
+        with self.db:
+            self.db.executemany(
+                "INSERT INTO action_timings (run_id, nodeid, action, ms, count) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (run_id, nodeid, action, ms, count)
+                    for (nodeid, action), (ms, count) in timings.items()
+                ],
+            )
+
+    def recent(self, window: int = HISTORY_WINDOW, before_run: int = None) -> dict:
+        """
+        {nodeid: [(outcome, duration), ...] newest first} for the last `window`
+        non-skipped results, optionally only from runs older than before_run.
+        """
+        rows = self.db.execute(
+            """
+            SELECT nodeid, outcome, duration FROM (
+                SELECT nodeid, outcome, duration,
+                       ROW_NUMBER() OVER (PARTITION BY nodeid ORDER BY run_id DESC) AS age
+                FROM results WHERE outcome != 'skipped' AND (? IS NULL OR run_id < ?)
+            ) WHERE age <= ? ORDER BY nodeid, age
+            """,
+            (before_run, before_run, window),
+        )
+        history = {}
+        for nodeid, outcome, duration in rows:
+            history.setdefault(nodeid, []).append((outcome, duration))
+        return history
+
+    def run_results(self, run_id: int) -> dict:
+        """{nodeid: (outcome, duration)} of one run."""
+        rows = self.db.execute(
+            "SELECT nodeid, outcome, duration FROM results WHERE run_id = ?", (run_id,)
+        )
+        return {nodeid: (outcome, duration) for nodeid, outcome, duration in rows}
+
+    def action_timings(self, run_id: int) -> dict:
+        """{(nodeid, action): median ms} of one run."""
+        rows = self.db.execute(
+            "SELECT nodeid, action, ms FROM action_timings WHERE run_id = ?", (run_id,)
+        )
+        return {(nodeid, action): ms for nodeid, action, ms in rows}
+
+    def action_baselines(self, before_run: int, window: int = HISTORY_WINDOW) -> dict:
+        """
+        {(nodeid, action): [median ms, ...] newest first}
+        from the last `window` runs before before_run.
+        """
+        rows = self.db.execute(
+            """
+            SELECT nodeid, action, ms FROM (
+                SELECT nodeid, action, ms,
+                       ROW_NUMBER() OVER (PARTITION BY nodeid, action ORDER BY run_id DESC) AS age
+                FROM action_timings WHERE run_id < ?
+            ) WHERE age <= ? ORDER BY nodeid, action, age
+            """,
+            (before_run, window),
+        )
+        baselines = {}
+        for nodeid, action, ms in rows:
+            baselines.setdefault((nodeid, action), []).append(ms)
+        return baselines
+
+    def failed_last(self) -> list:
+        """Tests whose most recent (non-skipped) result is a failure."""
+        return sorted(
+            nodeid for nodeid, results in self.recent(1).items() if results[0][0] == "failed"
+        )
+
+    def flakiness(self, window: int = HISTORY_WINDOW) -> dict:
+        """
+        {nodeid: stats} over the recent window:
+        - pass_rate: share of passing results
+        - flips: pass<->fail transitions between consecutive results
+          (flaky tests flip, broken ones do not)
+        """
+        stats = {}
+        for nodeid, results in self.recent(window).items():
+            outcomes = [outcome for outcome, _ in results]
+            stats[nodeid] = {
+                "runs": len(outcomes),
+                "pass_rate": outcomes.count("passed") / len(outcomes),
+                "flips": sum(1 for newer, older in zip(outcomes, outcomes[1:]) if newer != older),
+                "last": outcomes[0],
+            }
+        return stats
+
+    def quarantined(self, threshold: float = QUARANTINE_PASS_RATE, window: int = HISTORY_WINDOW,
+                    min_runs: int = HISTORY_MIN_RUNS) -> list:
+        """Tests with at least min_runs recent results and a pass rate below threshold."""
+        return sorted(
+            nodeid for nodeid, stats in self.flakiness(window).items()
+            if stats["runs"] >= min_runs and stats["pass_rate"] < threshold
+        )
+
+    def duration_trends(self, window: int = HISTORY_WINDOW) -> dict:
+        """{nodeid: (recent median s, baseline median s, relative change)} from passing runs."""
+        trends = {}
+        for nodeid, results in self.recent(window).items():
+            durations = [duration for outcome, duration in results if outcome == "passed"]
+            recent, baseline = durations[:_TREND_RECENT], durations[_TREND_RECENT:]
+            if not recent or not baseline:
+                continue
+            recent_median, baseline_median = statistics.median(recent), statistics.median(baseline)
+            change = (recent_median - baseline_median) / baseline_median if baseline_median else 0.0
+            trends[nodeid] = (recent_median, baseline_median, change)
+        return trends
+
+
+def format_flaky_report(history: RunHistory, threshold: float = QUARANTINE_PASS_RATE) -> str:
+    stats = history.flakiness()
+    quarantined = set(history.quarantined(threshold))
+    rows = sorted(stats.items(), key=lambda kv: (kv[1]["pass_rate"], -kv[1]["flips"], kv[0]))
+    lines = [f"{'test':<70} {'runs':>5} {'pass %':>7} {'flips':>6} {'last':>7}"]
+    for nodeid, row in rows:
+        if row["pass_rate"] == 1.0:
+            continue
+        flag = "  QUARANTINED" if nodeid in quarantined else ""
+        lines.append(
+            f"{nodeid:<70} {row['runs']:>5} {row['pass_rate'] * 100:>7.1f} "
+            f"{row['flips']:>6} {row['last']:>7}{flag}"
+        )
+    if len(lines) == 1:
+        lines.append("no test failed in the recorded history")
+    return "\n".join(lines)
+
+
+def format_trend_report(history: RunHistory, top: int = 25) -> str:
+    trends = history.duration_trends()
+    lines = [f"{'test':<70} {'baseline s':>11} {'recent s':>9} {'change':>8}"]
+    slowest = sorted(trends.items(), key=lambda kv: -kv[1][2])[:top]
+    for nodeid, (recent, baseline, change) in slowest:
+        lines.append(f"{nodeid:<70} {baseline:>11.2f} {recent:>9.2f} {change * 100:>+7.1f}%")
+    if len(lines) == 1:
+        lines.append(f"not enough passing runs yet (need more than {_TREND_RECENT} per test)")
+    return "\n".join(lines)
+
+
+class HistoryPlugin:
+    """
+    - Records every test's outcome and duration into the SQLite history (controller only)
+    - --rerun-failed keeps only tests whose last recorded result failed
+    - --lane main skips quarantined tests; --lane quarantine runs only them
+    selection holds the failed/quarantined node ids, read once by the controller.
+    """
+
+    def __init__(self, config, history_path: Path, lane: str, rerun_failed: bool, selection: dict):
+        self.config = config
+        self.is_worker = is_worker(config)
+        self.history_path = history_path
+        self.lane = lane
+        self.rerun_failed = rerun_failed
+        self.selection = selection
+        self.results = {}
+        self.started = time.time()
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_collection_modifyitems(self, config, items):
+        keep = items
+        if self.rerun_failed:
+            failed = set(self.selection["failed"])
+            keep = [item for item in keep if item.nodeid in failed]
+        quarantined = set(self.selection["quarantined"])
+        if self.lane == "main":
+            keep = [item for item in keep if item.nodeid not in quarantined]
+        elif self.lane == "quarantine":
+            keep = [item for item in keep if item.nodeid in quarantined]
+        if len(keep) < len(items):
+            kept_ids = {item.nodeid for item in keep}
+            deselected = [item for item in items if item.nodeid not in kept_ids]
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = keep
+
+    def pytest_runtest_logreport(self, report):
+        if self.is_worker:
+            return
+        outcome, duration, worker = self.results.get(report.nodeid, ("passed", 0.0, None))
+        if report.failed:
+            outcome = "failed"
+        elif report.skipped and outcome != "failed":
+            outcome = "skipped"
+        node = getattr(report, "node", None)
+        worker = node.gateway.id if node is not None else "main"
+        self.results[report.nodeid] = (outcome, duration + report.duration, worker)
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_sessionfinish(self, session, exitstatus):
+        if self.is_worker or not self.results:
+            return
+        history = RunHistory(self.history_path)
+        try:
+            self.config.stash[run_id_key] = history.record_run(
+                self.started, self.lane, self.config.invocation_params.args, self.results,
+                int(exitstatus),
+            )
+        finally:
+            history.close()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.is_worker:
+            return
+        quarantined = self.selection["quarantined"]
+        if self.rerun_failed:
+            terminalreporter.write_sep("-", "rerun of previously failed tests")
+            failed = len(self.selection["failed"])
+            terminalreporter.write_line(f"{failed} test(s) failed in their last recorded run")
+        if quarantined and self.lane != "all":
+            terminalreporter.write_sep("-", f"quarantine ({self.lane} lane)")
+            verb = "skipped" if self.lane == "main" else "ran"
+            terminalreporter.write_line(f"{verb} {len(quarantined)} quarantined test(s):")
+            for nodeid in quarantined:
+                terminalreporter.write_line(f"  {nodeid}")
@@ -0,0 +1,412 @@
+"""
+Test impact analysis: what each test touched, and which tests a git diff affects
+"""
+import ast
+import contextlib
+import csv
+import io
+import json
+import re
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+
+from e2e.constants import CACHE_DIR_NAME
+from .workers import is_worker
+
+E2E_ROOT = Path(__file__).resolve().parent.parent
+IMPACT_MAP = E2E_ROOT / CACHE_DIR_NAME / "impact_map.json"
+
+# Changes to these never affect a test run
+_IGNORED_SUFFIXES = {".md", ".txt", ".rst"}
+_HUNK = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+def project_key(path_obj) -> str:
+    """Path relative to e2e/ with forward slashes, or the path itself outside it."""
+    path_obj = Path(path_obj).resolve()
+    try:
+        return path_obj.relative_to(E2E_ROOT).as_posix()
+    except ValueError:
+        return path_obj.as_posix()
+
+
+class ImpactRecorder:
+    """
+    Process-wide record of what the running test touches:
+    - methods: "pages/login_page.py::LoginPage.login" (page-object methods wrapped by timed())
+    - locators: "login_page.username_field" (PageLocator resolutions)
+    - data: "resources/testdata.csv::test_case_name=valid_login" (CsvDataStore lookups;
+      "::*" when every row was read)
+    - uses: names of shared footprints the test depends on (see footprint())
+    """
+
+    active = False
+    methods = set()
+    locators = set()
+    data = set()
+    uses = set()
+    # Footprints recorded by this process since they were last collected, by name
+    footprints = {}
+
+    @staticmethod
+    def method_key(func) -> str:
+        return f"{project_key(func.__code__.co_filename)}::{func.__qualname__}"
+
+    @classmethod
+    def start(cls):
+        cls.methods, cls.locators, cls.data, cls.uses = set(), set(), set(), set()
+        cls.active = True
+
+    @classmethod
+    def stop(cls) -> dict:
+        cls.active = False
+        return {
+            "methods": sorted(cls.methods), "locators": sorted(cls.locators),
+            "data": sorted(cls.data), "uses": sorted(cls.uses),
+        }
+
+    @classmethod
+    @contextlib.contextmanager
+    def footprint(cls, name: str):
+        """
+        Record what the block touches as the shared footprint `name` instead of into
+        the running test. For setup that only runs in whichever test first needs it
+        (e.g. the UI login behind a cached session); tests depending on it call use().
+        """
+        outer = cls.active, cls.methods, cls.locators, cls.data
+        cls.active, cls.methods, cls.locators, cls.data = True, set(), set(), set()
+        try:
+            yield
+        finally:
+            cls.footprints[name] = {
+                "methods": sorted(cls.methods), "locators": sorted(cls.locators),
+                "data": sorted(cls.data),
+            }
+            cls.active, cls.methods, cls.locators, cls.data = outer
+
+    @classmethod
+    def use(cls, name: str):
+        """Note that the running test depends on footprint `name`, wherever it was recorded."""
+        if cls.active:
+            cls.uses.add(name)
+
+
+class ImpactMap:
+    """
+    {nodeid: {"methods": [...], "locators": [...], "data": [...], "uses": [...]}} and
+    the shared footprints ({name: {"methods": ..., ...}}) tests use, persisted as JSON.
+    """
+
+    def __init__(self, path_obj: Path = IMPACT_MAP):
+        self.path = Path(path_obj)
+        self.tests = {}
+        self.footprints = {}
+        if self.path.exists():
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+            self.tests = payload.get("tests", {})
+            self.footprints = payload.get("footprints", {})
+
+    def update(self, nodeid: str, touched: dict, merge: bool = False):
+        """
+        Store what a test touched; merge keeps earlier entries
+        (e.g. for a test that failed part-way).
+        """
+        if merge and nodeid in self.tests:
+            earlier = self.tests[nodeid]
+            touched = {
+                kind: sorted(set(touched[kind]) | set(earlier.get(kind, ()))) for kind in touched
+            }
+        self.tests[nodeid] = touched
+
+    def expanded(self) -> dict:
+        """
+        {nodeid: touched} with the footprints each test uses merged in,
+        or None for a test using a footprint that was never recorded.
+        """
+        tests = {}
+        for nodeid, touched in self.tests.items():
+            uses = touched.get("uses", ())
+            if any(name not in self.footprints for name in uses):
+                tests[nodeid] = None
+                continue
+            merged = {kind: set(touched.get(kind, ())) for kind in ("methods", "locators", "data")}
+            for name in uses:
+                for kind, values in self.footprints[name].items():
+                    merged[kind].update(values)
+            tests[nodeid] = {kind: sorted(values) for kind, values in merged.items()}
+        return tests
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "updated": time.time(),
+            "tests": dict(sorted(self.tests.items())),
+            "footprints": dict(sorted(self.footprints.items())),
+        }
+        self.path.write_text(json.dumps(payload, indent=1), encoding="utf-8")
+
+
+def _git(args: list, cwd: Path) -> str:
+    result = subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise ValueError(f"git {' '.join(args)} failed: {result.stderr.strip()}")
+    return result.stdout
+
+
+def parse_diff(diff_text: str) -> dict:
+    """{path: {"old": [(start, count)], "new": [(start, count)]}} from `git diff --unified=0`."""
+    files = {}
+    current = None
+    old_path = None
+    for line in diff_text.splitlines():
+        if line.startswith("--- "):
+            old_path = line[6:] if line.startswith("--- a/") else None
+        elif line.startswith("+++ "):
+            path = line[6:] if line.startswith("+++ b/") else old_path
+            current = files.setdefault(path, {"old": [], "new": []})
+        elif current is not None:
+            match = _HUNK.match(line)
+            if match:
+                old_start, old_count, new_start, new_count = match.groups()
+                old_count = 1 if old_count is None else int(old_count)
+                new_count = 1 if new_count is None else int(new_count)
+                if old_count:
+                    current["old"].append((int(old_start), old_count))
+                if new_count:
+                    current["new"].append((int(new_start), new_count))
+    return files
+
+
+def function_ranges(source: str) -> list:
+    """[(first line, last line, qualname)] of every function, including decorators."""
+    ranges = []
+
+    def visit(node, prefix):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                qualname = f"{prefix}{child.name}"
+                if not isinstance(child, ast.ClassDef):
+                    first = min([child.lineno] + [d.lineno for d in child.decorator_list])
+                    ranges.append((first, child.end_lineno, qualname))
+                is_class = isinstance(child, ast.ClassDef)
+                visit(child, f"{qualname}." if is_class else f"{qualname}.<locals>.")
+
+    visit(ast.parse(source), "")
+    return ranges
+
+
+def changed_functions(source: str, hunks: list) -> set:
+    """
+    Innermost function qualnames covering the changed lines;
+    None in the set for module/class-level lines.
+    """
+    ranges = function_ranges(source) if source else []
+    changed = set()
+    for start, count in hunks:
+        for line in range(start, start + count):
+            covering = [r for r in ranges if r[0] <= line <= r[1]]
+            changed.add(max(covering, key=lambda r: r[0])[2] if covering else None)
+    return changed
+
+
+def changed_locator_keys(old_text: str, new_text: str) -> set:
+    """"section.name" for every locator added, removed or edited between two YAML texts."""
+    import yaml
+
+    old = yaml.safe_load(old_text or "") or {}
+    new = yaml.safe_load(new_text or "") or {}
+    keys = set()
+    for section in old.keys() | new.keys():
+        old_entries, new_entries = old.get(section) or {}, new.get(section) or {}
+        for name in old_entries.keys() | new_entries.keys():
+            if old_entries.get(name) != new_entries.get(name):
+                keys.add(f"{section}.{name}")
+    return keys
+
+
+def _csv_rows(text: str) -> list:
+    return list(csv.DictReader(io.StringIO(text or "")))
+
+
+def data_changed(record: str, old_text: str, new_text: str) -> bool:
+    """Whether the rows a recorded lookup ("column=value" or "*") read differ between two CSVs."""
+    old_rows, new_rows = _csv_rows(old_text), _csv_rows(new_text)
+    if record == "*":
+        return old_rows != new_rows
+    column, _, value = record.partition("=")
+    def matching(rows):
+        return [r for r in rows if r.get(column) == value]
+
+    return matching(old_rows) != matching(new_rows)
+
+
+def select_impacted(impact_map: ImpactMap, ref: str, cwd: Path = E2E_ROOT) -> dict:
+    """
+    Tests affected by changes since ref (committed, staged, unstaged and untracked):
+    - "all": True when a change cannot be mapped to tests (utils/, conftest.py, config, ...)
+    - "files": test files that changed themselves (every test in them runs)
+    - "tests": {nodeid: reason} for recorded tests touching a changed method, locator or data row
+    Tests missing from the map are always run by the caller; tests using a footprint
+    that was never recorded are always selected.
+    """
+    def old_text(path):
+        try:
+            return _git(["show", f"{ref}:./{path}"], cwd)
+        except ValueError:
+            return ""
+
+    def new_text(path):
+        path_obj = cwd / path
+        return path_obj.read_text(encoding="utf-8") if path_obj.exists() else ""
+
+    diff = parse_diff(
+        _git(["diff", "--relative", "--unified=0", "--no-color", "--no-ext-diff", ref, "--"], cwd)
+    )
+    for path in _git(["ls-files", "--others", "--exclude-standard"], cwd).splitlines():
+        # Untracked files are new in full
+        diff.setdefault(path, {"old": [], "new": [(1, max(1, len(new_text(path).splitlines())))]})
+
+    selection = {"all": False, "files": [], "tests": {}, "reasons": []}
+
+    def select(nodeid, reason):
+        selection["tests"].setdefault(nodeid, reason)
+
+    tests = {}
+    for nodeid, touched in impact_map.expanded().items():
+        if touched is None:
+            select(nodeid, "uses a shared footprint that was never recorded")
+        else:
+            tests[nodeid] = touched
+
+    for path, hunks in sorted(diff.items()):
+        path_obj = Path(path)
+        top = path_obj.parts[0]
+        if path_obj.suffix in _IGNORED_SUFFIXES:
+            continue
+        if top == "tests" and path_obj.name.startswith("test_") and path_obj.suffix == ".py":
+            selection["files"].append(path)
+        elif top == "pages" and path_obj.suffix == ".py":
+            try:
+                names = (
+                    changed_functions(old_text(path), hunks["old"])
+                    | changed_functions(new_text(path), hunks["new"])
+                )
+            except SyntaxError:
+                names = {None}
+            prefix = f"{path}::"
+            for nodeid, touched in tests.items():
+                for method in touched.get("methods", ()):
+                    name = method[len(prefix):]
+                    if method.startswith(prefix) and (None in names or name in names):
+                        select(nodeid, f"{method} changed")
+                        break
+        elif top == "locators" and path_obj.suffix in (".yaml", ".yml"):
+            keys = changed_locator_keys(old_text(path), new_text(path))
+            for nodeid, touched in tests.items():
+                hit = sorted(keys & set(touched.get("locators", ())))
+                if hit:
+                    select(nodeid, f"locator {hit[0]} changed")
+        elif path_obj.suffix == ".csv":
+            before, after = old_text(path), new_text(path)
+            prefix = f"{path}::"
+            for nodeid, touched in tests.items():
+                for record in touched.get("data", ()):
+                    lookup = record[len(prefix):]
+                    if record.startswith(prefix) and data_changed(lookup, before, after):
+                        select(nodeid, f"test data {record} changed")
+                        break
+        else:
+            selection["all"] = True
+            selection["reasons"].append(f"{path} changed (not mapped to tests)")
+    return selection
+
+
+class ImpactPlugin:
+    """
+    - Records what every test touches (setup through teardown) into its user_properties,
+      plus any shared footprints recorded meanwhile
+    - The controller merges them into .cache/impact_map.json at the end of the run
+    - With a selection from select_impacted(), deselects recorded tests that no change affects
+    """
+
+    def __init__(self, config, map_path: Path = IMPACT_MAP, selection: dict = None,
+                 ref: str = None):
+        self.config = config
+        self.is_worker = is_worker(config)
+        self.map_path = map_path
+        self.selection = selection
+        self.ref = ref
+        self.ran = {}
+        self.touched = {}
+        self.footprints = {}
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_collection_modifyitems(self, config, items):
+        if self.selection is None or self.selection["all"]:
+            return
+        known = ImpactMap(self.map_path).tests
+        files = set(self.selection["files"])
+        keep = [
+            item for item in items
+            if item.nodeid not in known or item.nodeid in self.selection["tests"]
+            or item.nodeid.split("::")[0] in files
+        ]
+        if len(keep) < len(items):
+            kept_ids = {item.nodeid for item in keep}
+            deselected = [item for item in items if item.nodeid not in kept_ids]
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = keep
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item):
+        ImpactRecorder.start()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item):
+        yield
+        # Appended before the teardown report is built, so it reaches the xdist controller
+        item.user_properties.append(("impact", ImpactRecorder.stop()))
+        if ImpactRecorder.footprints:
+            item.user_properties.append(("impact_footprints", ImpactRecorder.footprints))
+            ImpactRecorder.footprints = {}
+
+    def pytest_runtest_logreport(self, report):
+        if self.is_worker:
+            return
+        if report.when == "call":
+            self.ran[report.nodeid] = report.outcome
+        elif report.when == "teardown":
+            for name, value in report.user_properties:
+                if name == "impact" and report.nodeid in self.ran:
+                    self.touched[report.nodeid] = (value, self.ran[report.nodeid] != "passed")
+                elif name == "impact_footprints":
+                    self.footprints.update(value)
+
+    def pytest_sessionfinish(self, session):
+        if self.is_worker or not (self.touched or self.footprints):
+            return
+        impact_map = ImpactMap(self.map_path)
+        for nodeid, (touched, partial) in self.touched.items():
+            impact_map.update(nodeid, touched, merge=partial)
+        impact_map.footprints.update(self.footprints)
+        impact_map.save()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.is_worker or self.selection is None:
+            return
+        terminalreporter.write_sep("-", f"test impact (changed since {self.ref})")
+        if self.selection["all"]:
+            for reason in self.selection["reasons"]:
+                terminalreporter.write_line(f"running everything: {reason}")
+            return
+        for path in self.selection["files"]:
+            terminalreporter.write_line(f"{path}: test file changed")
+        for nodeid, reason in sorted(self.selection["tests"].items()):
+            terminalreporter.write_line(f"{nodeid}: {reason}")
+        if not self.selection["files"] and not self.selection["tests"]:
+            terminalreporter.write_line(
+                "no recorded test is affected; only tests missing from the impact map ran"
+            )
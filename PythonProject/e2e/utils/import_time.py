@@ -0,0 +1,62 @@
+"""
+Parse `python -X importtime` output into a startup cost report
+"""
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def parse_importtime(stderr: str) -> list:
+    """[(module, self_us, cumulative_us, depth)] in the order Python reported them."""
+    rows = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return rows
+
+
+def top_level_packages(rows: list) -> dict:
+    """Total self time (us) per top-level package, e.g. 'playwright' or 'allure_commons'."""
+    totals = defaultdict(int)
+    for module, self_us, _, _ in rows:
+        totals[module.split(".")[0]] += self_us
+    return dict(totals)
+
+
+def measure_startup(pytest_args: list, cwd=None) -> dict:
+    """Run `pytest --collect-only` under -X importtime and summarize where the startup time goes."""
+    cmd = [sys.executable, "-X", "importtime", "-m", "pytest", "--collect-only", "-q", *pytest_args]
+    started = time.perf_counter()
+    result = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True)
+    wall = time.perf_counter() - started
+    rows = parse_importtime(result.stderr)
+    return {
+        "command": cmd,
+        "returncode": result.returncode,
+        "wall_seconds": wall,
+        "import_seconds": sum(row[1] for row in rows) / 1e6,
+        "modules": rows,
+        "packages": top_level_packages(rows),
+    }
+
+
+def format_report(report: dict, top: int = 25) -> str:
+    lines = [
+        f"collect-only wall time {report['wall_seconds']:.2f}s, "
+        f"of which imports {report['import_seconds']:.2f}s ({len(report['modules'])} modules)",
+        "",
+        f"{'package':<40} {'self ms':>9}",
+    ]
+    for package, self_us in sorted(report["packages"].items(), key=lambda kv: -kv[1])[:top]:
+        lines.append(f"{package:<40} {self_us / 1000:>9.1f}")
+    lines += ["", f"{'module (cumulative)':<60} {'cum ms':>9} {'self ms':>9}"]
+    slowest = sorted(report["modules"], key=lambda row: -row[2])[:top]
+    for module, self_us, cumulative_us, _ in slowest:
+        lines.append(f"{module:<60} {cumulative_us / 1000:>9.1f} {self_us / 1000:>9.1f}")
+    return "\n".join(lines)
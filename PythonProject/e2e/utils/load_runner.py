@@ -0,0 +1,176 @@
+"""
+Browser-level load generation with page objects driving virtual users
+"""
+import asyncio
+import math
+import multiprocessing
+import random
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+
+from playwright.async_api import async_playwright
+
+from .stats import summarize
+
+# Pseudo-step recording a whole scenario run (one virtual-user arrival)
+SCENARIO_STEP = "scenario"
+
+
+class VirtualUser:
+    """
+    One arrival: a fresh browser context and page plus a step timer.
+    Scenarios are coroutines taking a VirtualUser, e.g.:
+        async def login(user):
+            page = AsyncLoginPage(user.page)
+            async with user.step("open_login"):
+                await page.navigate_to(user.base_url)
+    A failing step is recorded and ends the scenario; later steps are not run.
+    """
+
+    def __init__(self, page, base_url: str, credentials: tuple, rows: list):
+        self.page = page
+        self.base_url = base_url
+        self.credentials = credentials
+        self._rows = rows
+
+    @asynccontextmanager
+    async def step(self, name: str):
+        began = time.time()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self._rows.append(
+                {"step": name, "start": began, "seconds": time.time() - began, "ok": ok}
+            )
+
+
+def _error_text(error: Exception) -> str:
+    message = str(error).strip().splitlines()
+    return f"{type(error).__name__}: {message[0] if message else ''}"[:200]
+
+
+async def _virtual_user(browser, slots, scenario, options, rows, scheduled):
+    loop = asyncio.get_running_loop()
+    async with slots:
+        # Time spent waiting for a free virtual-user slot;
+        # grows when the target rate is not sustainable
+        queued = loop.time() - scheduled
+        began = time.time()
+        error = None
+        context = None
+        try:
+            # A context that cannot be created is this virtual user's failure, not the worker's
+            context = await browser.new_context()
+            context.set_default_timeout(options["timeout_ms"])
+            page = await context.new_page()
+            user = VirtualUser(page, options["base_url"], options["credentials"], rows)
+            await scenario(user)
+        except Exception as e:
+            error = _error_text(e)
+        finally:
+            if context is not None:
+                await context.close()
+        rows.append({
+            "step": SCENARIO_STEP, "start": began, "seconds": time.time() - began,
+            "ok": error is None, "error": error, "queued": queued,
+        })
+
+
+async def _run_process(scenario, options: dict) -> list:
+    rows = []
+    rng = random.Random(options["seed"])
+    loop = asyncio.get_running_loop()
+    async with async_playwright() as playwright:
+        browser = await getattr(playwright, options["browser"]).launch(headless=options["headless"])
+        slots = asyncio.Semaphore(options["users"])
+        tasks = []
+        start = next_arrival = loop.time()
+        while next_arrival < start + options["duration"]:
+            await asyncio.sleep(max(0.0, next_arrival - loop.time()))
+            user = _virtual_user(browser, slots, scenario, options, rows, next_arrival)
+            tasks.append(asyncio.create_task(user))
+            if options["poisson"]:
+                next_arrival += rng.expovariate(options["rate"])
+            else:
+                next_arrival += 1 / options["rate"]
+        await asyncio.gather(*tasks)
+        await browser.close()
+    return rows
+
+
+def _process_main(scenario, options: dict) -> list:
+    return asyncio.run(_run_process(scenario, options))
+
+
+def run_load(scenario, base_url: str, credentials: tuple, rate: float, duration: float,
+             users: int, processes: int = 1, browser: str = "chromium", headless: bool = True,
+             timeout_ms: int = 10000, poisson: bool = False, seed: int = None) -> list:
+    """
+    Run `scenario` as an open workload: virtual users arrive at `rate` per second
+    (evenly spaced, or exponentially with poisson=True) for `duration` seconds.
+    - Arrivals and the `users` concurrency cap are split across `processes`
+      worker processes, each with one browser and one context per virtual user
+    - Returns the raw step rows; see summarize_load()
+    """
+    processes = max(1, processes)
+    per_process = {
+        "base_url": base_url,
+        "credentials": credentials,
+        "rate": rate / processes,
+        "duration": duration,
+        "users": max(1, math.ceil(users / processes)),
+        "browser": browser,
+        "headless": headless,
+        "timeout_ms": timeout_ms,
+        "poisson": poisson,
+    }
+    seed = random.randrange(2 ** 32) if seed is None else seed
+    # spawn: Playwright's driver does not survive being forked
+    with ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = [
+            pool.submit(_process_main, scenario, {**per_process, "seed": seed + index})
+            for index in range(processes)
+        ]
+        return [row for future in futures for row in future.result()]
+
+
+def summarize_load(rows: list, target_rate: float = None) -> dict:
+    """
+    Per-step throughput (successful steps per second over the measured window),
+    error rate and latency percentiles (ms), plus scenario queueing delay and the
+    most common errors.
+    """
+    if not rows:
+        return {"window_seconds": 0.0, "target_rate": target_rate, "achieved_rate": 0.0,
+                "queued_ms": summarize([]), "steps": {}, "errors": {}}
+    window = max(row["start"] + row["seconds"] for row in rows) - min(row["start"] for row in rows)
+    window = max(window, 1e-9)
+    by_step = defaultdict(list)
+    for row in rows:
+        by_step[row["step"]].append(row)
+
+    steps = {}
+    for name, step_rows in by_step.items():
+        passed = [row for row in step_rows if row["ok"]]
+        steps[name] = {
+            "count": len(step_rows),
+            "errors": len(step_rows) - len(passed),
+            "error_rate": (len(step_rows) - len(passed)) / len(step_rows),
+            "throughput_per_s": len(passed) / window,
+            "latency_ms": summarize(row["seconds"] * 1000 for row in passed),
+        }
+    scenario_rows = by_step.get(SCENARIO_STEP, [])
+    return {
+        "window_seconds": window,
+        "target_rate": target_rate,
+        "achieved_rate": len(scenario_rows) / window,
+        "queued_ms": summarize(row["queued"] * 1000 for row in scenario_rows),
+        "steps": steps,
+        "errors": dict(
+            Counter(row["error"] for row in scenario_rows if row["error"]).most_common(10)
+        ),
+    }
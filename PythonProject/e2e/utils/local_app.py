@@ -0,0 +1,332 @@
+"""
+Local stand-in for the application under test (login + inventory pages)
+"""
+import html
+import json
+import re
+import secrets
+import threading
+import time
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from .file_utils import FileUtils
+from .locator_registry import LocatorRegistry
+
+DEFAULT_USERS = {"standard_user": "secret_sauce"}
+LOCKED_OUT_USERS = {"locked_out_user"}
+SESSION_COOKIE = "session-username"
+
+# Extra pages/JSON endpoints served by the mock_app fixture (see LocalApp.load_spec)
+MOCK_APP_SPEC = Path(__file__).resolve().parent.parent / "resources" / "mock_app.yaml"
+
+INVENTORY_ITEMS = [
+    {"id": 4, "name": "Sauce Labs Backpack", "price": 29.99},
+    {"id": 0, "name": "Sauce Labs Bike Light", "price": 9.99},
+    {"id": 1, "name": "Sauce Labs Bolt T-Shirt", "price": 15.99},
+    {"id": 5, "name": "Sauce Labs Fleece Jacket", "price": 49.99},
+    {"id": 2, "name": "Sauce Labs Onesie", "price": 7.99},
+    {"id": 3, "name": "Test.allTheThings() T-Shirt (Red)", "price": 15.99},
+]
+
+_SELECTOR_PART = re.compile(
+    r"#([\w-]+)|\.([\w-]+)|\[([\w-]+)(?:=(?:'([^']*)'|\"([^\"]*)\"|([^\]]*)))?\]"
+)
+
+_LOGIN_SCRIPT = """
+document.querySelector("form").addEventListener("submit", async (event) => {
+    event.preventDefault();
+    const form = event.target;
+    const error = document.querySelector("[data-e2e-role='error']");
+    const response = await fetch("/api/login", {
+        method: "POST",
+        headers: {"Content-Type": "application/json"},
+        body: JSON.stringify({
+            username: form.elements.username.value,
+            password: form.elements.password.value,
+        }),
+    });
+    const body = await response.json();
+    if (response.ok) {
+        location.href = body.redirect;
+    } else {
+        error.textContent = body.error;
+        error.hidden = false;
+    }
+});
+"""
+
+
+def element_attributes(selector: str) -> dict:
+    """
+    Attributes an element needs to match a simple CSS selector:
+    '#id', '.class', "[attr='value']" and combinations of them (an optional
+    leading tag name is ignored). Anything more complex raises ValueError.
+    """
+    rest = re.sub(r"^[a-zA-Z][\w-]*", "", selector.strip())
+    attrs = {}
+    position = 0
+    for match in _SELECTOR_PART.finditer(rest):
+        if match.start() != position:
+            break
+        position = match.end()
+        element_id, css_class, name = match.group(1), match.group(2), match.group(3)
+        if element_id:
+            attrs["id"] = element_id
+        elif css_class:
+            attrs["class"] = f"{attrs.get('class', '')} {css_class}".strip()
+        else:
+            value = next((v for v in match.group(4, 5, 6) if v is not None), "")
+            attrs[name] = value
+    if position != len(rest) or not attrs:
+        raise ValueError(
+            f"Selector '{selector}' is too complex for the local app; "
+            f"use #id, .class or [attr=value]"
+        )
+    return attrs
+
+
+def _attrs_html(selector: str, **extra) -> str:
+    attrs = {**extra, **element_attributes(selector)}
+    return " ".join(f'{name}="{html.escape(str(value))}"' for name, value in attrs.items())
+
+
+class LocalApp:
+    """
+    Threaded HTTP server imitating the login and inventory pages.
+    - Element ids/attributes come from the login_page section of the locator
+      registry, so the same page objects drive it as the real site
+    - POST /api/login checks the credentials in `users` and sets a session cookie;
+      /inventory.html redirects back to the login page without one
+    - add_page()/add_json()/load_spec() serve extra pages and JSON endpoints;
+      snapshot_routes()/restore_routes() undo per-test additions
+    - request_log records (method, path) of every request served
+    - latency_ms delays every response, to imitate a remote server
+    - Bound to a random free port unless one is given; use as a context manager
+      or call start()/stop()
+    """
+
+    def __init__(self, users: dict = None, host: str = "127.0.0.1", port: int = 0,
+                 latency_ms: float = 0, registry: LocatorRegistry = None):
+        self.users = dict(DEFAULT_USERS if users is None else users)
+        self.latency_ms = latency_ms
+        self.sessions = {}
+        self.request_log = []
+        self._lock = threading.Lock()
+        self._locators = (registry or LocatorRegistry.default()).locators("login_page")
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+        self.routes = {
+            ("GET", "/"): self._login_page,
+            ("GET", "/index.html"): self._login_page,
+            ("GET", "/inventory.html"): self._inventory_page,
+            ("GET", "/logout"): self._logout,
+            ("GET", "/api/inventory"): self._inventory_json,
+            ("POST", "/api/login"): self._login,
+        }
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "LocalApp":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="local-app", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    # --- Configuration ---
+
+    def add_page(self, path: str, markup: str, status: int = 200):
+        """Serve static HTML at path (replacing any existing GET route)."""
+        self.routes[("GET", path)] = (
+            lambda handler, _body: self._send_html(handler, markup, status)
+        )
+
+    def add_json(self, path: str, data, status: int = 200, method: str = "GET"):
+        """Serve a fixed JSON document at path for the given method."""
+        self.routes[(method.upper(), path)] = (
+            lambda handler, _body: self._send_json(handler, data, status)
+        )
+
+    def load_spec(self, path_obj: Path):
+        """
+        Add routes from a YAML file:
+            pages:
+              /about.html: "<html>...</html>"
+            json:
+              /api/health: {status: ok}
+              POST /api/orders: {id: 1}
+        """
+        spec = FileUtils.read_yaml(path_obj) or {}
+        unknown = set(spec) - {"pages", "json"}
+        if unknown:
+            raise ValueError(
+                f"Unknown section(s) {sorted(unknown)} in {path_obj}; expected 'pages' and 'json'"
+            )
+        for path, markup in (spec.get("pages") or {}).items():
+            self.add_page(path, markup)
+        for route, data in (spec.get("json") or {}).items():
+            method, _, path = route.rpartition(" ")
+            self.add_json(path, data, method=method or "GET")
+
+    def snapshot_routes(self) -> dict:
+        return dict(self.routes)
+
+    def restore_routes(self, snapshot: dict):
+        self.routes = dict(snapshot)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # --- Request handling ---
+
+    def _handler_class(self):
+        app = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                app._dispatch(self, "GET")
+
+            def do_POST(self):
+                app._dispatch(self, "POST")
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def _dispatch(self, handler, method: str):
+        path = handler.path.split("?", 1)[0]
+        with self._lock:
+            self.request_log.append((method, path))
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        route = self.routes.get((method, path))
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = handler.rfile.read(length) if length else b""
+        if route is None:
+            self._send(handler, 404, "text/plain", b"Not Found")
+            return
+        route(handler, body)
+
+    def _send(self, handler, status: int, content_type: str, payload: bytes, headers: dict = None):
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(payload)))
+        handler.send_header("Cache-Control", "no-store")
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(payload)
+
+    def _send_html(self, handler, markup: str, status: int = 200):
+        self._send(handler, status, "text/html; charset=utf-8", markup.encode("utf-8"))
+
+    def _send_json(self, handler, data, status: int = 200, headers: dict = None):
+        self._send(handler, status, "application/json", json.dumps(data).encode("utf-8"), headers)
+
+    def _redirect(self, handler, location: str, headers: dict = None):
+        self._send(handler, 302, "text/plain", b"", {"Location": location, **(headers or {})})
+
+    def _session_user(self, handler):
+        cookie = SimpleCookie(handler.headers.get("Cookie", ""))
+        token = cookie[SESSION_COOKIE].value if SESSION_COOKIE in cookie else None
+        return self.sessions.get(token)
+
+    # --- Routes ---
+
+    def _login_page(self, handler, _body):
+        loc = self._locators
+        self._send_html(handler, f"""<!DOCTYPE html>
+<html><head><title>Swag Labs</title></head>
+<body>
+<form>
+  <input {_attrs_html(loc["username_field"], name="username", type="text", placeholder="Username")}>
+  <input {_attrs_html(
+      loc["password_field"], name="password", type="password", placeholder="Password"
+  )}>
+  <h3 {_attrs_html(loc["error_message"], **{"data-e2e-role": "error"})} hidden></h3>
+  <input {_attrs_html(loc["login_button"], type="submit", value="Login")}>
+</form>
+<script>{_LOGIN_SCRIPT}</script>
+</body></html>""")
+
+    def _inventory_page(self, handler, _body):
+        if self._session_user(handler) is None:
+            self._redirect(handler, "/")
+            return
+        items = "\n".join(
+            f'  <div class="inventory_item" data-id="{item["id"]}">'
+            f'<span class="inventory_item_name">{html.escape(item["name"])}</span>'
+            f'<span class="inventory_item_price">${item["price"]:.2f}</span></div>'
+            for item in INVENTORY_ITEMS
+        )
+        self._send_html(handler, f"""<!DOCTYPE html>
+<html><head><title>Swag Labs</title></head>
+<body>
+<a {_attrs_html(self._locators["logout_button"], href="/logout")}>Logout</a>
+<div class="inventory_list">
+{items}
+</div>
+</body></html>""")
+
+    def _inventory_json(self, handler, _body):
+        if self._session_user(handler) is None:
+            self._send_json(handler, {"error": "Not logged in"}, status=401)
+            return
+        self._send_json(handler, INVENTORY_ITEMS)
+
+    def _login(self, handler, body):
+        try:
+            credentials = json.loads(body or b"{}")
+        except ValueError:
+            credentials = {}
+        username = credentials.get("username", "")
+        password = credentials.get("password", "")
+        if not username:
+            self._send_json(handler, {"error": "Epic sadface: Username is required"}, status=400)
+        elif not password:
+            self._send_json(handler, {"error": "Epic sadface: Password is required"}, status=400)
+        elif username in LOCKED_OUT_USERS:
+            self._send_json(
+                handler, {"error": "Epic sadface: Sorry, this user has been locked out."},
+                status=403,
+            )
+        elif self.users.get(username) != password:
+            self._send_json(
+                handler,
+                {"error": "Epic sadface: Username and password do not match any user "
+                          "in this service"},
+                status=401,
+            )
+        else:
+            token = secrets.token_hex(16)
+            with self._lock:
+                self.sessions[token] = username
+            self._send_json(
+                handler, {"redirect": "/inventory.html"},
+                headers={"Set-Cookie": f"{SESSION_COOKIE}={token}; Path=/; HttpOnly"},
+            )
+
+    def _logout(self, handler, _body):
+        cookie = SimpleCookie(handler.headers.get("Cookie", ""))
+        if SESSION_COOKIE in cookie:
+            with self._lock:
+                self.sessions.pop(cookie[SESSION_COOKIE].value, None)
+        self._redirect(handler, "/", {"Set-Cookie": f"{SESSION_COOKIE}=; Path=/; Max-Age=0"})
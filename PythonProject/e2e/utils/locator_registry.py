@@ -0,0 +1,88 @@
+"""
+Process-wide registry of element selectors loaded from locators/*.yaml
+"""
+from pathlib import Path
+
+from .file_utils import FileUtils
+
+LOCATORS_DIR = Path(__file__).resolve().parent.parent / "locators"
+
+
+class LocatorRegistry:
+    """
+    Loads every locator YAML file once into a validated {page: {name: selector}} map.
+    - Each file maps page sections to {locator_name: "selector"} entries
+    - A section defined in two files, or a non-string selector, is rejected at load time
+    - default() returns the shared registry for e2e/locators
+    """
+
+    _default = None
+    _by_file = {}
+    # Bumped by reset(); callers caching selectors drop them when it changes
+    generation = 0
+
+    def __init__(self, paths):
+        self.paths = [Path(p) for p in paths]
+        self._locators = {}
+        self._sources = {}
+        for path_obj in self.paths:
+            self._add_file(path_obj)
+
+    @classmethod
+    def default(cls) -> "LocatorRegistry":
+        if cls._default is None:
+            cls._default = cls(sorted(LOCATORS_DIR.glob("*.yaml")))
+        return cls._default
+
+    @classmethod
+    def for_file(cls, path_obj: Path) -> "LocatorRegistry":
+        """Registry for a single file, loaded once per process."""
+        key = str(Path(path_obj).resolve())
+        if key not in cls._by_file:
+            cls._by_file[key] = cls([path_obj])
+        return cls._by_file[key]
+
+    @classmethod
+    def reset(cls):
+        """Forget loaded registries (e.g. after editing locator files)."""
+        cls._default = None
+        cls._by_file = {}
+        cls.generation += 1
+
+    def get(self, page: str, locator_name: str) -> str:
+        try:
+            return self._locators[page][locator_name]
+        except KeyError:
+            raise ValueError(
+                f"Locator '{locator_name}' not found for page '{page}' "
+                f"in {[str(p) for p in self.paths]}"
+            ) from None
+
+    def pages(self) -> list:
+        return list(self._locators)
+
+    def locators(self, page: str) -> dict:
+        return dict(self._locators.get(page, {}))
+
+    def source_of(self, page: str) -> Path:
+        """Locator file that defines a page section."""
+        return self._sources[page]
+
+    def _add_file(self, path_obj: Path):
+        data = FileUtils.read_yaml(path_obj) or {}
+        if not isinstance(data, dict):
+            raise ValueError(f"Locator file {path_obj} must map page names to locators")
+        for page, entries in data.items():
+            if page in self._locators:
+                raise ValueError(
+                    f"Page '{page}' is defined in both {self._sources[page]} and {path_obj}"
+                )
+            if not isinstance(entries, dict):
+                raise ValueError(f"Page '{page}' in {path_obj} must map locator names to selectors")
+            for name, selector in entries.items():
+                if not isinstance(selector, str) or not selector.strip():
+                    raise ValueError(
+                        f"Locator '{page}.{name}' in {path_obj} must be a non-empty selector string"
+                    )
+            self._locators[page] = dict(entries)
+            self._sources[page] = path_obj
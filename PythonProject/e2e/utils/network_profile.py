@@ -0,0 +1,150 @@
+"""
+Network profiles that block or stub resources a functional test does not need
+"""
+import re
+from collections import Counter
+
+from playwright.sync_api import BrowserContext, Route, Error as PlaywrightError
+
+# Analytics beacons, tag managers and error reporters seen on typical apps
+TRACKER_URL_PATTERNS = (
+    r"google-analytics\.com",
+    r"googletagmanager\.com",
+    r"doubleclick\.net",
+    r"connect\.facebook\.net",
+    r"segment\.(io|com)",
+    r"hotjar\.com",
+    r"mixpanel\.com",
+    r"clarity\.ms",
+    r"fullstory\.com",
+    r"nr-data\.net",
+    r"backtrace\.io",
+    r"sentry\.io",
+)
+
+class NetworkStats:
+    """
+    What a profile blocked during one test, as request counts per resource type.
+    Blocked responses are never downloaded, so no byte figure is claimed for them.
+    """
+
+    def __init__(self, profile_name: str):
+        self.profile_name = profile_name
+        self.aborted = Counter()
+        self.stubbed = Counter()
+
+    def record(self, outcome: Counter, request):
+        outcome[request.resource_type] += 1
+
+    @property
+    def blocked(self) -> int:
+        return sum(self.aborted.values()) + sum(self.stubbed.values())
+
+    def as_dict(self) -> dict:
+        return {
+            "profile": self.profile_name,
+            "blocked_requests": self.blocked,
+            "aborted": dict(self.aborted),
+            "stubbed": dict(self.stubbed),
+        }
+
+
+class NetworkProfile:
+    """
+    A set of rules installed as a single context route.
+    - abort_resource_types: Playwright resource types to abort (image, font, media, ...)
+    - stub_url_patterns: regexes answered locally with an empty 204/JS response
+    - Everything else falls through to other routes (e.g. HAR replay) or the network
+
+    Note that Playwright disables the HTTP cache for routed contexts; a profile
+    only pays off when it blocks more than the cache would have saved.
+    """
+
+    def __init__(self, name: str, abort_resource_types=(), stub_url_patterns=()):
+        self.name = name
+        self.abort_resource_types = frozenset(abort_resource_types)
+        self.stub_url_pattern = (
+            re.compile("|".join(stub_url_patterns)) if stub_url_patterns else None
+        )
+
+    @property
+    def is_full_fidelity(self) -> bool:
+        return not self.abort_resource_types and self.stub_url_pattern is None
+
+    def install(self, context: BrowserContext) -> "InstalledProfile":
+        return InstalledProfile(self, context)
+
+
+class InstalledProfile:
+    """Handle for a profile installed on a context; uninstall() removes it again."""
+
+    def __init__(self, profile: NetworkProfile, context: BrowserContext):
+        self.profile = profile
+        self.context = context
+        self.stats = NetworkStats(profile.name)
+        # Full fidelity needs no route at all (routing disables the HTTP cache)
+        if not profile.is_full_fidelity:
+            context.route("**/*", self._handle)
+
+    def uninstall(self):
+        if self.profile.is_full_fidelity:
+            return
+        try:
+            self.context.unroute("**/*", self._handle)
+        except PlaywrightError:
+            # Context already closed
+            pass
+
+    def _handle(self, route: Route):
+        request = route.request
+        profile = self.profile
+        if profile.stub_url_pattern is not None and profile.stub_url_pattern.search(request.url):
+            self.stats.record(self.stats.stubbed, request)
+            if request.resource_type == "script":
+                route.fulfill(status=200, content_type="application/javascript", body="")
+            else:
+                route.fulfill(status=204, body="")
+        elif request.resource_type in profile.abort_resource_types:
+            self.stats.record(self.stats.aborted, request)
+            route.abort("blockedbyclient")
+        else:
+            route.fallback()
+
+
+PROFILES = {
+    "full": NetworkProfile("full"),
+    "lean": NetworkProfile("lean", abort_resource_types=("image", "font", "media")),
+    "aggressive": NetworkProfile(
+        "aggressive",
+        abort_resource_types=("image", "font", "media", "texttrack", "eventsource", "manifest"),
+        stub_url_patterns=TRACKER_URL_PATTERNS,
+    ),
+}
+
+
+def resolve_profile_name(item, cli_profile: str = None, marker_defaults: dict = None) -> str:
+    """
+    Pick the profile for a test.
+    1. @pytest.mark.network_profile("name") on the test
+    2. marker_defaults entries that must keep full fidelity (e.g. ui -> full)
+    3. --network-profile from the command line
+    4. the remaining marker_defaults (e.g. smoke -> aggressive)
+    5. "full"
+    """
+    marker = item.get_closest_marker("network_profile")
+    if marker and marker.args:
+        name = marker.args[0]
+    else:
+        defaults = marker_defaults or {}
+        matched = [profile for mark, profile in defaults.items() if item.get_closest_marker(mark)]
+        if "full" in matched:
+            name = "full"
+        elif cli_profile:
+            name = cli_profile
+        elif matched:
+            name = matched[0]
+        else:
+            name = "full"
+    if name not in PROFILES:
+        raise ValueError(f"Unknown network profile '{name}'; available: {sorted(PROFILES)}")
+    return name
@@ -0,0 +1,88 @@
+"""
+Video and trace recording that keeps artifacts only for failing tests
+"""
+import shutil
+import tempfile
+from pathlib import Path
+
+from playwright.sync_api import Browser, Error as PlaywrightError
+
+RECORD_MODES = ("off", "on", "retain-on-failure")
+
+
+class RecordingPolicy:
+    """
+    Video/trace modes for one test.
+    @pytest.mark.record(video="retain-on-failure", trace="on") overrides the
+    command-line defaults (--record-video / --record-trace) per test or module.
+    """
+
+    def __init__(self, video: str = "off", trace: str = "off"):
+        for kind, mode in (("video", video), ("trace", trace)):
+            if mode not in RECORD_MODES:
+                raise ValueError(
+                    f"Unknown {kind} recording mode '{mode}'; expected one of {RECORD_MODES}"
+                )
+        self.video = video
+        self.trace = trace
+
+    @classmethod
+    def for_item(cls, item, default_video: str, default_trace: str) -> "RecordingPolicy":
+        marker = item.get_closest_marker("record")
+        kwargs = marker.kwargs if marker else {}
+        return cls(kwargs.get("video", default_video), kwargs.get("trace", default_trace))
+
+    @property
+    def active(self) -> bool:
+        return self.video != "off" or self.trace != "off"
+
+    def keep(self, mode: str, failed: bool) -> bool:
+        return mode == "on" or (mode == "retain-on-failure" and failed)
+
+
+class Recorder:
+    """
+    Owns a recording context for one test.
+    finish() stops tracing and closes the context; artifacts the policy does not
+    keep are discarded immediately (a passing trace is never written at all).
+    """
+
+    def __init__(self, browser: Browser, context_args: dict, policy: RecordingPolicy,
+                 tmp_root: Path = None):
+        self.policy = policy
+        if tmp_root is not None:
+            Path(tmp_root).mkdir(parents=True, exist_ok=True)
+        self.tmp_dir = Path(tempfile.mkdtemp(prefix="recording-", dir=tmp_root))
+        args = dict(context_args)
+        if policy.video != "off":
+            args["record_video_dir"] = str(self.tmp_dir)
+        self.context = browser.new_context(**args)
+        if policy.trace != "off":
+            self.context.tracing.start(screenshots=True, snapshots=True, sources=True)
+
+    def finish(self, failed: bool) -> list:
+        """Returns [(kind, path)] for the artifacts to keep; cleanup() when nothing was kept."""
+        kept = []
+        if self.policy.trace != "off":
+            if self.policy.keep(self.policy.trace, failed):
+                trace_path = self.tmp_dir / "trace.zip"
+                self.context.tracing.stop(path=trace_path)
+                kept.append(("trace", trace_path))
+            else:
+                self.context.tracing.stop()
+
+        videos = [page.video for page in self.context.pages if page.video]
+        self.context.close()
+        keep_video = self.policy.keep(self.policy.video, failed)
+        for video in videos:
+            try:
+                if keep_video:
+                    kept.append(("video", Path(video.path())))
+                else:
+                    video.delete()
+            except PlaywrightError:
+                pass
+        return kept
+
+    def cleanup(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
@@ -0,0 +1,186 @@
+"""
+Duration regression detection against each test's and action's rolling baseline
+"""
+import json
+import math
+import statistics
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+
+import pytest
+
+from e2e.constants import (
+    HISTORY_MIN_RUNS, HISTORY_WINDOW, REGRESSION_MIN_DELTA_MS, REGRESSION_THRESHOLD,
+    REGRESSION_Z_SCORE,
+)
+from .history import RunHistory, run_id_key
+from .workers import is_worker
+
+# Scales the median absolute deviation to a standard deviation for normal data
+_MAD_TO_SIGMA = 1.4826
+
+
+def robust_z(value: float, baseline: list) -> float:
+    """How many robust standard deviations (median/MAD) value lies above the baseline."""
+    median = statistics.median(baseline)
+    mad = statistics.median(abs(x - median) for x in baseline) * _MAD_TO_SIGMA
+    if mad == 0:
+        return float("inf") if value > median else 0.0
+    return (value - median) / mad
+
+
+def check_regression(value_ms: float, baseline_ms: list,
+                     threshold: float = REGRESSION_THRESHOLD,
+                     z_score: float = REGRESSION_Z_SCORE,
+                     min_delta_ms: float = REGRESSION_MIN_DELTA_MS,
+                     min_runs: int = HISTORY_MIN_RUNS) -> dict | None:
+    """
+    Regression details when value_ms is significantly slower than the baseline, else None:
+    - at least min_runs baseline values
+    - slower than the baseline median by more than threshold (relative) and min_delta_ms (absolute)
+    - robust z-score above z_score, so tests that are noisy anyway do not trip it
+    """
+    if len(baseline_ms) < min_runs:
+        return None
+    median = statistics.median(baseline_ms)
+    change = (value_ms - median) / median if median else 0.0
+    z = robust_z(value_ms, baseline_ms)
+    if change <= threshold or value_ms - median < min_delta_ms or z <= z_score:
+        return None
+    # z is None when the baseline has no spread at all
+    return {
+        "current_ms": value_ms, "baseline_ms": median, "change": change,
+        "z": None if math.isinf(z) else z, "runs": len(baseline_ms),
+    }
+
+
+def action_medians(metrics_dir: Path) -> dict:
+    """{(nodeid, "Page.action"): (median ms, calls)} from this run's actions-*.jsonl files."""
+    samples = defaultdict(list)
+    for path_obj in Path(metrics_dir).glob("actions-*.jsonl"):
+        with open(path_obj, encoding="utf-8") as f:
+            for line in f:
+                row = json.loads(line)
+                if row["ok"] and row["nodeid"]:
+                    samples[(row["nodeid"], f"{row['page']}.{row['action']}")].append(row["ms"])
+    return {key: (statistics.median(values), len(values)) for key, values in samples.items()}
+
+
+def find_regressions(history: RunHistory, run_id: int, window: int = HISTORY_WINDOW,
+                     **criteria) -> list:
+    """
+    Tests (passing durations) and page-object actions of run_id
+    that regressed against earlier runs.
+    """
+    regressions = []
+    baselines = history.recent(window, before_run=run_id)
+    for nodeid, (outcome, duration) in sorted(history.run_results(run_id).items()):
+        baseline = [d * 1000 for o, d in baselines.get(nodeid, ()) if o == "passed"]
+        found = outcome == "passed" and check_regression(duration * 1000, baseline, **criteria)
+        if found:
+            regressions.append({"kind": "test", "nodeid": nodeid, "name": nodeid, **found})
+    action_baselines = history.action_baselines(run_id, window)
+    for (nodeid, action), ms in sorted(history.action_timings(run_id).items()):
+        found = check_regression(ms, action_baselines.get((nodeid, action), []), **criteria)
+        if found:
+            regressions.append(
+                {"kind": "action", "nodeid": nodeid, "name": f"{nodeid} {action}", **found}
+            )
+    return regressions
+
+
+def write_allure_result(alluredir: Path, regressions: list, checked: int, failed: bool):
+    """A synthetic allure test result summarizing the regression check, details attached."""
+    alluredir = Path(alluredir)
+    alluredir.mkdir(parents=True, exist_ok=True)
+    attachment = f"{uuid.uuid4()}-attachment.json"
+    (alluredir / attachment).write_text(json.dumps(regressions, indent=2), encoding="utf-8")
+    lines = [
+        f"{r['name']}: {r['baseline_ms']:.0f} ms -> {r['current_ms']:.0f} ms ({r['change']:+.0%})"
+        for r in regressions
+    ]
+    now = int(time.time() * 1000)
+    result = {
+        "uuid": str(uuid.uuid4()),
+        "historyId": "e2e-duration-regressions",
+        "name": "Duration regressions",
+        "fullName": "e2e.duration_regressions",
+        "status": ("failed" if failed else "broken") if regressions else "passed",
+        "stage": "finished",
+        "description": (
+            "\n".join(lines) or f"No regressions among {checked} timed tests and actions"
+        ),
+        "start": now,
+        "stop": now,
+        "labels": [
+            {"name": "suite", "value": "performance"},
+            {"name": "feature", "value": "duration regressions"},
+        ],
+        "attachments": [{"name": "regressions", "source": attachment, "type": "application/json"}],
+    }
+    result_path = alluredir / f"{result['uuid']}-result.json"
+    result_path.write_text(json.dumps(result, indent=2), encoding="utf-8")
+
+
+class RegressionPlugin:
+    """
+    At the end of a run (controller only, after HistoryPlugin stored it):
+    - stores this run's per-test action medians (from metrics_dir) next to the test results
+    - compares test durations and action timings with their rolling baselines
+    - reports regressions in the terminal and as an allure result
+    - with fail_on_regression, turns a passing run into a failed one
+    """
+
+    def __init__(self, config, history_path: Path, metrics_dir: Path = None,
+                 threshold: float = REGRESSION_THRESHOLD, fail_on_regression: bool = False):
+        self.config = config
+        self.is_worker = is_worker(config)
+        self.history_path = history_path
+        # None when action timing is off, so an earlier run's JSONL is not mistaken for this one's
+        self.metrics_dir = metrics_dir
+        self.threshold = threshold
+        self.fail_on_regression = fail_on_regression
+        self.regressions = None
+        self.checked = 0
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session):
+        run_id = self.config.stash.get(run_id_key, None)
+        if self.is_worker or run_id is None:
+            return
+        history = RunHistory(self.history_path)
+        try:
+            timings = action_medians(self.metrics_dir) if self.metrics_dir is not None else {}
+            history.record_action_timings(run_id, timings)
+            self.checked = len(history.run_results(run_id)) + len(timings)
+            self.regressions = find_regressions(history, run_id, threshold=self.threshold)
+        finally:
+            history.close()
+        alluredir = self.config.getoption("allure_report_dir", None)
+        if alluredir:
+            write_allure_result(
+                Path(alluredir), self.regressions, self.checked, self.fail_on_regression
+            )
+        failing = self.regressions and self.fail_on_regression
+        if failing and session.exitstatus == pytest.ExitCode.OK:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.is_worker or not self.regressions:
+            return
+        terminalreporter.write_sep(
+            "-", f"duration regressions (> {self.threshold:.0%} over rolling baseline)"
+        )
+        terminalreporter.write_line(
+            f"{'test / action':<80} {'baseline ms':>12} {'now ms':>9} {'change':>8} {'z':>6}"
+        )
+        for r in sorted(self.regressions, key=lambda r: -r["change"]):
+            z = "inf" if r["z"] is None else f"{r['z']:.1f}"
+            terminalreporter.write_line(
+                f"{r['name']:<80} {r['baseline_ms']:>12.0f} {r['current_ms']:>9.0f} "
+                f"{r['change'] * 100:>+7.0f}% {z:>6}"
+            )
+        if self.fail_on_regression:
+            terminalreporter.write_line("failing the run: --fail-on-regression")
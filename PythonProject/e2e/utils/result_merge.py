@@ -0,0 +1,102 @@
+"""
+Merge allure-results, JUnit XML and duration history produced by several shards
+(standard library only: the CI merge job runs it without requirements.txt installed)
+"""
+import json
+import shutil
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from .file_utils import FileUtils
+
+# Allure files describing the whole run rather than a single test; first shard wins
+_RUN_LEVEL_ALLURE_FILES = {"environment.properties", "categories.json", "executor.json"}
+
+_JUNIT_COUNTERS = ("tests", "failures", "errors", "skipped")
+
+
+def merge_allure_results(source_dirs, dest_dir: Path) -> int:
+    """Copy every shard's allure-results into dest_dir; returns the number of files copied."""
+    dest_dir = Path(dest_dir)
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    copied = 0
+    for source_dir in source_dirs:
+        for path_obj in Path(source_dir).iterdir():
+            target = dest_dir / path_obj.name
+            if path_obj.name in _RUN_LEVEL_ALLURE_FILES and target.exists():
+                continue
+            if path_obj.is_file():
+                shutil.copy2(path_obj, target)
+                copied += 1
+    return copied
+
+
+def merge_junit(source_files, dest_file: Path) -> dict:
+    """Combine JUnit XML files into one <testsuites> document; returns the summed counters."""
+    merged = ET.Element("testsuites")
+    totals = dict.fromkeys(_JUNIT_COUNTERS, 0)
+    total_time = 0.0
+    for source_file in source_files:
+        root = ET.parse(source_file).getroot()
+        suites = [root] if root.tag == "testsuite" else root.findall("testsuite")
+        for suite in suites:
+            merged.append(suite)
+            for counter in _JUNIT_COUNTERS:
+                totals[counter] += int(suite.get(counter, 0))
+            total_time += float(suite.get("time", 0))
+    for counter, value in totals.items():
+        merged.set(counter, str(value))
+    merged.set("time", f"{total_time:.3f}")
+    Path(dest_file).parent.mkdir(parents=True, exist_ok=True)
+    ET.ElementTree(merged).write(dest_file, encoding="utf-8", xml_declaration=True)
+    return totals
+
+
+def _read_durations(path_obj) -> dict:
+    try:
+        return json.loads(Path(path_obj).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def merge_durations(source_files, dest_file: Path, baseline_file: Path = None) -> int:
+    """
+    Combine per-shard duration histories.
+    Every shard starts from the same restored baseline and only updates the tests
+    it ran, so a value that differs from the baseline is that shard's new observation.
+    """
+    baseline = _read_durations(baseline_file) if baseline_file else {}
+    durations = dict(baseline)
+    for source_file in source_files:
+        for nodeid, seconds in _read_durations(source_file).items():
+            if baseline.get(nodeid) != seconds:
+                durations[nodeid] = seconds
+    payload = json.dumps(durations, indent=1, sort_keys=True)
+    FileUtils.write_atomic(Path(dest_file), payload.encode("utf-8"))
+    return len(durations)
+
+
+def merge_shard_outputs(shard_dirs, output_dir: Path, baseline_durations: Path = None) -> dict:
+    """
+    Merge downloaded shard outputs into output_dir.
+    Each shard dir is searched recursively for:
+    - allure-results/ directories -> output_dir/allure-results
+    - JUnit XML files under a junit/ directory -> output_dir/junit.xml
+    - durations.json -> output_dir/durations.json (diffed against baseline_durations)
+    """
+    output_dir = Path(output_dir)
+    shard_dirs = [Path(d) for d in shard_dirs]
+    allure_dirs = [p for d in shard_dirs for p in d.rglob("allure-results") if p.is_dir()]
+    junit_files = [p for d in shard_dirs for p in d.rglob("*.xml") if p.parent.name == "junit"]
+    duration_files = [p for d in shard_dirs for p in d.rglob("durations.json")]
+
+    summary = {"shards": len(shard_dirs)}
+    if allure_dirs:
+        summary["allure_files"] = merge_allure_results(allure_dirs, output_dir / "allure-results")
+    if junit_files:
+        summary["junit"] = merge_junit(junit_files, output_dir / "junit.xml")
+    if duration_files:
+        summary["durations"] = merge_durations(
+            duration_files, output_dir / "durations.json", baseline_durations
+        )
+    return summary
@@ -0,0 +1,184 @@
+"""
+Typed test settings merged from CLI options, environment variables and .env files
+"""
+import functools
+import os
+from pathlib import Path
+
+from e2e.constants import DEFAULT_ARTIFACT_BUDGET_MB, DEFAULT_AUTH_STATE_TTL, ENV_FILE_NAME
+
+E2E_ROOT = Path(__file__).resolve().parent.parent
+ENV_TEST_PATH = E2E_ROOT / ENV_FILE_NAME
+DOTENV_PATH = E2E_ROOT / ".env"
+
+
+class SettingField:
+    """
+    One setting and where it can come from:
+    - cli: pytest option dest (e.g. base_url for --base-url)
+    - env: environment variable name, also accepted as a key in .env files
+    - file_key: lowercase key used in .env.test
+    """
+
+    def __init__(self, name: str, type_, default, env: str, file_key: str = None,
+                 cli: str = None, secret: bool = False):
+        self.name = name
+        self.type = type_
+        self.default = default
+        self.env = env
+        self.file_key = file_key or name
+        self.cli = cli
+        self.secret = secret
+
+    def convert(self, value, source: str):
+        if value is None or self.type is str:
+            return value
+        try:
+            return self.type(value)
+        except (TypeError, ValueError):
+            raise ValueError(
+                f"{self.name} from {source} must be {self.type.__name__}, got {value!r}"
+            )
+
+
+FIELDS = (
+    SettingField("base_url", str, "https://example.com", "BASE_URL", cli="base_url"),
+    SettingField("username", str, None, "TEST_USERNAME", file_key="username"),
+    SettingField("password", str, None, "TEST_PASSWORD", file_key="password", secret=True),
+    SettingField("action_timeout_ms", int, 5000, "PLAYWRIGHT_ACTION_TIMEOUT",
+                 file_key="playwright_action_timeout"),
+    SettingField("navigation_timeout_ms", int, 60000, "PLAYWRIGHT_NAVIGATION_TIMEOUT",
+                 file_key="playwright_navigation_timeout"),
+    SettingField("test_timeout_ms", int, 60000, "PLAYWRIGHT_TEST_TIMEOUT",
+                 file_key="playwright_test_timeout"),
+    SettingField("auth_state_ttl", int, DEFAULT_AUTH_STATE_TTL, "AUTH_STATE_TTL"),
+    SettingField("artifact_budget_mb", int, DEFAULT_ARTIFACT_BUDGET_MB, "ARTIFACT_BUDGET_MB",
+                 cli="artifact_budget_mb"),
+)
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_env_file(path_obj: Path, mtime_ns: int, size: int) -> dict:
+    """Parsed once per file version; mtime and size are only part of the cache key."""
+    from dotenv import dotenv_values
+
+    return {key: value for key, value in dotenv_values(path_obj).items() if value is not None}
+
+
+def read_env_file(path_obj: Path) -> dict:
+    """
+    Entries of a .env-style file ({} when it does not exist); os.environ is left untouched.
+    The file is parsed again only after it changed.
+    """
+    try:
+        stat = Path(path_obj).stat()
+    except FileNotFoundError:
+        return {}
+    return dict(_parse_env_file(Path(path_obj), stat.st_mtime_ns, stat.st_size))
+
+
+def lookup(key: str, environ=None, env_test_path: Path = ENV_TEST_PATH,
+           dotenv_path: Path = DOTENV_PATH):
+    """
+    (value, source) of a raw key: environment, then .env.test, then .env;
+    (None, None) if unset.
+    """
+    environ = os.environ if environ is None else environ
+    if environ.get(key):
+        return environ[key], f"environment ({key})"
+    for path_obj in (env_test_path, dotenv_path):
+        value = read_env_file(path_obj).get(key)
+        if value:
+            return value, f"{path_obj.name} ({key})"
+    return None, None
+
+
+class Settings:
+    """
+    Resolved test settings. Each field comes from the first source that sets it:
+    1. CLI option
+    2. Environment variable
+    3. .env.test (lowercase key or the variable name)
+    4. .env (lowercase key or the variable name)
+    5. Built-in default
+    sources records which one won, for --show-config.
+    """
+
+    base_url: str
+    username: str | None
+    password: str | None
+    action_timeout_ms: int
+    navigation_timeout_ms: int
+    test_timeout_ms: int
+    auth_state_ttl: int
+    artifact_budget_mb: int
+
+    def __init__(self, values: dict, sources: dict, env_test: dict = None):
+        for field in FIELDS:
+            setattr(self, field.name, values[field.name])
+        self.sources = dict(sources)
+        # Raw .env.test entries, kept for app_config consumers reading other keys
+        self.env_test = dict(env_test or {})
+
+    @classmethod
+    def resolve(cls, cli: dict = None, environ=None, env_test_path: Path = ENV_TEST_PATH,
+                dotenv_path: Path = DOTENV_PATH) -> "Settings":
+        cli = cli or {}
+        environ = os.environ if environ is None else environ
+        env_test = read_env_file(env_test_path)
+        dotenv = read_env_file(dotenv_path)
+        values, sources = {}, {}
+        for field in FIELDS:
+            candidates = []
+            if field.cli:
+                option = field.cli.replace("_", "-")
+                candidates.append((cli.get(field.cli), f"command line (--{option})"))
+            candidates.append((environ.get(field.env), f"environment ({field.env})"))
+            for name, entries in ((env_test_path.name, env_test), (dotenv_path.name, dotenv)):
+                for key in dict.fromkeys((field.file_key, field.env)):
+                    candidates.append((entries.get(key), f"{name} ({key})"))
+            value, source = next(
+                ((value, source) for value, source in candidates if value not in (None, "")),
+                (field.default, "default"),
+            )
+            values[field.name] = field.convert(value, source)
+            sources[field.name] = source
+        return cls(values, sources, env_test)
+
+    def to_dict(self) -> dict:
+        """JSON-serializable form, shipped to xdist workers."""
+        return {
+            "values": {field.name: getattr(self, field.name) for field in FIELDS},
+            "sources": self.sources,
+            "env_test": self.env_test,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Settings":
+        return cls(data["values"], data["sources"], data["env_test"])
+
+    def app_config(self) -> dict:
+        """
+        The app_config fixture's dict: raw .env.test entries
+        plus the resolved base_url and credentials.
+        """
+        return {
+            **self.env_test,
+            "base_url": self.base_url, "username": self.username, "password": self.password,
+        }
+
+    def describe(self) -> list:
+        """[(name, display value, source)]; secrets are masked."""
+        rows = []
+        for field in FIELDS:
+            value = getattr(self, field.name)
+            shown = "****" if field.secret and value else repr(value)
+            rows.append((field.name, shown, self.sources[field.name]))
+        return rows
+
+
+def format_settings(settings: Settings) -> str:
+    rows = settings.describe()
+    lines = [f"{'setting':<24} {'value':<36} source"]
+    lines += [f"{name:<24} {value:<36} {source}" for name, value, source in rows]
+    return "\n".join(lines)
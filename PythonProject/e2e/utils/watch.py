@@ -0,0 +1,271 @@
+"""
+Watch mode: rerun the tests affected by a change in-process, with a warm browser
+"""
+import ast
+import json
+import sys
+import time
+from pathlib import Path
+
+from .file_utils import FileUtils
+from .locator_registry import LocatorRegistry
+
+E2E_ROOT = Path(__file__).resolve().parent.parent
+WATCHED_DIRS = ("tests", "pages", "locators", "resources", "utils")
+# Top-level files whose changes rerun the whole scope
+WATCHED_FILES = ("conftest.py", "constants.py")
+_WATCHED_SUFFIXES = {".py", ".yaml", ".yml", ".csv", ".json"}
+
+# Reloaded before every in-process run so edits take effect
+_RELOADED_DIRS = ("tests", "pages", "utils")
+# Holds the warm driver and browsers between runs, so it is never reloaded
+_KEPT_MODULE = Path(__file__).resolve()
+
+
+class WarmSession:
+    """
+    Playwright driver and browsers kept alive across the in-process pytest runs of
+    watch mode. The playwright/browser fixtures use them while active, and leave
+    them running at session end.
+    """
+
+    active = False
+    _playwright = None
+    _browsers = {}
+
+    @classmethod
+    def playwright(cls):
+        if cls._playwright is None:
+            from playwright.sync_api import sync_playwright
+
+            cls._playwright = sync_playwright().start()
+        return cls._playwright
+
+    @classmethod
+    def browser(cls, browser_type, launch_args: dict):
+        """Browser for this type and launch options, relaunched if it was closed or crashed."""
+        key = (browser_type.name, json.dumps(launch_args, sort_keys=True, default=str))
+        browser = cls._browsers.get(key)
+        if browser is None or not browser.is_connected():
+            browser = cls._browsers[key] = browser_type.launch(**launch_args)
+        return browser
+
+    @classmethod
+    def close(cls):
+        for browser in cls._browsers.values():
+            if browser.is_connected():
+                browser.close()
+        cls._browsers = {}
+        if cls._playwright is not None:
+            cls._playwright.stop()
+            cls._playwright = None
+        cls.active = False
+
+
+def snapshot(root: Path = E2E_ROOT, dirs=WATCHED_DIRS, files=WATCHED_FILES) -> dict:
+    """{path: mtime_ns} of the watched files."""
+    paths = [root / name for name in files]
+    for name in dirs:
+        paths.extend(
+            path_obj for path_obj in (root / name).rglob("*")
+            if path_obj.suffix in _WATCHED_SUFFIXES and "__pycache__" not in path_obj.parts
+        )
+    mtimes = {}
+    for path_obj in paths:
+        try:
+            mtimes[path_obj] = path_obj.stat().st_mtime_ns
+        except FileNotFoundError:
+            pass
+    return mtimes
+
+
+def changed_paths(before: dict, after: dict) -> set:
+    return {
+        path_obj for path_obj in before.keys() | after.keys()
+        if before.get(path_obj) != after.get(path_obj)
+    }
+
+
+class DependencyGraph:
+    """
+    Static map from source files to the test files that depend on them:
+    - Python imports between tests/ and pages/ (absolute e2e.* and relative), followed transitively;
+      importing the pages package counts as depending on every page module
+    - locators/*.yaml sections -> page modules declaring LOCATOR_PAGE = "<section>"
+    - resources/* -> test files that mention the file name
+    - anything else (utils/, conftest.py, constants.py, ...) -> the whole suite
+    """
+
+    def __init__(self, root: Path = E2E_ROOT):
+        self.root = root
+        self.test_files = sorted((root / "tests").glob("test_*.py"))
+        sources = [*self.test_files, *sorted((root / "pages").glob("*.py"))]
+        self.trees = {
+            path_obj: ast.parse(path_obj.read_text(encoding="utf-8")) for path_obj in sources
+        }
+        self.imports = {
+            path_obj: self._imports_of(path_obj, tree) for path_obj, tree in self.trees.items()
+        }
+
+    def _module_path(self, module: str) -> Path | None:
+        parts = module.split(".")
+        if parts[0] == self.root.name:
+            parts = parts[1:]
+        if not parts:
+            return None
+        base = self.root.joinpath(*parts)
+        for candidate in (base.with_suffix(".py"), base / "__init__.py"):
+            if candidate.exists():
+                return candidate
+        return None
+
+    def _imports_of(self, path_obj: Path, tree) -> set:
+        package = path_obj.relative_to(self.root.parent).parent.parts
+        found = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                candidates = [self._module_path(alias.name) for alias in node.names]
+            elif isinstance(node, ast.ImportFrom):
+                base = ".".join(package[:len(package) - node.level + 1] if node.level else ())
+                base = ".".join(filter(None, (base, node.module)))
+                # Submodules imported by name, otherwise the module (or package) itself
+                candidates = [self._module_path(f"{base}.{alias.name}") for alias in node.names]
+                if not any(candidates):
+                    candidates = [self._module_path(base)]
+            else:
+                continue
+            found.update(target for target in candidates if target is not None)
+        expanded = set()
+        for target in found:
+            if target.name == "__init__.py":
+                expanded.update(p for p in target.parent.glob("*.py") if p != target)
+            expanded.add(target)
+        return expanded
+
+    def _imports_for(self, path_obj: Path) -> set:
+        """Imports of any project file, e.g. a script under e2e/ that a test imports."""
+        if path_obj not in self.imports:
+            tree = ast.parse(path_obj.read_text(encoding="utf-8"))
+            self.imports[path_obj] = self._imports_of(path_obj, tree)
+        return self.imports[path_obj]
+
+    def _closure(self, path_obj: Path) -> set:
+        seen, stack = set(), [path_obj]
+        while stack:
+            for target in self._imports_for(stack.pop()):
+                if target not in seen:
+                    seen.add(target)
+                    stack.append(target)
+        return seen
+
+    def _pages_for_sections(self, sections) -> set:
+        pages = set()
+        for path_obj, tree in self.trees.items():
+            if path_obj.parent.name != "pages":
+                continue
+            for node in ast.walk(tree):
+                if not (isinstance(node, ast.Assign) and isinstance(node.value, ast.Constant)):
+                    continue
+                declares = any(
+                    isinstance(t, ast.Name) and t.id == "LOCATOR_PAGE" for t in node.targets
+                )
+                if declares and node.value.value in sections:
+                    pages.add(path_obj)
+        return pages
+
+    def affected_tests(self, changed) -> list | None:
+        """Test files to rerun for the changed paths; None means the whole suite."""
+        targets, sources = set(), set()
+        for path_obj in changed:
+            if not path_obj.exists():
+                return None
+            top = path_obj.relative_to(self.root).parts[0]
+            if top == "tests" and path_obj in self.test_files:
+                targets.add(path_obj)
+            elif top == "pages" and path_obj.suffix == ".py":
+                sources.add(path_obj)
+            elif top == "locators":
+                sources |= self._pages_for_sections(set(FileUtils.read_yaml(path_obj) or {}))
+            elif top == "resources":
+                mentions = {
+                    t for t in self.test_files if path_obj.name in t.read_text(encoding="utf-8")
+                }
+                if not mentions:
+                    return None
+                targets |= mentions
+            else:
+                return None
+        targets.update(t for t in self.test_files if sources & (self._closure(t) | {t}))
+        return sorted(targets)
+
+
+def purge_modules(root: Path = E2E_ROOT):
+    """
+    Drop test, page-object, utils, constants and conftest modules so the next run
+    imports the edited code (except this module, which holds the warm session).
+    """
+    reloaded = [root / name for name in _RELOADED_DIRS]
+    top_level = {root / name for name in WATCHED_FILES}
+    for name, module in list(sys.modules.items()):
+        module_file = getattr(module, "__file__", None)
+        if not module_file:
+            continue
+        path_obj = Path(module_file).resolve()
+        if path_obj == _KEPT_MODULE:
+            continue
+        if path_obj in top_level or any(path_obj.is_relative_to(d) for d in reloaded):
+            del sys.modules[name]
+    LocatorRegistry.reset()
+
+
+def run_in_process(pytest_args: list) -> int:
+    import pytest
+
+    purge_modules()
+    WarmSession.active = True
+    return int(pytest.main(pytest_args))
+
+
+def watch(scope: str, options: list, interval: float = 0.5, root: Path = E2E_ROOT):
+    """
+    Run scope once, then poll the watched directories and rerun only the affected
+    test files (within scope) after every change, until interrupted.
+    """
+    scope_path = (root / scope).resolve()
+    try:
+        run_in_process([scope, *options])
+        before = snapshot(root)
+        watched = ", ".join((*WATCHED_DIRS, *WATCHED_FILES))
+        print(f"\nWatching {watched} for changes (Ctrl+C to stop)...")
+        while True:
+            time.sleep(interval)
+            after = snapshot(root)
+            changed = changed_paths(before, after)
+            if not changed:
+                continue
+            # Let editors finish writing (save-all touches several files)
+            time.sleep(0.2)
+            before = snapshot(root)
+            changed |= changed_paths(after, before)
+            try:
+                affected = DependencyGraph(root).affected_tests(changed)
+            except Exception:
+                # A file that does not parse yet: run the scope and let pytest report it
+                affected = None
+            if affected is None:
+                selected = [scope]
+            else:
+                selected = [str(t.relative_to(root)) for t in affected
+                            if t == scope_path or t.is_relative_to(scope_path)]
+            names = ", ".join(sorted(str(p.relative_to(root)) for p in changed))
+            if not selected:
+                print(f"\nChanged: {names}; no affected tests")
+                continue
+            print(f"\nChanged: {names}; running {' '.join(selected)}")
+            started = time.perf_counter()
+            exit_code = run_in_process([*selected, *options])
+            print(f"Finished in {time.perf_counter() - started:.1f}s (exit code {exit_code})")
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    finally:
+        WarmSession.close()
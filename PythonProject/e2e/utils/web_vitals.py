@@ -0,0 +1,270 @@
+"""
+Front-end performance metrics (Navigation Timing, paint, LCP, CLS) and budgets
+"""
+import json
+import os
+from fnmatch import fnmatch
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import pytest
+
+from .file_utils import FileUtils
+from .stats import summarize
+from .workers import is_worker, worker_id
+
+# Runs in the page. Buffered observers hand over LCP/CLS entries recorded before
+# the call through takeRecords(), so no init script is needed. LCP and CLS are
+# Chromium-only; other browsers report them as null and their budgets are skipped.
+COLLECT_SCRIPT = """
+() => {
+    const round = (value) => value == null ? null : Math.round(value * 10) / 10;
+    const buffered = (type) => {
+        try {
+            const observer = new PerformanceObserver(() => {});
+            observer.observe({ type, buffered: true });
+            const entries = observer.takeRecords();
+            observer.disconnect();
+            return entries;
+        } catch (e) {
+            return null;
+        }
+    };
+    const nav = performance.getEntriesByType("navigation")[0];
+    const paint = {};
+    for (const entry of performance.getEntriesByType("paint")) paint[entry.name] = entry.startTime;
+    const lcpEntries = buffered("largest-contentful-paint");
+    const lcp = lcpEntries && lcpEntries.length ? lcpEntries[lcpEntries.length - 1] : null;
+    const shifts = buffered("layout-shift");
+    const resources = performance.getEntriesByType("resource");
+    let transfer = nav ? nav.transferSize : 0;
+    for (const entry of resources) transfer += entry.transferSize || 0;
+    return {
+        document_url: nav ? nav.name : location.href,
+        ttfb_ms: nav ? round(nav.responseStart - nav.startTime) : null,
+        dom_content_loaded_ms: nav && nav.domContentLoadedEventEnd
+            ? round(nav.domContentLoadedEventEnd - nav.startTime) : null,
+        load_ms: nav && nav.loadEventEnd ? round(nav.loadEventEnd - nav.startTime) : null,
+        fcp_ms: round(paint["first-contentful-paint"]),
+        lcp_ms: lcp ? round(lcp.renderTime || lcp.loadTime || lcp.startTime) : null,
+        cls: shifts ? Math.round(
+            shifts.filter(s => !s.hadRecentInput).reduce((sum, s) => sum + s.value, 0) * 1000
+        ) / 1000 : null,
+        transfer_kb: round(transfer / 1024),
+        resource_count: resources.length,
+    };
+}
+"""
+
+# Metrics a budget can be set for; PERF_BUDGET_<NAME> in the environment / .env.test
+BUDGET_METRICS = (
+    "ttfb_ms", "dom_content_loaded_ms", "load_ms", "fcp_ms", "lcp_ms", "cls", "transfer_kb",
+)
+
+BUDGETS_FILE = Path(__file__).resolve().parent.parent / "resources" / "perf_budgets.yaml"
+
+
+def _strip_fragment(url: str) -> str:
+    return url.split("#", 1)[0]
+
+
+def load_budgets(env_file: Path = None, budgets_file: Path = BUDGETS_FILE) -> "PerfBudgets":
+    """
+    Budgets, lowest to highest precedence:
+    - resources/perf_budgets.yaml ("default" section plus per-URL-pattern sections)
+    - PERF_BUDGET_<METRIC> keys in .env.test (upper or lower case)
+    - PERF_BUDGET_<METRIC> environment variables
+    """
+    per_pattern = {}
+    defaults = {}
+    if budgets_file and Path(budgets_file).exists():
+        for pattern, limits in (FileUtils.read_yaml(budgets_file) or {}).items():
+            if pattern == "default":
+                defaults.update(limits or {})
+            else:
+                per_pattern[pattern] = dict(limits or {})
+
+    sources = []
+    if env_file and Path(env_file).exists():
+        from dotenv import dotenv_values
+
+        sources.append(dotenv_values(env_file))
+    sources.append(os.environ)
+    for source in sources:
+        for metric in BUDGET_METRICS:
+            for key in (f"PERF_BUDGET_{metric.upper()}", f"perf_budget_{metric}"):
+                if source.get(key):
+                    defaults[metric] = source[key]
+    return PerfBudgets(defaults, per_pattern)
+
+
+class PerfBudgets:
+    """
+    Metric limits for a URL.
+    Patterns are fnmatch globs matched against the URL path ("/inventory.html",
+    "/cart*") or the full URL ("https://*/checkout*"); every matching pattern
+    overrides the defaults, later ones winning.
+    """
+
+    def __init__(self, defaults: dict, per_pattern: dict = None):
+        for limits in (defaults, *(per_pattern or {}).values()):
+            unknown = set(limits) - set(BUDGET_METRICS)
+            if unknown:
+                raise ValueError(
+                    f"Unknown performance budget metric(s) {sorted(unknown)}; "
+                    f"expected {BUDGET_METRICS}"
+                )
+        self.defaults = {metric: float(limit) for metric, limit in defaults.items()}
+        self.per_pattern = {
+            pattern: {metric: float(limit) for metric, limit in limits.items()}
+            for pattern, limits in (per_pattern or {}).items()
+        }
+
+    def as_dict(self) -> dict:
+        """Constructor arguments, e.g. for shipping the budgets to xdist workers."""
+        return {"defaults": self.defaults, "per_pattern": self.per_pattern}
+
+    def for_url(self, url: str) -> dict:
+        path = urlsplit(url).path or "/"
+        limits = dict(self.defaults)
+        for pattern, overrides in self.per_pattern.items():
+            if fnmatch(path, pattern) or fnmatch(url, pattern):
+                limits.update(overrides)
+        return limits
+
+    def violations(self, metrics: dict) -> list:
+        """Human-readable 'metric value > limit' strings for every exceeded budget."""
+        found = []
+        for metric, limit in self.for_url(metrics["url"]).items():
+            value = metrics.get(metric)
+            if value is not None and value > limit:
+                found.append(f"{metric}={value:g} > {limit:g}")
+        return found
+
+
+class WebPerf:
+    """
+    Process-wide web performance capture, switched on per test by WebPerfPlugin.
+    BasePage/AsyncBasePage call capture()/capture_async() after navigate_to and
+    wait_for_url; the metrics are stored for the running test with the budgets
+    they exceed. Capturing never raises: WebPerfPlugin fails the test in its call
+    phase, so a navigation inside a fixture cannot turn into a setup error.
+    """
+
+    active = False
+    budgets = PerfBudgets({})
+    nodeid = None
+    captures = []
+
+    @classmethod
+    def capture(cls, page, label: str, elapsed_ms: float = None):
+        if not cls.active:
+            return None
+        return cls._check(cls._build(page.evaluate(COLLECT_SCRIPT), page.url, label, elapsed_ms))
+
+    @classmethod
+    async def capture_async(cls, page, label: str, elapsed_ms: float = None):
+        if not cls.active:
+            return None
+        raw = await page.evaluate(COLLECT_SCRIPT)
+        return cls._check(cls._build(raw, page.url, label, elapsed_ms))
+
+    @classmethod
+    def _build(cls, raw: dict, url: str, label: str, elapsed_ms: float) -> dict:
+        metrics = {"nodeid": cls.nodeid, "label": label, "url": url, **raw}
+        # A client-side route change (pushState) keeps the original navigation entry,
+        # so the document timings describe the first page; use the observed wait instead
+        metrics["soft_navigation"] = _strip_fragment(raw["document_url"]) != _strip_fragment(url)
+        if metrics["soft_navigation"]:
+            for metric in ("ttfb_ms", "dom_content_loaded_ms", "fcp_ms", "lcp_ms"):
+                metrics[metric] = None
+            metrics["load_ms"] = round(elapsed_ms, 1) if elapsed_ms is not None else None
+        return metrics
+
+    @classmethod
+    def _check(cls, metrics: dict) -> dict:
+        metrics["violations"] = cls.budgets.violations(metrics)
+        cls.captures.append(metrics)
+        _attach(metrics)
+        return metrics
+
+
+def _attach(metrics: dict):
+    import allure
+
+    allure.attach(
+        json.dumps(metrics, indent=2),
+        name=f"web perf: {urlsplit(metrics['url']).path or '/'}",
+        attachment_type=allure.attachment_type.JSON,
+    )
+
+
+class WebPerfPlugin:
+    """
+    Turns WebPerf on for tests marked @pytest.mark.web_perf (or every test with
+    --web-perf) and appends each test's captures to
+    <metrics_dir>/web-perf-<worker>.jsonl.
+    - A test whose captures (from its fixtures or its body) exceeded a budget
+      fails after its body has run
+    - The controller prints load/LCP percentiles per URL path at the end of the run
+    """
+
+    def __init__(self, config, metrics_dir: Path, budgets: PerfBudgets, enable_all: bool = False):
+        self.metrics_dir = Path(metrics_dir)
+        self.metrics_dir.mkdir(parents=True, exist_ok=True)
+        self.enable_all = enable_all
+        self.is_worker = is_worker(config)
+        if not self.is_worker:
+            for old in self.metrics_dir.glob("web-perf-*.jsonl"):
+                old.unlink(missing_ok=True)
+        WebPerf.budgets = budgets
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item):
+        WebPerf.active = self.enable_all or item.get_closest_marker("web_perf") is not None
+        WebPerf.nodeid = item.nodeid
+        WebPerf.captures = []
+        yield
+        if WebPerf.captures:
+            path_obj = self.metrics_dir / f"web-perf-{worker_id()}.jsonl"
+            with open(path_obj, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(row) + "\n" for row in WebPerf.captures))
+        WebPerf.active = False
+        WebPerf.nodeid = None
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_runtest_call(self):
+        # Runs after the test body, and only if it passed
+        exceeded = [
+            f"after {row['label']} to {row['url']}: {', '.join(row['violations'])}"
+            for row in WebPerf.captures if row["violations"]
+        ]
+        if exceeded:
+            message = "Performance budget exceeded\n  " + "\n  ".join(exceeded)
+            pytest.fail(message, pytrace=False)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.is_worker:
+            return
+        by_path = {}
+        for path_obj in self.metrics_dir.glob("web-perf-*.jsonl"):
+            with open(path_obj, encoding="utf-8") as f:
+                for line in f:
+                    row = json.loads(line)
+                    by_path.setdefault(urlsplit(row["url"]).path or "/", []).append(row)
+        if not by_path:
+            return
+        terminalreporter.write_sep("-", "web performance (ms)")
+        terminalreporter.write_line(
+            f"{'url path':<40} {'count':>6} {'load p50':>9} {'load p95':>9} {'lcp p95':>9}"
+        )
+        for path, rows in sorted(by_path.items()):
+            load = summarize([row["load_ms"] for row in rows if row["load_ms"] is not None])
+            lcp = summarize([row["lcp_ms"] for row in rows if row["lcp_ms"] is not None])
+            terminalreporter.write_line(
+                f"{path:<40} {len(rows):>6} {load['p50']:>9.0f} {load['p95']:>9.0f} "
+                f"{lcp['p95']:>9.0f}"
+            )
+        violations = sum(1 for rows in by_path.values() for row in rows if row["violations"])
+        if violations:
+            terminalreporter.write_line(f"{violations} capture(s) exceeded a performance budget")
@@ -0,0 +1,49 @@
+"""
+Helpers for telling xdist workers and the controller apart
+"""
+import os
+
+import pytest
+
+
+def worker_id() -> str:
+    """xdist worker id (gw0, gw1, ...) or 'main' when not running under xdist."""
+    return os.environ.get("PYTEST_XDIST_WORKER", "main")
+
+
+def worker_count() -> int:
+    """Number of xdist workers in this run (1 without xdist)."""
+    return int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", "1"))
+
+
+def is_worker(config) -> bool:
+    """True inside an xdist worker process."""
+    return hasattr(config, "workerinput")
+
+
+# Values computed once by the controller and shipped to workers via workerinput
+_SHARED_PREFIX = "e2e_shared_"
+_shared_values_key = pytest.StashKey[dict]()
+
+
+def shared_value(config, key: str, compute):
+    """
+    Return a JSON-serializable value computed once per run.
+    - On the controller (or without xdist) compute() runs on first use and the
+      result is kept for ship_shared_values()
+    - On a worker the controller's value is read from workerinput, so workers
+      never recompute it
+    """
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None and _SHARED_PREFIX + key in workerinput:
+        return workerinput[_SHARED_PREFIX + key]
+    shared = config.stash.setdefault(_shared_values_key, {})
+    if key not in shared:
+        shared[key] = compute()
+    return shared[key]
+
+
+def ship_shared_values(config, workerinput: dict):
+    """Copy every shared value into a worker's workerinput (from pytest_configure_node)."""
+    for key, value in config.stash.get(_shared_values_key, {}).items():
+        workerinput[_SHARED_PREFIX + key] = value